@@ -9,9 +9,9 @@ import matplotlib.pyplot as plt
 from matplotlib.pyplot import figure
 from functions.HK_discrete import HK_discrete
 from functions.calc_clusters import calc_clusters
-from functions.calc_cluster_stat import calc_cluster_stat
-import  csv
-import ast
+from functions.observer import Observer
+from functions.result_cache import ResultCache
+from functions.result_store import save_results, load_results
 
 
 # PARAMETERS
@@ -29,11 +29,17 @@ variances = []
 # the stopping criterion
 stop = 10**(-5)
 
+# the step limit
+max_steps = 100
+
 # the number of total runs for each pair of parameters
 total_runs = 1000
 
 # SIMULATION
 #----------------------------------------------
+# the cache of deterministic simulations (shared by the scripts and kept between sessions)
+cache = ResultCache('cache')
+
 for r in R:
 
     for n in N:
@@ -41,9 +47,8 @@ for r in R:
         # array of clusters for one pair of parameters R and N
         c = []
 
-        # array of cluster variances for one pair of parameters R and N
-        # first values represent the label (number of clusters from 1 to 8)
-        v = [[i] for i in range(1, 9)]
+        # array of cluster variances for one pair of parameters R and N (one value per run)
+        v = []
 
         # SAMPLED VALUES
         #----------------------------------------------
@@ -53,42 +58,35 @@ for r in R:
             x0 = np.random.uniform(0, 1, n)
             x0.sort()
 
-            # SIMULATION
-            x = HK_discrete(r, n, x0, stop, 'LAST_STEP', include_self = True)
+            # SIMULATION: the clusters of the last state are observed
+            obs = Observer(['clusters', 'cluster_var'], r, n, last = True)
+            obs = HK_discrete(r, n, x0, stop, obs, include_self = True, max_steps = max_steps)
 
             # check the number of clusters in the last step
-            clust_no = calc_cluster_stat(x, r, n)[0]
-            c.append(clust_no)
+            c.append(obs['clusters'][0])
 
-            # get the statistics (0th row of v is for simulations with one end cluster; 1st - for 2 clusters; etc.)
-            v[clust_no - 1].append(calc_cluster_stat(x, r, n)[2])
+            # get the statistics
+            v.append(obs['cluster_var'][0])
 
         clusters.append(c)
         variances.append(v)
 
-# save the cluster results
-np.savetxt('discrete analysis/HK 3 results.txt', clusters, fmt='%d')
+# save the results (R x N x runs)
+shape = (len(R), len(N), total_runs)
+coords = {'R': R, 'N': N}
 
-# write variance CSV file
-with open("discrete analysis/HK 3 results (var).csv","w") as f:
-    wr = csv.writer(f, lineterminator = '\n')
-    wr.writerows(variances)
+save_results('discrete analysis/HK 3 results', np.reshape(clusters, shape), axes = ('R', 'N', 'run'), coords = coords)
+save_results('discrete analysis/HK 3 results (var)', np.reshape(variances, shape), axes = ('R', 'N', 'run'), coords = coords)
 
 # ------------------------------------------------------------------------------
 # ------------------------------------------------------------------------------
 
-# read cluster CSV file
-with open("discrete_analysis/HK 3 results (var).csv", "r") as f:
-    reader = csv.reader(f, delimiter=",", quotechar='"')
-    var = [row for row in reader]
-
-# convert string lists to lists
-for i in range(len(var)):
-    for j in range(len(var[0])):
-        var[i][j] = ast.literal_eval(var[i][j])
+# load the results (one row for every pair of parameters R and N)
+var, _ = load_results('discrete_analysis/HK 3 results (var)')
+var = var.reshape(-1, var.shape[-1])
 
-# load the cluster results
-clusters = np.loadtxt('discrete_analysis/HK 3 results.txt', dtype=int)
+clusters, _ = load_results('discrete_analysis/HK 3 results')
+clusters = clusters.reshape(-1, clusters.shape[-1])
 
 # PLOT
 #----------------------------------------------
@@ -111,7 +109,7 @@ for r in R:
         rx0 = [i/(n+1) for i in range(1, n+1)] #np.linspace(0, 1, n, endpoint = True)
 
         # SIMULATION
-        rx = HK_discrete(r, n, rx0, stop, 'LAST_STEP', include_self = True)
+        rx = cache(HK_discrete, r, n, rx0, stop, 'LAST_STEP', include_self = True)
 
         # check the number of clusters in the last step
         rc = calc_clusters(rx, r, n)
@@ -135,7 +133,7 @@ for r in R:
 
                 # calculate the final variance for one bar:
                 # mean of variances / number of clusters) ?
-                final_var = np.mean(v[t-1][1:]) # / v[t-1][0])
+                final_var = np.mean(v[c == t])
 
                 # print the final variance value for the cluster
                 plt.annotate(round(final_var, 3), xy = (t, values[0][t]), ha = 'center', fontsize = 19)
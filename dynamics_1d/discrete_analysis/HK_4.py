@@ -9,8 +9,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.pyplot import figure
 from matplotlib import colors
-from functions.HK_discrete import HK_discrete
-from functions.calc_clusters import calc_clusters
+from functions.HK_discrete_sweep import HK_discrete_sweep
+from functions.result_cache import ResultCache
 
 #----------------------------------------------
 # PARAMETERS
@@ -22,10 +22,6 @@ n = 50
 R = np.linspace(0.05, 0.3, 150)
 # R = R[1:]
 
-# the array of end clusters
-clusters_1 = []
-clusters_2 = []
-
 # the stopping criterion
 stop = 10**(-5)
 
@@ -34,17 +30,13 @@ x0 = [i/(n+1) for i in range(1, n+1)]
 x0 = [i/(n+1) for i in range(1, n+1)]
 
 #----------------------------------------------
-# SIMULATION
-
-for r in R:
+# SIMULATION: all values of R at once
 
-    # SIMULATION
-    x_1 = HK_discrete(r, n, x0, stop, 'LAST_STEP', include_self = False)
-    x_2 = HK_discrete(r, n, x0, stop, 'LAST_STEP', include_self = True)
+# the cache of deterministic simulations (shared by the scripts and kept between sessions)
+cache = ResultCache('cache')
 
-    # check the number of clusters in the last step
-    clusters_1.append(calc_clusters(x_1, r, n))
-    clusters_2.append(calc_clusters(x_2, r, n))
+_, _, clusters_1 = cache(HK_discrete_sweep, R, n, x0, stop, include_self = False)
+_, _, clusters_2 = cache(HK_discrete_sweep, R, n, x0, stop, include_self = True)
 
 clusters_1 = np.array(clusters_1)
 clusters_2 = np.array(clusters_2)
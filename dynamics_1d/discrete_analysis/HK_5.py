@@ -7,7 +7,8 @@ The figure depicts the necessary (though not sufficient) condition for numerical
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.pyplot import figure
-from functions.HK_discrete import HK_discrete
+from functions.HK_discrete_sweep import HK_discrete_sweep
+from functions.result_cache import ResultCache
 
 # PARAMETERS
 #----------------------------------------
@@ -20,9 +21,6 @@ R = np.linspace(0, 0.4, 41)
 # the stopping criterion
 stop = 10**(-5)
 
-# the array of final profiles for all R rounded_end_values
-res_all = []
-
 h = 0.1
 
 #----------------------------------------
@@ -33,15 +31,12 @@ h = 0.1
 x0 = [i/(n+1) for i in range(1, n+1)]
 #----------------------------------------
 
-for i in range(len(R)):
-
-    # SIMULATION
-    #----------------------------------------
-    # res = HK_discrete (R[i], n, x0, stop, result = 'LAST_STEP', include_self = True)
-    res = HK_discrete (R[i], n, x0, stop, result = 'LAST_STEP', include_self = True)
-    res_all.append(res)
+# SIMULATION: all values of R at once
+#----------------------------------------
+# the cache of deterministic simulations (shared by the scripts and kept between sessions)
+cache = ResultCache('cache')
 
-res_all = np.array(res_all)
+res_all, _, _ = cache(HK_discrete_sweep, R, n, x0, stop, include_self = True)
 
 # PLOT THE RESULTS
 #----------------------------------------
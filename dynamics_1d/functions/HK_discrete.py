@@ -11,18 +11,23 @@ def HK_discrete (R, n, x0, stop = 10**(-5), result = 'FULL', include_self = True
     @param stop         - a stopping criterion;
     @param result       - a flag indicating if the whole 2D array is returned ('FULL')
                           or only the last step values (!= 'FULL');
+                          a Recorder can be given to record selected steps (see recorder);
     @param include_self - a flag indicating if self opinion plays a part in the stepping process;
     @param max_steps    - a maximum number of steps to take (used if self-opinion is not included).
     """
 
     import numpy as np
     import math
+    from functions.recorder import make_recorder
+    from functions.step_discrete import step_discrete
 
-    # the array of results (2D)
-    res = []
-    res.append(x0)
+    # the recorder of results (None if only the last step is returned)
+    rec = make_recorder(result)
 
-    x = np.copy(x0)
+    if rec is not None:
+        rec.append(x0)
+
+    x = np.array(x0, dtype = float)
     y = np.copy(x)
 
     # the flag indicating if the calculation should proceed
@@ -41,31 +46,8 @@ def HK_discrete (R, n, x0, stop = 10**(-5), result = 'FULL', include_self = True
         steps += 1
 
         # -------------------------------------------------
-        # update one step
-        for i in range(n):
-            # reset the set I and sum of opinions
-            I = []
-            sum = 0
-
-            for j in range(n):
-
-                if not include_self:
-                    # do not include the agent i himself
-                    if i == j:
-                        continue
-
-                # check if agent j influences agent i
-                if abs(x[i] - x[j]) <= R:
-                    # add it to the set I
-                    I.append(j)
-                    # update the sum of opinions
-                    sum = sum + x[j]
-
-            # apply the stepping rule
-            if len(I) != 0:
-                y[i] = sum/len(I)
-            else:
-                y[i] = x[i]
+        # update one step (see step_discrete)
+        y = step_discrete(x, R, include_self)
 
         # -------------------------------------------------
 
@@ -77,14 +59,15 @@ def HK_discrete (R, n, x0, stop = 10**(-5), result = 'FULL', include_self = True
             x = np.copy(y)
 
             # append the opinions to the major array
-            res.append(x)
+            if rec is not None:
+                rec.append(x)
 
         # -------------------------------------------------
 
     # prepare the results
-    if result == 'FULL':
-        # return the full 2D array
-        return np.array(res)
+    if rec is not None:
+        # return the recorded steps (the full 2D array for 'FULL')
+        return rec.result()
 
     else:
         # return the last step only
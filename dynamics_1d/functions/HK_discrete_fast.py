@@ -0,0 +1,102 @@
+def HK_discrete_fast (R, n, x0, stop = 10**(-5), result = 'FULL', include_self = True, max_steps = 100, freeze = True):
+
+    """
+    This function generates the opinion dynamics using a discrete HK model,
+    where opinions are distributed within a range [0,1].
+    The function does not take radicals into account.
+
+    It gives the same results as HK_discrete (up to round-off): the steps are made by step_discrete (sorted windows
+    and prefix sums, O(n log n) per step), and the active agents are kept in the order of opinions.
+
+    If freeze is set, the groups of agents that are more than R away from all other agents
+    and have converged are frozen (see step_discrete): they are dropped from the calculation
+    and the run stops as soon as all groups are frozen. With self-opinion included, a group
+    spanning at most R reaches its exact fixed point (the mean) in one step, so it is frozen
+    right away and the results are the same as without freezing. Without self-opinion,
+    a group is frozen once all its agents share one opinion.
+
+    @param R            - a bound (confidence level);
+    @param n            - a number of agents;
+    @param x0           - an initial distribution of opinions;
+    @param stop         - a stopping criterion;
+    @param result       - a flag indicating if the whole 2D array is returned ('FULL')
+                          or only the last step values (!= 'FULL');
+                          a Recorder can be given to record selected steps (see recorder);
+    @param include_self - a flag indicating if self opinion plays a part in the stepping process;
+    @param max_steps    - a maximum number of steps to take (used if self-opinion is not included);
+    @param freeze       - a flag indicating if the converged groups of agents are frozen.
+    """
+
+    import numpy as np
+    import math
+    from functions.recorder import make_recorder
+    from functions.step_discrete import step_discrete
+
+    # the recorder of results (None if only the last step is returned)
+    rec = make_recorder(result)
+
+    if rec is not None:
+        rec.append(x0)
+
+    x = np.array(x0, dtype = float)
+
+    # the active (not frozen) agents in the order of opinions (the opinions keep their order
+    # during the dynamics, so the sorting within the next steps is almost free)
+    active = np.argsort(x, kind = 'stable')
+
+    # the flag indicating if the calculation should proceed
+    calculate = True
+
+    # number of time steps taken
+    steps = 0
+
+    # if self-opinion is included, no oscillations should appear and the process terminates -
+    # steps do not have to be cut
+    if include_self:
+        max_steps =  math.inf
+
+    while calculate:
+
+        steps += 1
+
+        # -------------------------------------------------
+        # update one step of the active agents (the groups reaching their fixed point are flagged)
+        y = np.copy(x)
+
+        if freeze:
+            y[active], frozen = step_discrete(x[active], R, include_self, freeze = True)
+        else:
+            y[active] = step_discrete(x[active], R, include_self)
+
+        # -------------------------------------------------
+
+        if np.max(np.abs(x - y)) <= stop or steps > max_steps:
+            # terminate the calculation
+            calculate = False
+        else:
+            # update the opinions x only when all agents are considered
+            x = y
+
+            # append the opinions to the major array
+            if rec is not None:
+                rec.append(x)
+
+            if freeze:
+
+                # drop the frozen groups from the calculation
+                active = active[~frozen]
+
+                # all groups are frozen: the next step would not change the opinions
+                if len(active) == 0:
+                    calculate = False
+
+        # -------------------------------------------------
+
+    # prepare the results
+    if rec is not None:
+        # return the recorded steps (the full 2D array for 'FULL')
+        return rec.result()
+
+    else:
+        # return the last step only
+        return x
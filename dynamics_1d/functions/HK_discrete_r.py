@@ -13,37 +13,28 @@ def HK_discrete_r (R, n, x0, n_rad, x0_rad, stop = 10**(-5), result = 'FULL', in
     @param stop         - a stopping criterion;
     @param result       - a flag indicating if the whole 2D array is returned ('FULL')
                           or only the last step values (!= 'FULL');
+                          a Recorder can be given to record selected steps (see recorder);
     @param include_self - a flag indicating if self opinion plays a part in the stepping process;
     @param max_steps    - a maximum number of steps to take (used if self-opinion is not included).
     """
 
     import numpy as np
     import math
+    from functions.recorder import make_recorder
+    from functions.step_discrete import step_discrete
+    from functions.combine_radicals import combine_radicals
 
-    # combine the radicals and normal agents
-    n_all = n + n_rad
-    x0_all = np.concatenate((x0, x0_rad))
-    x0_all.sort()
+    # combine the radicals and normal agents and find radical ids (see combine_radicals)
+    n_all, x0_all, is_rad = combine_radicals(x0, n_rad, x0_rad)
+    radicals_idx = np.flatnonzero(is_rad)
 
-    # find radical ids
-    radicals_idx = []
+    # the recorder of results (None if only the last step is returned)
+    rec = make_recorder(result)
 
-    for i in range(len(x0_rad)):
+    if rec is not None:
+        rec.append(x0_all)
 
-        for j in range(len(x0_all)):
-
-            if j in radicals_idx:
-                continue
-
-            if x0_rad[i] == x0_all[j]:
-                radicals_idx.append(j)
-                break
-
-    # the array of results (2D)
-    res = []
-    res.append(x0_all)
-
-    x = np.copy(x0_all)
+    x = np.array(x0_all, dtype = float)
     y = np.copy(x)
 
     # the flag indicating if the calculation should proceed
@@ -62,41 +53,8 @@ def HK_discrete_r (R, n, x0, n_rad, x0_rad, stop = 10**(-5), result = 'FULL', in
         steps += 1
 
         # -------------------------------------------------
-        # update one step
-        for i in range(n_all):
-
-            # radical opinions stay constant
-            if i in radicals_idx:
-                y[i] = x0_all[i]
-                continue
-
-            # reset the set I and sum of opinions
-            I = []
-            sum = 0
-
-            for j in range(n_all):
-
-                if not include_self:
-
-                    # do not include the agent i himself
-                    if i == j:
-                        continue
-
-                # check if agent j influences agent i
-                if abs(x[i] - x[j]) <= R:
-
-                    # add it to the set I
-                    I.append(j)
-
-                    # update the sum of opinions
-                    sum = sum + x[j]
-
-            # apply the stepping rule
-            if len(I) != 0:
-                y[i] = sum/len(I)
-
-            else:
-                y[i] = x[i]
+        # update one step (see step_discrete)
+        y = step_discrete(x, R, include_self, radicals_idx)
 
         # -------------------------------------------------
 
@@ -108,14 +66,15 @@ def HK_discrete_r (R, n, x0, n_rad, x0_rad, stop = 10**(-5), result = 'FULL', in
             x = np.copy(y)
 
             # append the opinions to the major array
-            res.append(x)
+            if rec is not None:
+                rec.append(x)
 
         # -------------------------------------------------
 
     # prepare the results
-    if result == 'FULL':
-        # return the full 2D array
-        return np.array(res)
+    if rec is not None:
+        # return the recorded steps (the full 2D array for 'FULL')
+        return rec.result()
 
     else:
         # return the last step only
@@ -0,0 +1,37 @@
+def HK_discrete_sweep (R, n, x0, stop = 10**(-5), include_self = True, max_steps = 100):
+
+    """
+    This function generates the opinion dynamics using a discrete HK model for
+    a vector of bounds R and one initial distribution of opinions.
+    The function does not take radicals into account.
+
+    All R-variants are advanced together as one ensemble (see HK_discrete_ens),
+    so an R-diagram or the number of clusters vs R is given by a single call.
+
+    @param R            - an array of bounds (confidence levels);
+    @param n            - a number of agents;
+    @param x0           - an initial distribution of opinions;
+    @param stop         - a stopping criterion;
+    @param include_self - a flag indicating if self opinion plays a part in the stepping process;
+    @param max_steps    - a maximum number of steps to take (used if self-opinion is not included).
+
+    @return             - a tuple (x, steps, clusters): the last step values for every R (2D matrix: len(R) x n),
+                          the number of steps and the number of clusters for every R.
+    """
+
+    import numpy as np
+    from functions.HK_discrete_ens import HK_discrete_ens
+    from functions.calc_cluster_labels import calc_cluster_labels
+
+    R = np.atleast_1d(np.asarray(R, dtype = float))
+
+    # the same initial profile for every R
+    x0_all = np.tile(np.asarray(x0, dtype = float), (len(R), 1))
+
+    # SIMULATION
+    x, steps = HK_discrete_ens(R, n, x0_all, stop, 'LAST_STEP', include_self, max_steps)
+
+    # check the number of clusters in the last step (all profiles at once)
+    clusters = calc_cluster_labels(x, R)[0]
+
+    return (x, steps, clusters)
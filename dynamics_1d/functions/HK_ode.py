@@ -1,4 +1,4 @@
-def HK_ode (R, n, x0, h, stop = 10**(-5), result = 'FULL', include_self = True, max_steps = 1000):
+def HK_ode (R, n, x0, h, stop = 10**(-5), result = 'FULL', include_self = True, max_steps = 1000, freeze = False):
 
     """
     This function generates the opinion dynamics using an ODE version of HK model,
@@ -6,6 +6,12 @@ def HK_ode (R, n, x0, h, stop = 10**(-5), result = 'FULL', include_self = True,
     For that purpose, Euler's method is used.
     The function does not take radicals into account.
 
+    If freeze is set, the groups of agents that are more than R away from all other agents
+    (see calc_components), span at most R and moved by <= stop in the last step are moved
+    to their fixed point (the mean of the group) and dropped from the calculation;
+    the run stops as soon as all groups are frozen. Such a group only contracts towards its mean,
+    so the frozen opinions are the limits of the dynamics (this requires h <= 1).
+
     @param R            - a bound (confidence level);
     @param n            - a number of agents;
     @param x0           - an initial distribution of opinions;
@@ -13,21 +19,30 @@ def HK_ode (R, n, x0, h, stop = 10**(-5), result = 'FULL', include_self = True,
     @param stop         - a stopping criterion;
     @param result       - a flag indicating if the whole 2D array is returned ('FULL')
                           or only the last step values (!= 'FULL');
+                          a Recorder can be given to record selected steps (see recorder);
     @param include_self - a flag indicating if self opinion plays a part in the stepping process;
-    @param max_steps    - a maximum number of steps to take (used if self-opinion is not included).
+    @param max_steps    - a maximum number of steps to take (used if self-opinion is not included);
+    @param freeze       - a flag indicating if the converged groups of agents are frozen.
     """
 
     import numpy as np
     import math
-    from functions.dxdt import dxdt
+    from functions.recorder import make_recorder
+    from functions.step_euler import step_euler
+    from functions.calc_components import calc_components
+
+    # the recorder of results (None if only the last step is returned)
+    rec = make_recorder(result)
 
-    # the array of results (2D)
-    res = []
-    res.append(x0)
+    if rec is not None:
+        rec.append(x0)
 
     x = np.copy(x0)
     y = np.copy(x)
 
+    # the active (not frozen) agents
+    active = np.arange(n)
+
     # the flag indicating if the calculation should proceed
     calculate = True
 
@@ -46,7 +61,11 @@ def HK_ode (R, n, x0, h, stop = 10**(-5), result = 'FULL', include_self = True,
         steps += 1
 
         # update one step using Euler's method
-        y = x + h * dxdt(None, x, R, n, include_self)
+        if freeze:
+            y = np.copy(x)
+            y[active] = step_euler(x[active], R, n, h, include_self = include_self)
+        else:
+            y = step_euler(x, R, n, h, include_self = include_self)
 
         # check the stopping conditions
         if max(abs(x - y)) <= stop or steps > max_steps:
@@ -56,18 +75,41 @@ def HK_ode (R, n, x0, h, stop = 10**(-5), result = 'FULL', include_self = True,
 
         else:
 
+            # the change of opinions in this step
+            change = abs(x - y)
+
             # update the opinions x
             x = np.copy(y)
 
+            if freeze:
+
+                # find the converged groups of agents
+                order = active[np.argsort(x[active], kind = 'stable')]
+                comp, spread = calc_components(x[order], R)
+                first = np.flatnonzero(np.diff(comp, prepend = -1))
+
+                frozen = ((spread <= R) & (np.maximum.reduceat(change[order], first) <= stop))[comp]
+
+                # move them to their fixed point and drop them from the calculation
+                mean = np.bincount(comp, weights = x[order]) / np.bincount(comp)
+                x[order[frozen]] = mean[comp[frozen]]
+
+                active = order[~frozen]
+
+                # all groups are frozen: the next step would not change the opinions
+                if len(active) == 0:
+                    calculate = False
+
             # append the opinions to the major array
-            res.append(x)
+            if rec is not None:
+                rec.append(x)
 
         # -------------------------------------------------
 
     # prepare the results
-    if result == 'FULL':
-        # return the full 2D array
-        return np.array(res)
+    if rec is not None:
+        # return the recorded steps (the full 2D array for 'FULL')
+        return rec.result()
 
     else:
         # return the last step only
@@ -0,0 +1,93 @@
+def HK_ode_ens (R, n, x0, h, stop = 10**(-5), result = 'FULL', include_self = True, max_steps = 1000):
+
+    """
+    This function generates the opinion dynamics of an ensemble of M independent initial profiles
+    using an ODE version of HK model, where opinions are distributed within a range [0,1].
+    For that purpose, Euler's method is used.
+    The function does not take radicals into account.
+
+    All members are advanced together as one (M, n) array. Every member has its own
+    stopping criterion: once it has converged, it is dropped from the calculation and
+    its opinions stay fixed. Each member gives the same result as a separate HK_ode run.
+
+    @param R            - a bound (confidence level); either a number or an array of M bounds (one per member);
+    @param n            - a number of agents;
+    @param x0           - initial distributions of opinions (2D matrix: M x n);
+    @param h            - a step size;
+    @param stop         - a stopping criterion;
+    @param result       - a flag indicating if the whole 3D array (steps x M x n) is returned ('FULL')
+                          or only the last step values (!= 'FULL'); the finished members
+                          keep their last opinions in the full array;
+                          a Recorder can be given to record selected steps (see recorder);
+    @param include_self - a flag indicating if self opinion plays a part in the stepping process;
+    @param max_steps    - a maximum number of steps to take (used if self-opinion is not included).
+
+    @return             - a tuple (x, steps), where steps holds the number of steps of every member
+                          (the same as len(HK_ode(..., result = 'FULL'))).
+    """
+
+    import numpy as np
+    import math
+    from functions.recorder import make_recorder
+    from functions.dxdt import dxdt
+
+    x = np.array(x0, dtype = float, ndmin = 2)
+    M = x.shape[0]
+
+    # one bound per member
+    R = np.broadcast_to(np.asarray(R, dtype = float), (M,))
+
+    # the recorder of results (None if only the last step is returned)
+    rec = make_recorder(result)
+
+    if rec is not None:
+        rec.append(x)
+
+    # number of time steps taken by every member
+    steps_all = np.zeros(M, dtype = np.int64)
+
+    # the members that are still calculated
+    active = np.arange(M)
+
+    # number of time steps taken
+    steps = 0
+
+    # if self-opinion is included, no oscillations should appear and the process terminates -
+    # steps do not have to be cut
+    if include_self:
+        max_steps =  math.inf
+
+    while len(active) != 0:
+
+        # -------------------------------------------------
+        # increase the step
+        steps += 1
+
+        # update one step of the active members using Euler's method
+        xa = x[active]
+        ya = xa + h * dxdt(None, xa, R[active, None], n, include_self)
+
+        # the stopping criterion of every member
+        done = (np.max(np.abs(xa - ya), axis = -1) <= stop) | (steps > max_steps)
+
+        # terminate the calculation of the converged members
+        steps_all[active[done]] = steps
+
+        # update the opinions of the remaining members
+        x[active[~done]] = ya[~done]
+        active = active[~done]
+
+        # append the opinions to the major array
+        if rec is not None and len(active) != 0:
+            rec.append(x)
+
+        # -------------------------------------------------
+
+    # prepare the results
+    if rec is not None:
+        # return the recorded steps (3D array)
+        return (rec.result(), steps_all)
+
+    else:
+        # return the last step only
+        return (x, steps_all)
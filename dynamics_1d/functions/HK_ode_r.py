@@ -15,36 +15,26 @@ def HK_ode_r (R, n, x0, n_rad, x0_rad, h, stop = 10**(-5), result = 'FULL', incl
     @param stop         - a stopping criterion;
     @param result       - a flag indicating if the whole 2D array is returned ('FULL')
                           or only the last step values (!= 'FULL');
+                          a Recorder can be given to record selected steps (see recorder);
     @param include_self - a flag indicating if self opinion plays a part in the stepping process;
     @param max_steps    - a maximum number of steps to take (used if self-opinion is not included).
     """
 
     import numpy as np
     import math
-    from functions.dxdt import dxdt
+    from functions.recorder import make_recorder
+    from functions.step_euler import step_euler
+    from functions.combine_radicals import combine_radicals
 
-    # combine the radicals and normal agents
-    n_all = n + n_rad
-    x0_all = np.concatenate((x0, x0_rad))
-    x0_all.sort()
+    # combine the radicals and normal agents and find radical ids (see combine_radicals)
+    n_all, x0_all, is_rad = combine_radicals(x0, n_rad, x0_rad)
+    radicals_idx = np.flatnonzero(is_rad)
 
-    # find radical ids
-    radicals_idx = []
+    # the recorder of results (None if only the last step is returned)
+    rec = make_recorder(result)
 
-    for i in range(len(x0_rad)):
-
-        for j in range(len(x0_all)):
-
-            if j in radicals_idx:
-                continue
-
-            if x0_rad[i] == x0_all[j]:
-                radicals_idx.append(j)
-                break
-
-    # the array of results (2D)
-    res = []
-    res.append(x0_all)
+    if rec is not None:
+        rec.append(x0_all)
 
     x = np.copy(x0_all)
     y = np.copy(x)
@@ -66,8 +56,8 @@ def HK_ode_r (R, n, x0, n_rad, x0_rad, h, stop = 10**(-5), result = 'FULL', incl
         # increase the step
         steps += 1
 
-        # update one step using Euler's method
-        y = x + h * dxdt(None, x, R, n_all, include_self, radicals_idx)
+        # update one step using Euler's method (see step_euler)
+        y = step_euler(x, R, n_all, h, include_self = include_self, radicals_idx = radicals_idx)
 
         # check the stopping conditions
         if max(abs(x - y)) <= stop or steps > max_steps:
@@ -79,14 +69,15 @@ def HK_ode_r (R, n, x0, n_rad, x0_rad, h, stop = 10**(-5), result = 'FULL', incl
             x = np.copy(y)
 
             # append the opinions to the major array
-            res.append(x)
+            if rec is not None:
+                rec.append(x)
 
         # -------------------------------------------------
 
     # prepare the results
-    if result == 'FULL':
-        # return the full 2D array
-        return np.array(res)
+    if rec is not None:
+        # return the recorded steps (the full 2D array for 'FULL')
+        return rec.result()
 
     else:
         # return the last step only
@@ -0,0 +1,119 @@
+def HK_ode_w (R, n, x0, h, stop = 10**(-5), result = 'FULL', include_self = True, max_steps = 1000, tol = 10**(-10), n_rad = 0, x0_rad = []):
+
+    """
+    This function generates the opinion dynamics using an ODE version of HK model,
+    where opinions are distributed within a range [0,1].
+    For that purpose, Euler's method is used.
+    Radicals are taken into account if they are given (as in HK_ode_r).
+
+    The agents sharing an opinion (within tol) are merged into one weighted opinion
+    (see merge_agents), so once the clusters have formed, one step costs O(number of clusters)
+    instead of O(n). The opinions are expanded back to the agents only for the recorded steps.
+
+    @param R            - a bound (confidence level);
+    @param n            - a number of agents;
+    @param x0           - an initial distribution of opinions;
+    @param h            - a step size;
+    @param stop         - a stopping criterion;
+    @param result       - a flag indicating if the whole 2D array is returned ('FULL'),
+                          the weighted opinions of the last step ('WEIGHTED': a tuple (x, w, labels),
+                          where x[labels] gives the opinions of the agents)
+                          or only the last step values (other);
+                          a Recorder can be given to record selected steps (see recorder);
+    @param include_self - a flag indicating if self opinion plays a part in the stepping process;
+    @param max_steps    - a maximum number of steps to take (used if self-opinion is not included);
+    @param tol          - a tolerance for treating two opinions as the same;
+    @param n_rad        - a number of radicals;
+    @param x0_rad       - a distribution of radicals.
+    """
+
+    import numpy as np
+    import math
+    from functions.recorder import make_recorder
+    from functions.dxdt import dxdt
+    from functions.merge_agents import merge_agents
+    from functions.combine_radicals import combine_radicals
+
+    # -------------------------------------------------
+    # prepare the agents
+    # combine the radicals and normal agents (see combine_radicals)
+    n_all, x0_all, is_rad = combine_radicals(x0, n_rad, x0_rad)
+
+    # the weighted opinions: every agent on its own
+    order = np.argsort(x0_all, kind = 'stable')
+    x = np.array(x0_all, dtype = float)[order]
+    w = np.ones(n_all)
+    fixed = is_rad[order]
+    labels = np.empty(n_all, dtype = np.int64)
+    labels[order] = np.arange(n_all)
+
+    # merge the agents with the same initial opinions
+    x, w, labels, fixed = merge_agents(x, w, labels, fixed, tol)
+
+    # the recorder of results (None if only the last step is returned);
+    # the opinions are expanded to the agents by the labels only for the recorded steps
+    rec = make_recorder(result)
+
+    if rec is not None:
+        rec.append(x, labels)
+
+    # the flag indicating if the calculation should proceed
+    calculate = True
+
+    # number of time steps taken
+    steps = 0
+
+    # if self-opinion is included, no oscillations should appear and the process terminates -
+    # steps do not have to be cut
+    if include_self:
+        max_steps =  math.inf
+
+    while calculate:
+
+        # -------------------------------------------------
+        # increase the step
+        steps += 1
+
+        # update one step using Euler's method (radical opinions stay constant)
+        y = x + h * dxdt(None, x, R, n_all, include_self, np.flatnonzero(fixed), w = w)
+
+        # check the stopping conditions
+        if np.max(np.abs(x - y)) <= stop or steps > max_steps:
+
+            # terminate the calculation
+            calculate = False
+
+        else:
+
+            # update the opinions x
+            x = y
+
+            # keep the opinions sorted (they usually keep their order)
+            if np.any(np.diff(x) < 0):
+                order = np.argsort(x, kind = 'stable')
+                rank = np.empty_like(order)
+                rank[order] = np.arange(len(order))
+
+                x, w, fixed, labels = x[order], w[order], fixed[order], rank[labels]
+
+            # merge the agents that share an opinion
+            x, w, labels, fixed = merge_agents(x, w, labels, fixed, tol)
+
+            # append the opinions to the major array
+            if rec is not None:
+                rec.append(x, labels)
+
+        # -------------------------------------------------
+
+    # prepare the results
+    if rec is not None:
+        # return the recorded steps (the full 2D array for 'FULL')
+        return rec.result()
+
+    elif result == 'WEIGHTED':
+        # return the weighted opinions of the last step
+        return (x, w, labels)
+
+    else:
+        # return the last step only
+        return x[labels]
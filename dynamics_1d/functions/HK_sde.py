@@ -1,4 +1,4 @@
-def HK_sde (R, n, x0, h, sigma, stop = 10**(-5), result = 'FULL', include_self = True, max_steps = 1000, bound_cond = 'reflect'):
+def HK_sde (R, n, x0, h, sigma, stop = 10**(-5), result = 'FULL', include_self = True, max_steps = 1000, bound_cond = 'reflect', rng = None):
 
     """
     This function generates the opinion dynamics using an SDE version of HK model,
@@ -15,22 +15,30 @@ def HK_sde (R, n, x0, h, sigma, stop = 10**(-5), result = 'FULL', include_self =
     @param stop         - a stopping criterion;
     @param result       - a flag indicating if the whole 2D array is returned ('FULL')
                           or only the last step values (!= 'FULL');
+                          a Recorder can be given to record selected steps (see recorder);
     @param include_self - a flag indicating if self opinion plays a part in the stepping process;
     @param max_steps    - a maximum number of steps to take (used if self-opinion is not included);
-    @param bound_cond   - boundary conditions: 'reflect', 'adsorb', or 'period'.
+    @param bound_cond   - boundary conditions: 'reflect', 'adsorb', or 'period';
+    @param rng          - a random generator or a seed of the noise (None: the global np.random state, see seed_streams).
     """
 
     import numpy as np
-    import math
-    from functions.dxdt import dxdt
+    from functions.recorder import make_recorder
+    from functions.step_euler import step_euler
+    from functions.wiener_blocks import wiener_blocks
 
-    # the array of results (2D)
-    res = []
-    res.append(x0)
+    # the recorder of results (None if only the last step is returned)
+    rec = make_recorder(result)
+
+    if rec is not None:
+        rec.append(x0)
 
     x = np.copy(x0)
     y = np.copy(x)
 
+    # the Wienner increments of all steps (the last step is max_steps + 1)
+    W = wiener_blocks(h, n, max_steps + 1, rng = rng)
+
     # the flag indicating if the calculation should proceed
     calculate = True
 
@@ -43,50 +51,14 @@ def HK_sde (R, n, x0, h, sigma, stop = 10**(-5), result = 'FULL', include_self =
         # increase the step
         steps += 1
 
-        # simulate the Wienner increment
-        W_inc = np.sqrt(h) * np.random.randn(n, 1)
-        W_inc = np.array([item for sublist in W_inc for item in sublist])
-
-        # update one step using Euler - Maruyama method
-        y = x + h * dxdt(None, x, R, n, include_self, bound_cond = bound_cond) + sigma * W_inc
-
-        # boundary conditions
-        if bound_cond == 'reflect':
-
-            for i in range(len(y)):
-
-                # if the opinion is not in [0, 1], it is reflected on the boundary
-                while y[i] < 0 or y[i] > 1:
-
-                    if y[i] < 0:
-                        y[i] = - y[i]
-
-                    elif y[i] > 1:
-                        y[i] = 1 - (y[i] - 1)
-
-        elif bound_cond == 'adsorb':
-
-            for i in range(len(y)):
-
-                # if the opinion is not in [0, 1], it is adsorbed on the boundary
-                if y[i] <= 0:
-                    y[i] = 0
-
-                elif y[i] >= 1:
-                    y[i] = 1
-
-        elif bound_cond == 'period':
-
-            for i in range(len(y)):
-
-                # if the opinion is not in [0, 1], it moves in the period
-                if y[i] <= 0 or y[i] >= 1:
+        # the Wienner increment (simulated in blocks of steps)
+        W_inc = next(W)
 
-                    # the i'th opinion is its mod
-                    y[i] = y[i] % 1
+        # update one step using Euler - Maruyama method with the boundary conditions (see step_euler)
+        y = step_euler(x, R, n, h, sigma, W_inc, include_self, bound_cond = bound_cond)
 
         # check the stopping conditions
-        if max(abs(x - y)) <= stop or steps > max_steps:
+        if np.max(np.abs(x - y)) <= stop or steps > max_steps:
 
             # terminate the calculation
             calculate = False
@@ -94,18 +66,18 @@ def HK_sde (R, n, x0, h, sigma, stop = 10**(-5), result = 'FULL', include_self =
         else:
 
             # update the opinions x
-            x = np.copy(y)
+            x = y
 
             # append the opinions to the major array
-            if result == 'FULL':
-                res.append(x)
+            if rec is not None:
+                rec.append(x)
 
             # -------------------------------------------------
 
     # prepare the results
-    if result == 'FULL':
-        # return the full 2D array
-        return np.array(res)
+    if rec is not None:
+        # return the recorded steps (the full 2D array for 'FULL')
+        return rec.result()
 
     else:
         # return the last step only
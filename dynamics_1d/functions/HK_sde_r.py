@@ -1,4 +1,4 @@
-def HK_sde_r (R, n, x0, n_rad, x0_rad, h, sigma, stop = 10**(-5), result = 'FULL', include_self = True, max_steps = 1000, bound_cond = 'reflect'):
+def HK_sde_r (R, n, x0, n_rad, x0_rad, h, sigma, stop = 10**(-5), result = 'FULL', include_self = True, max_steps = 1000, bound_cond = 'reflect', rng = None):
 
     """
     This function generates the opinion dynamics using an SDE version of HK model,
@@ -17,41 +17,35 @@ def HK_sde_r (R, n, x0, n_rad, x0_rad, h, sigma, stop = 10**(-5), result = 'FULL
     @param stop         - a stopping criterion;
     @param result       - a flag indicating if the whole 2D array is returned ('FULL')
                           or only the last step values (!= 'FULL');
+                          a Recorder can be given to record selected steps (see recorder);
     @param include_self - a flag indicating if self opinion plays a part in the stepping process;
     @param max_steps    - a maximum number of steps to take (used if self-opinion is not included);
-    @param bound_cond   - boundary conditions: 'reflect', 'adsorb', or 'period'.
+    @param bound_cond   - boundary conditions: 'reflect', 'adsorb', or 'period';
+    @param rng          - a random generator or a seed of the noise (None: the global np.random state, see seed_streams).
     """
 
     import numpy as np
-    import math
-    from functions.dxdt import dxdt
+    from functions.recorder import make_recorder
+    from functions.step_euler import step_euler
+    from functions.wiener_blocks import wiener_blocks
+    from functions.combine_radicals import combine_radicals
 
-    # combine the radicals and normal agents
-    n_all = n + n_rad
-    x0_all = np.concatenate((x0, x0_rad))
-    x0_all.sort()
+    # combine the radicals and normal agents and find radical ids (see combine_radicals)
+    n_all, x0_all, is_rad = combine_radicals(x0, n_rad, x0_rad)
+    radicals_idx = np.flatnonzero(is_rad)
 
-    # find radical ids
-    radicals_idx = []
+    # the recorder of results (None if only the last step is returned)
+    rec = make_recorder(result)
 
-    for i in range(len(x0_rad)):
-
-        for j in range(len(x0_all)):
-
-            if j in radicals_idx:
-                continue
-
-            if x0_rad[i] == x0_all[j]:
-                radicals_idx.append(j)
-                break
-
-    # the array of results (2D)
-    res = []
-    res.append(x0_all)
+    if rec is not None:
+        rec.append(x0_all)
 
     x = np.copy(x0_all)
     y = np.copy(x)
 
+    # the Wienner increments of all steps (the last step is max_steps + 1)
+    W = wiener_blocks(h, n_all, max_steps + 1, rng = rng)
+
     # the flag indicating if the calculation should proceed
     calculate = True
 
@@ -64,51 +58,15 @@ def HK_sde_r (R, n, x0, n_rad, x0_rad, h, sigma, stop = 10**(-5), result = 'FULL
         # increase the step
         steps += 1
 
-        # simulate the Wienner increment
-        W_inc = np.sqrt(h) * np.random.randn(n_all, 1)
-        W_inc = np.array([item for sublist in W_inc for item in sublist])
-
-        W_inc[radicals_idx] = 0
-
-        # update one step using Euler - Maruyama method
-        y = x + h * dxdt(None, x, R, n_all, include_self, radicals_idx) + sigma * W_inc
-
-        # boundary conditions
-        if bound_cond == 'reflect':
-
-            for i in range(len(y)):
-
-                # if the opinion is not in [0, 1], it is reflected on the boundary
-                while y[i] < 0 or y[i] > 1:
-
-                    if y[i] < 0:
-                        y[i] = - y[i]
-
-                    elif y[i] > 1:
-                        y[i] = 1 - (y[i] - 1)
-
-        elif bound_cond == 'adsorb':
-
-            for i in range(len(y)):
-
-                if y[i] < 0:
-                    y[i] = 0
-
-                elif y[i] > 1:
-                    y[i] = 1
-
-        elif bound_cond == 'period':
-
-            for i in range(len(y)):
-
-                # if the opinion is not in [0, 1], it moves in the period
-                if y[i] < 0 or y[i] > 1:
+        # the Wienner increment (simulated in blocks of steps)
+        W_inc = next(W)
 
-                    # the i'th opinion is its mod
-                    y[i] = y[i] % 1
+        # update one step using Euler - Maruyama method with the boundary conditions (see step_euler);
+        # radical opinions stay constant
+        y = step_euler(x, R, n_all, h, sigma, W_inc, include_self, radicals_idx, bound_cond)
 
         # check the stopping conditions
-        if max(abs(x - y)) <= stop or steps > max_steps:
+        if np.max(np.abs(x - y)) <= stop or steps > max_steps:
 
             # terminate the calculation
             calculate = False
@@ -116,18 +74,18 @@ def HK_sde_r (R, n, x0, n_rad, x0_rad, h, sigma, stop = 10**(-5), result = 'FULL
         else:
 
             # update the opinions x
-            x = np.copy(y)
+            x = y
 
             # append the opinions to the major array
-            if result == 'FULL':
-                res.append(x)
+            if rec is not None:
+                rec.append(x)
 
         # -------------------------------------------------
 
     # prepare the results
-    if result == 'FULL':
-        # return the full 2D array
-        return np.array(res)
+    if rec is not None:
+        # return the recorded steps (the full 2D array for 'FULL')
+        return rec.result()
 
     else:
         # return the last step only
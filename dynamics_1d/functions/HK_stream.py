@@ -0,0 +1,104 @@
+def HK_stream (model, R, n, x0, h = None, sigma = None, stop = 10**(-5), include_self = True, max_steps = None, bound_cond = 'reflect', n_rad = 0, x0_rad = [], every = 1, rng = None):
+
+    """
+    This function generates the opinion dynamics step by step (a generator),
+    where opinions are distributed within a range [0,1].
+    The discrete, ODE (Euler's method) and SDE (Euler-Maruyama method) versions of HK model
+    are available, radicals are taken into account if they are given.
+
+    The states are yielded as they are calculated, so a caller can stop early, reduce
+    the states on the fly or write them out, and the trajectory is never stored.
+    The steps are made by the same functions as in HK_discrete(_r), HK_ode(_r) and HK_sde(_r)
+    (see step_discrete and step_euler): the k'th state is the k'th row of the 'FULL' result.
+
+    @param model        - a version of HK model: 'discrete', 'ode', or 'sde';
+    @param R            - a bound (confidence level);
+    @param n            - a number of agents;
+    @param x0           - an initial distribution of opinions;
+    @param h            - a step size ('ode' and 'sde');
+    @param sigma        - level of noise ('sde');
+    @param stop         - a stopping criterion;
+    @param include_self - a flag indicating if self opinion plays a part in the stepping process;
+    @param max_steps    - a maximum number of steps to take (None: 100 for 'discrete', 1000 otherwise;
+                          used if self-opinion is not included or in the SDE case);
+    @param bound_cond   - boundary conditions: 'reflect', 'adsorb', or 'period' ('sde');
+    @param n_rad        - a number of radicals;
+    @param x0_rad       - a distribution of radicals;
+    @param every        - every every'th state is yielded (the last state is always yielded);
+    @param rng          - a random generator or a seed of the noise ('sde'; None: the global np.random state).
+
+    @return             - a generator of tuples (step, x); x must not be modified by the caller.
+    """
+
+    import numpy as np
+    import math
+    from functions.step_discrete import step_discrete
+    from functions.step_euler import step_euler
+    from functions.wiener_blocks import wiener_blocks
+    from functions.combine_radicals import combine_radicals
+
+    if model not in ('discrete', 'ode', 'sde'):
+        raise ValueError("model must be 'discrete', 'ode', or 'sde'")
+
+    if max_steps is None:
+        max_steps = 100 if model == 'discrete' else 1000
+
+    # -------------------------------------------------
+    # prepare the agents
+    # combine the radicals and normal agents (see combine_radicals)
+    n_all, x0_all, fixed = combine_radicals(x0, n_rad, x0_rad)
+
+    radicals_idx = np.flatnonzero(fixed)
+
+    x = np.array(x0_all, dtype = float)
+
+    # if self-opinion is included, no oscillations should appear and the process terminates -
+    # steps do not have to be cut (not in the SDE case)
+    if include_self and model != 'sde':
+        max_steps =  math.inf
+
+    if model == 'sde':
+        # the Wienner increments of all steps (the last step is max_steps + 1)
+        W = wiener_blocks(h, n_all, max_steps + 1, rng = rng)
+
+    # -------------------------------------------------
+    yield (0, x)
+
+    # number of time steps taken
+    steps = 0
+
+    while True:
+
+        # -------------------------------------------------
+        # increase the step
+        steps += 1
+
+        # the steps of the engines (see step_discrete and step_euler)
+        if model == 'discrete':
+            y = step_discrete(x, R, include_self, radicals_idx)
+
+        elif model == 'ode':
+            y = step_euler(x, R, n_all, h, include_self = include_self, radicals_idx = radicals_idx)
+
+        else:
+            # the Wienner increment (simulated in blocks of steps)
+            W_inc = next(W)
+
+            y = step_euler(x, R, n_all, h, sigma, W_inc, include_self, radicals_idx, bound_cond)
+
+        # check the stopping conditions
+        if np.max(np.abs(x - y)) <= stop or steps > max_steps:
+
+            # yield the last state if it was skipped
+            if (steps - 1) % every != 0:
+                yield (steps - 1, x)
+
+            return
+
+        # update the opinions x
+        x = y
+
+        if steps % every == 0:
+            yield (steps, x)
+
+        # -------------------------------------------------
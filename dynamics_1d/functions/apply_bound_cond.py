@@ -0,0 +1,34 @@
+def apply_bound_cond (y, bound_cond = 'reflect'):
+
+    """
+    This function applies the boundary conditions to the opinions (in place),
+    so that they stay within a range [0,1]. The whole array is treated at once.
+
+    The reflection is the closed-form fold of the line onto [0,1] (a triangle wave of period 2),
+    which gives the same result as reflecting an opinion on the boundaries until it is in [0,1].
+
+    @param y            - a distribution of opinions (an array of any shape);
+    @param bound_cond   - boundary conditions: 'reflect', 'adsorb', or 'period'.
+
+    @return             - the array y.
+    """
+
+    import numpy as np
+
+    if bound_cond == 'reflect':
+
+        # the distance from 0 in the period [0,2) is reflected on 1 if it exceeds 1
+        z = np.abs(y) % 2
+        np.copyto(y, np.where(z > 1, 1 - (z - 1), z))
+
+    elif bound_cond == 'adsorb':
+
+        # the opinions outside [0,1] are adsorbed on the boundary
+        np.clip(y, 0, 1, out = y)
+
+    elif bound_cond == 'period':
+
+        # the opinions move in the period
+        np.remainder(y, 1, out = y)
+
+    return y
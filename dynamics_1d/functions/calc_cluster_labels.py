@@ -0,0 +1,60 @@
+def calc_cluster_labels (data, R):
+
+    """
+    This function finds the clusters existing in the data in one pass over the sorted opinions:
+    a new cluster starts wherever the gap between two neighbouring opinions is at least R
+    (agents closer than R are in the same cluster). Sorting costs O(n log n), the rest is O(n).
+
+    A batch of M profiles (2D matrix: M x n) is treated at once; then the arrays of clusters
+    have one row per profile, padded to the largest number of clusters (size 0, centroid and
+    variance nan).
+
+    @param data   - data (the last step of opinion dynamics); a profile or a batch (M x n);
+    @param R      - a bound (confidence level); a number or one bound per profile.
+
+    @return       - a tuple (count, labels, sizes, centroids, variances), where labels give
+                    the cluster of every agent (clusters are numbered from the left, 0, 1, ...)
+                    and sizes, centroids and variances describe the agents of every cluster.
+    """
+
+    import numpy as np
+
+    x = np.asarray(data, dtype = float)
+    batch = x.ndim == 2
+    x = np.atleast_2d(x)
+    M, n = x.shape
+
+    # the bound of every profile
+    R = np.reshape(np.broadcast_to(np.asarray(R, dtype = float), (M,)), (M, 1))
+
+    order = np.argsort(x, axis = -1, kind = 'stable')
+    xs = np.take_along_axis(x, order, axis = -1)
+
+    # the sorted labels: a new cluster starts after every gap >= R
+    new = np.diff(xs, axis = -1) >= R
+    lab = np.concatenate((np.zeros((M, 1), dtype = np.int64), np.cumsum(new, axis = -1)), axis = -1)
+
+    count = lab[:, -1] + 1
+    k = int(count.max())
+
+    labels = np.empty_like(lab)
+    np.put_along_axis(labels, order, lab, axis = -1)
+
+    # the statistics of clusters (the clusters of all profiles are numbered together)
+    ids = (np.arange(M)[:, None] * n + lab).ravel()
+
+    sizes = np.bincount(ids, minlength = M * n)
+    sums = np.bincount(ids, weights = xs.ravel(), minlength = M * n)
+
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        centroids = sums / sizes
+        variances = np.bincount(ids, weights = (xs.ravel() - centroids[ids])**2, minlength = M * n) / sizes
+
+    sizes = sizes.reshape(M, n)[:, :k]
+    centroids = centroids.reshape(M, n)[:, :k]
+    variances = variances.reshape(M, n)[:, :k]
+
+    if not batch:
+        return (int(count[0]), labels[0], sizes[0], centroids[0], variances[0])
+
+    return (count, labels, sizes, centroids, variances)
@@ -2,37 +2,23 @@ def calc_cluster_stat (data, R, n):
 
     """
     This function calculates the number of clusters existing in the data and
-    also provides the mean and variance of the clusters.
+    also provides the mean and variance of the clusters (of their centroids).
+    The opinions are sorted and a new cluster starts wherever the gap between
+    two neighbouring opinions is at least R (see calc_cluster_labels).
 
     @param data   - data (the last step of opinion dynamics);
     @param R      - a bound (confidence level);
-    @param n      - a number of agents (radicals included).
+    @param n      - a number of agents (radicals included); the first n agents are taken.
     """
 
     import numpy as np
+    from functions.calc_cluster_labels import calc_cluster_labels
 
-    # the cluster list
-    cl = [data[0]]
-
-    # loop through remaining agents
-    for i in range(n):
-
-        # loop through the clusters found
-        for j in range(len(cl)):
-
-            exists = False
-
-            # if the distance is < R between the agenti and cluster j, the cluster already exists
-            if abs(data[i] - cl[j]) < R:
-                exists = True
-
-        # add a new cluster
-        if not exists:
-            cl.append(data[i])
+    count, _, _, centroids, _ = calc_cluster_labels(np.asarray(data)[:n], R)
 
     # calculate statistics
-    mean = np.mean(cl)
-    var = np.var(cl)
+    mean = np.mean(centroids)
+    var = np.var(centroids)
 
     # return the number of clusters and statistics
-    return (len(cl), mean, var)
+    return (count, mean, var)
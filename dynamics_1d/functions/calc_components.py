@@ -0,0 +1,29 @@
+def calc_components (xs, R):
+
+    """
+    This function splits a sorted opinion profile into groups of connected agents:
+    two neighbouring agents are in the same group if their distance is <= R.
+    The agents of different groups never influence each other again, as in the HK dynamics
+    the opinions of a group stay within the range of its current opinions.
+
+    @param xs     - a sorted distribution of opinions;
+    @param R      - a bound (confidence level).
+
+    @return       - a tuple (comp, spread): the group id of every agent and
+                    the spread (max - min) of the opinions of every group.
+    """
+
+    import numpy as np
+
+    # the first agent of every group
+    first = np.ones(len(xs), dtype = bool)
+    first[1:] = np.diff(xs) > R
+
+    comp = np.cumsum(first) - 1
+
+    # the last agent of every group
+    last = np.append(np.flatnonzero(first)[1:], len(xs)) - 1
+
+    spread = xs[last] - xs[first]
+
+    return (comp, spread)
@@ -2,36 +2,31 @@ def calc_order_par(x, R, n, bound_cond = 'reflect'):
     """
     This function calculates the order parameter of a given opinion profile in 1D.
 
-    @param x              - a distribution of opinions;
+    The opinions are sorted and the neighbours of every agent are counted with binary
+    search (see calc_window), so the calculation costs O(n log n) instead of O(n^2).
+    A trajectory (T x n) or an ensemble (M x n) is treated at once.
+
+    @param x              - a distribution of opinions; or profiles (any leading axes, n agents in the last axis);
     @param R              - a bound (confidence level);
-    @param n              - a number of agents;
+    @param n              - a number of agents; the first n agents are taken;
     @param bound_cond     - boundary conditions: 'reflect', 'adsorb', or 'period'.
+
+    @return               - the order parameter (a number for one profile, an array for profiles).
     """
 
     import numpy as np
+    from functions.calc_window import calc_window
 
-    count = 0
-
-    # loop through all pairwise combinations
-    for i in range(n):
-
-        for j in range(n):
-
-            if bound_cond != 'period':
-
-                if abs(x[i] - x[j]) <= R:
-
-                    count = count + 1
-
-            elif bound_cond == 'period':
+    xs = np.sort(np.asarray(x, dtype = float)[..., :n], axis = -1)
 
-                # check if agent j influences agent i
-                # for periodic boundary condition, the agents can communicate in two directions: <-- and --> on the interval
-                if min(abs(x[i] - x[j]), 1 - abs(x[i] - x[j])) <= R:
+    # find the neighbours of all agents: sorted ids [lo, hi);
+    # for periodic boundary condition, the agents can communicate in two directions: <-- and --> on the interval
+    lo, hi, lo_wrap, hi_wrap = calc_window(xs, R, bound_cond)
 
-                    count = count + 1
+    # count the pairs of agents influencing each other
+    count = np.sum((hi - lo) + lo_wrap + (n - hi_wrap), axis = -1)
 
     # calculate the order parameters
     order_par = count / n**2
 
-    return order_par
+    return order_par if np.ndim(order_par) > 0 else float(order_par)
@@ -0,0 +1,91 @@
+def calc_window (xs, R, bound_cond = 'reflect'):
+
+    """
+    This function finds the confidence interval of every agent in a sorted opinion profile.
+    Binary search is used (np.searchsorted), so the neighbours of all agents are found in O(n log n).
+    The bounds found by np.searchsorted (e.g. x[j] >= x[i] - R) can differ from the comparisons
+    of the pairwise loops (x[i] - x[j] <= R) by round-off, so they are corrected to the pairwise
+    comparisons and exactly the same agents are found to be neighbours.
+
+    For agent i, the neighbours are the agents with the sorted ids in [lo, hi).
+    In the periodic case, the agents with ids in [0, lo_wrap) and [hi_wrap, n) are
+    neighbours through the boundary (on the left and on the right respectively);
+    otherwise lo_wrap = 0 and hi_wrap = n, i.e. these sets are empty.
+
+    @param xs           - a sorted distribution of opinions (sorted along the last axis,
+                          any leading axes are treated as independent profiles);
+    @param R            - a bound (confidence level); either a number or
+                          an array broadcastable to xs[..., :1] (one bound per profile);
+    @param bound_cond   - boundary conditions: 'reflect', 'adsorb', or 'period'.
+
+    @return             - a tuple (lo, hi, lo_wrap, hi_wrap) of integer arrays shaped as xs.
+    """
+
+    import numpy as np
+
+    xs = np.asarray(xs, dtype = float)
+    shape = xs.shape
+    n = shape[-1]
+
+    # the profiles as rows
+    xr = xs.reshape(int(np.prod(shape[:-1])), n)
+    R = np.broadcast_to(np.asarray(R, dtype = float), shape[:-1] + (1,)).reshape(-1, 1)
+
+    # the sorted id of every agent
+    idx = np.broadcast_to(np.arange(n), xr.shape)
+
+    def search(target, side, pred, lo, hi):
+
+        # find the first id in [lo, hi] where pred becomes True (pred is monotone: False, ..., True);
+        # hi is returned if there is no such id. The guess of np.searchsorted is moved by the few ids
+        # where the comparison of pred differs from the target by round-off
+        k = np.array([np.searchsorted(row, t, side) for row, t in zip(xr, target)]).reshape(xr.shape)
+        k = np.clip(k, lo, hi)
+
+        def holds(k):
+            return pred(np.take_along_axis(xr, np.minimum(k, n - 1), axis = -1))
+
+        while True:
+            back = (k > lo) & holds(k - 1)
+            if not np.any(back):
+                break
+            k = k - back
+
+        while True:
+            ahead = (k < hi) & ~holds(k)
+            if not np.any(ahead):
+                break
+            k = k + ahead
+
+        return k
+
+    zeros = np.zeros(xr.shape, dtype = np.int64)
+    ends = np.full(xr.shape, n, dtype = np.int64)
+
+    def result(*windows):
+        return tuple(w.reshape(shape) for w in windows)
+
+    # -------------------------------------------------
+    # standard neighbours: x[i] - R <= x[j] <= x[i] + R
+    lo = search(xr - R, 'left', lambda xm: xr - xm <= R, zeros, idx)
+    hi = search(xr + R, 'right', lambda xm: xm - xr > R, idx, ends)
+
+    if bound_cond != 'period':
+        return result(lo, hi, zeros, ends)
+
+    # -------------------------------------------------
+    # periodic case: the agents can communicate in two directions: <-- and --> on the interval.
+    # The agent j is near (the shorter distance is not going through the boundary)
+    # if abs(x[i] - x[j]) <= 1 - abs(x[i] - x[j]), these agents are in [near_lo, near_hi)
+    near_lo = search(xr - 0.5, 'left', lambda xm: xr - xm <= 1 - (xr - xm), zeros, idx)
+    near_hi = search(xr + 0.5, 'right', lambda xm: ~(xm - xr <= 1 - (xm - xr)), idx, ends)
+
+    # standard neighbours are the near agents within R
+    lo = np.maximum(lo, near_lo)
+    hi = np.minimum(hi, near_hi)
+
+    # neighbours through the boundary are the far agents with 1 - abs(x[i] - x[j]) <= R
+    lo_wrap = search(xr - 1 + R, 'right', lambda xm: 1 - (xr - xm) > R, zeros, near_lo)
+    hi_wrap = search(xr + 1 - R, 'left', lambda xm: 1 - (xm - xr) <= R, near_hi, ends)
+
+    return result(lo, hi, lo_wrap, hi_wrap)
@@ -0,0 +1,38 @@
+def combine_radicals (x0, n_rad = 0, x0_rad = None):
+
+    """
+    This function combines the normal agents and the radicals into one sorted profile
+    and finds the ids of the radicals in it. If an opinion is held by a radical and by
+    other agents, the first free id of that opinion is taken for every radical.
+
+    @param x0           - an initial distribution of normal opinions;
+    @param n_rad        - a number of radicals;
+    @param x0_rad       - a distribution of radicals.
+
+    @return             - a tuple (n_all, x0_all, is_rad), where x0_all is the combined sorted profile
+                          (x0 as it is if there are no radicals) and is_rad is an array of flags
+                          indicating the radicals in x0_all.
+    """
+
+    import numpy as np
+
+    if n_rad == 0:
+        return (len(x0), np.array(x0, dtype = float), np.zeros(len(x0), dtype = bool))
+
+    # combine the radicals and normal agents
+    n_all = len(x0) + n_rad
+    x0_all = np.concatenate((np.asarray(x0, dtype = float), np.asarray(x0_rad, dtype = float)))
+    x0_all.sort()
+
+    # find radical ids
+    is_rad = np.zeros(n_all, dtype = bool)
+
+    for r in x0_rad:
+
+        j = np.searchsorted(x0_all, r)
+        while is_rad[j]:
+            j += 1
+
+        is_rad[j] = True
+
+    return (n_all, x0_all, is_rad)
@@ -1,82 +1,87 @@
-def dxdt(t, x, R, n, include_self = True, radicals_idx = [], bound_cond = 'reflect'):
+def dxdt(t, x, R, n, include_self = True, radicals_idx = [], bound_cond = 'reflect', w = None):
     """
     This function generates the RHS of the ODE version of HK opinion dynamics in 1D.
 
+    The opinions are sorted and the neighbours of every agent are found by binary search
+    (see calc_window), so the sums of opinion differences are taken from the prefix sums
+    of opinions and the RHS costs O(n log n). In the periodic case, the neighbours through
+    the boundary are taken from the two wrap-around windows.
+    A stack of profiles (..., n) is also accepted, each profile is handled independently.
+    If the weights w are given, x[i] stands for w[i] agents sharing an opinion (see merge_agents).
+
     @param t              - a time variable (empty);
     @param x              - a current distribution of opinions;
     @param R              - a bound (confidence level);
     @param n              - a number of agents;
     @param include_self   - a flag indicating if self opinion plays a part in the stepping process;
     @param radicals_idx   - a set of radical ids in the distribution array x (may be empty);
-    @param bound_cond     - boundary conditions: 'reflect', 'adsorb', or 'period'.
+    @param bound_cond     - boundary conditions: 'reflect', 'adsorb', or 'period';
+    @param w              - an array of weights (numbers of agents) of the opinions (None: all ones).
     """
 
     import numpy as np
+    from functions.calc_window import calc_window
+    from functions import jit_kernels
 
-    y = np.copy(x)
-
-    # update one step
-    for i in range(n):
-
-        # radical opinions stay constant
-        if i in radicals_idx:
-            y[i] = 0
-            continue
-
-        # reset the set I and sum of opinions
-        I = []
-        sum = 0
-
-        for j in range(n):
+    x = np.asarray(x, dtype = float)
+    m = x.shape[-1]
 
-            if not include_self:
-                # do not include the agent i himself
-                if i == j:
-                    continue
+    # use the compiled kernel for a single profile
+    if jit_kernels.ENABLED and x.ndim == 1 and np.ndim(R) == 0:
 
-            if bound_cond != 'period':
+        fixed = np.zeros(m, dtype = bool)
+        fixed[radicals_idx] = True
 
-                # check if agent j influences agent i
-                if abs(x[i] - x[j]) <= R:
+        ws = np.ones(m) if w is None else np.asarray(w, dtype = float)
 
-                    # add it to the set I
-                    I.append(j)
+        return jit_kernels.drift(x, float(R), n, include_self, fixed, bound_cond == 'period', ws)
 
-                    # update the sum of opinion differences
-                    sum = sum + (x[i] - x[j])
+    # sort the opinions
+    order = np.argsort(x, axis = -1, kind = 'stable')
+    xs = np.take_along_axis(x, order, axis = -1)
 
-            elif bound_cond == 'period':
+    # find the neighbours of all agents
+    lo, hi, lo_wrap, hi_wrap = calc_window(xs, R, bound_cond)
 
-                # check if agent j influences agent i
-                # for periodic boundary condition, the agents can communicate in two directions: <-- and --> on the interval
-                if min(abs(x[i] - x[j]), 1 - abs(x[i] - x[j])) <= R:
+    # the weights of opinions
+    if w is None:
+        ws = np.ones(xs.shape)
+    else:
+        ws = np.take_along_axis(np.broadcast_to(np.asarray(w, dtype = float), x.shape), order, axis = -1)
 
-                    # add it to the set I
-                    I.append(j)
+    # the prefix sums of weights and (weighted) opinions
+    zero = np.zeros(xs.shape[:-1] + (1,))
+    cw = np.concatenate((zero, np.cumsum(ws, axis = -1)), axis = -1)
+    cs = np.concatenate((zero, np.cumsum(ws * xs, axis = -1)), axis = -1)
 
-                    # option 1: standard case
-                    if abs(x[i] - x[j]) <= 1 - abs(x[i] - x[j]):
+    def window_sum(c, a, b):
+        return np.take_along_axis(c, b, axis = -1) - np.take_along_axis(c, a, axis = -1)
 
-                        # update the sum of opinion differences
-                        sum = sum + (x[i] - x[j])
+    # the number of neighbours and the sum of opinion differences
+    sum = window_sum(cw, lo, hi) * xs - window_sum(cs, lo, hi)
 
-                    # option 2: the shorter distance is going through boundary
-                    elif 1 - abs(x[i] - x[j]) < abs(x[i] - x[j]):
+    if bound_cond == 'period':
 
-                        if x[i] < x[j]:
+        # the shorter distance is going through boundary:
+        # on the left, the difference is -(1 - abs(x[i] - x[j])) = x[i] - (x[j] + 1),
+        # on the right, the difference is 1 - abs(x[i] - x[j]) = x[i] - (x[j] - 1)
+        zeros = np.zeros_like(lo_wrap)
+        ends = np.full_like(hi_wrap, m)
 
-                            # update the sum of opinion differences
-                            sum = sum + (1 - abs(x[i] - x[j]))
+        sum = sum + window_sum(cw, zeros, lo_wrap) * (xs - 1) - window_sum(cs, zeros, lo_wrap)
+        sum = sum + window_sum(cw, hi_wrap, ends) * (xs + 1) - window_sum(cs, hi_wrap, ends)
 
-                        elif x[i] > x[j]:
+    # apply the RHS of ODE
+    if include_self:
+        ys = (-1/n) * sum
+    else:
+        ys = (-1/(n-1)) * sum
 
-                            # update the sum of opinion differences
-                            sum = sum - (1 - abs(x[i] - x[j]))
+    # put the agents back in their places
+    y = np.empty_like(x)
+    np.put_along_axis(y, order, ys, axis = -1)
 
-        # apply the RHS of ODE
-        if include_self:
-            y[i] = (-1/n) * sum
-        else:
-            y[i] = (-1/(n-1)) * sum
+    # radical opinions stay constant
+    y[..., radicals_idx] = 0
 
     return y
@@ -0,0 +1,198 @@
+"""
+Compiled (Numba) kernels of HK opinion dynamics in 1D.
+
+The kernels are used by the engines (HK_discrete, HK_discrete_r, HK_discrete_fast, dxdt,
+HK_sde, HK_sde_r) if Numba is installed and the environment variable HK_NUMBA=1 is set
+(or ENABLED is set to True at runtime). Otherwise, the engines use NumPy.
+The compiled kernels are cached on disk, so worker processes do not compile them again.
+
+The kernels of the discrete step and the RHS work on sorted opinions with two pointers
+(the windows of neighbours only move to the right), so one step costs O(n log n) for sorting
+and O(n) for the update. The comparisons are the same as in the pairwise loops.
+"""
+
+import os
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# the flag indicating if the compiled kernels are used
+ENABLED = numba is not None and os.environ.get('HK_NUMBA', '0') == '1'
+
+
+def jit(f):
+
+    # compile the function if Numba is available (the plain Python function is kept otherwise)
+    if numba is None:
+        return f
+
+    return numba.njit(cache = True)(f)
+
+
+@jit
+def discrete_step(x, R, include_self, fixed):
+
+    """
+    One step of the discrete HK model.
+
+    @param x            - a current distribution of opinions;
+    @param R            - a bound (confidence level);
+    @param include_self - a flag indicating if self opinion plays a part in the stepping process;
+    @param fixed        - an array of flags indicating the constant opinions (radicals).
+    """
+
+    n = len(x)
+
+    # sort the opinions
+    order = np.argsort(x, kind = 'mergesort')
+    xs = x[order]
+
+    # the prefix sums of opinions
+    cs = np.zeros(n + 1)
+    for i in range(n):
+        cs[i + 1] = cs[i] + xs[i]
+
+    y = np.empty(n)
+
+    # the window of neighbours [lo, hi)
+    lo = 0
+    hi = 0
+
+    for i in range(n):
+
+        while xs[i] - xs[lo] > R:
+            lo += 1
+
+        if hi < i:
+            hi = i
+
+        while hi < n and xs[hi] - xs[i] <= R:
+            hi += 1
+
+        k = order[i]
+
+        # radical opinions stay constant
+        if fixed[k]:
+            y[k] = x[k]
+            continue
+
+        # the number and the sum of neighbour opinions
+        count = hi - lo
+        s = cs[hi] - cs[lo]
+
+        if not include_self:
+            # do not include the agent i himself
+            count -= 1
+            s -= xs[i]
+
+        # apply the stepping rule
+        if count != 0:
+            y[k] = s / count
+        else:
+            y[k] = x[k]
+
+    return y
+
+
+@jit
+def drift(x, R, n, include_self, fixed, period, w):
+
+    """
+    The RHS of the ODE version of HK opinion dynamics (see dxdt).
+
+    @param x            - a current distribution of opinions;
+    @param R            - a bound (confidence level);
+    @param n            - a number of agents (the normalisation);
+    @param include_self - a flag indicating if self opinion plays a part in the stepping process;
+    @param fixed        - an array of flags indicating the constant opinions (radicals);
+    @param period       - a flag indicating the periodic boundary conditions;
+    @param w            - an array of weights (numbers of agents) of the opinions.
+    """
+
+    m = len(x)
+
+    # sort the opinions
+    order = np.argsort(x, kind = 'mergesort')
+    xs = x[order]
+
+    # the prefix sums of weights and weighted opinions
+    cw = np.zeros(m + 1)
+    cs = np.zeros(m + 1)
+    for i in range(m):
+        cw[i + 1] = cw[i] + w[order[i]]
+        cs[i + 1] = cs[i] + w[order[i]] * xs[i]
+
+    if include_self:
+        norm = -1 / n
+    else:
+        norm = -1 / (n - 1)
+
+    y = np.empty(m)
+
+    # the windows: within R [lo, hi), near [near_lo, near_hi), through the boundary [0, lo_w), [hi_w, m)
+    lo = 0
+    hi = 0
+    near_lo = 0
+    near_hi = 0
+    lo_w = 0
+    hi_w = 0
+
+    for i in range(m):
+
+        while xs[i] - xs[lo] > R:
+            lo += 1
+
+        if hi < i:
+            hi = i
+
+        while hi < m and xs[hi] - xs[i] <= R:
+            hi += 1
+
+        a = lo
+        b = hi
+
+        if period:
+
+            # the agent j is near if abs(x[i] - x[j]) <= 1 - abs(x[i] - x[j])
+            while not (xs[i] - xs[near_lo] <= 1 - (xs[i] - xs[near_lo])):
+                near_lo += 1
+
+            if near_hi < i:
+                near_hi = i
+
+            while near_hi < m and xs[near_hi] - xs[i] <= 1 - (xs[near_hi] - xs[i]):
+                near_hi += 1
+
+            a = max(lo, near_lo)
+            b = min(hi, near_hi)
+
+            # the far agents with 1 - abs(x[i] - x[j]) <= R
+            while lo_w < near_lo and 1 - (xs[i] - xs[lo_w]) <= R:
+                lo_w += 1
+
+            if hi_w < near_hi:
+                hi_w = near_hi
+
+            while hi_w < m and not (1 - (xs[hi_w] - xs[i]) <= R):
+                hi_w += 1
+
+        k = order[i]
+
+        # radical opinions stay constant
+        if fixed[k]:
+            y[k] = 0
+            continue
+
+        # the sum of opinion differences
+        s = (cw[b] - cw[a]) * xs[i] - (cs[b] - cs[a])
+
+        if period:
+            s += cw[lo_w] * (xs[i] - 1) - cs[lo_w]
+            s += (cw[m] - cw[hi_w]) * (xs[i] + 1) - (cs[m] - cs[hi_w])
+
+        y[k] = norm * s
+
+    return y
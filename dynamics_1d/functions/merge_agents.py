@@ -0,0 +1,41 @@
+def merge_agents (x, w, labels, fixed, tol = 10**(-10)):
+
+    """
+    This function merges the agents that share an opinion.
+    The state is given as (opinion, weight) pairs, the weight being the number of agents
+    holding that opinion. Neighbouring opinions closer than tol are merged into one with
+    the summed weight (the opinion is replaced by the weighted mean).
+    Constant opinions (radicals) are only merged with other constant opinions.
+
+    @param x            - a sorted array of distinct opinions;
+    @param w            - an array of weights (numbers of agents) of the opinions;
+    @param labels       - an array giving the id in x for every agent;
+    @param fixed        - an array of flags indicating the constant opinions (radicals);
+    @param tol          - a tolerance for treating two opinions as the same.
+
+    @return             - a tuple (x, w, labels, fixed) for the merged state
+                          (the same arrays are returned if nothing is merged).
+    """
+
+    import numpy as np
+
+    # the first opinion of every group of equal opinions
+    first = np.ones(len(x), dtype = bool)
+    first[1:] = (np.diff(x) > tol) | (fixed[1:] != fixed[:-1])
+
+    # nothing to merge
+    if np.all(first):
+        return (x, w, labels, fixed)
+
+    # the group id of every opinion
+    group = np.cumsum(first) - 1
+
+    # the merged weights and opinions (weighted means)
+    w_new = np.bincount(group, weights = w)
+    x_new = np.bincount(group, weights = w * x) / w_new
+
+    # the constant opinions are not moved
+    fixed_new = fixed[first]
+    x_new[fixed_new] = x[first][fixed_new]
+
+    return (x_new, w_new, group[labels], fixed_new)
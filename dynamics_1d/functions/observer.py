@@ -0,0 +1,197 @@
+from functions.recorder import Recorder
+
+
+class Observer(Recorder):
+
+    """
+    This class evaluates observables of opinion dynamics while the engine integrates,
+    so the trajectory does not have to be stored to calculate a few numbers.
+
+    An observer is passed to an engine as its 'result' argument (as a Recorder); the observables
+    are evaluated at every stride'th step or at the given times, and the engine returns
+    a dictionary of arrays (one value per recorded step for every observable).
+
+    Built-in observables (the profile is x, R, n and bound_cond are given to the observer):
+        'order_par'   - the order parameter (see calc_order_par);
+        'clusters'    - the number of clusters (see calc_cluster_stat);
+        'cluster_var' - the variance of clusters (see calc_cluster_stat);
+        'nb_hist'     - the histogram of the numbers of neighbours (self included): array of n + 1 counts.
+    The cluster statistics of a state are calculated once and shared by 'clusters' and 'cluster_var'.
+    With last set, only the last state of the run is evaluated (whenever the run stops).
+
+    @param observables  - a list of the built-in names and (name, function) pairs;
+                          a function is called with the opinions x and returns a number or an array;
+    @param R            - a bound (confidence level);
+    @param n            - a number of agents (radicals included);
+    @param bound_cond   - boundary conditions: 'reflect', 'adsorb', or 'period';
+    @param stride       - the observables are evaluated at every stride'th step (0, stride, 2 * stride, ...);
+    @param times        - a list of step numbers to evaluate at (used instead of the stride);
+                          a time after the last step gives the values of the last state;
+    @param last         - a flag indicating if only the last state is evaluated (one value for every observable).
+    """
+
+    def __init__(self, observables, R = None, n = None, bound_cond = 'reflect', stride = 1, times = None, last = False):
+
+        Recorder.__init__(self, stride = stride, times = times)
+
+        self.R = R
+        self.n = n
+        self.bound_cond = bound_cond
+        self.last_only = last
+
+        # the number of evaluations, the evaluation in progress (None: no evaluation)
+        # and the cluster statistics of its state
+        self._evals = 0
+        self._key = None
+        self._stat_key = None
+        self._stat = None
+
+        # the names and functions of all observables
+        self.names = []
+        self.functions = []
+
+        for obs in observables:
+
+            if isinstance(obs, str):
+                self.names.append(obs)
+                self.functions.append(self._builtin(obs))
+
+            else:
+                self.names.append(obs[0])
+                self.functions.append(obs[1])
+
+        # the values of every observable
+        self.values = [[] for _ in self.names]
+
+    def append(self, x, labels = None):
+
+        """
+        Pass the next state of the dynamics (the initial state first).
+        For weighted opinions, the labels give the id in x for every agent (the state is x[labels]).
+        """
+
+        step = self.seen
+        self.seen += 1
+        self.last = x
+        self.last_labels = labels
+
+        # check if the state is observed
+        if self.last_only:
+            return
+
+        if self._times_set is not None:
+            if step not in self._times_set:
+                return
+
+        elif step % self.stride != 0:
+            return
+
+        for k, value in enumerate(self._evaluate(self._expand(x, labels))):
+            self.values[k].append(value)
+
+        self.count += 1
+        self.steps.append(step)
+
+    def observe(self, x):
+
+        """
+        Evaluate all observables for the opinions x (e.g. the last state).
+
+        @return             - a dictionary {name: value}.
+        """
+
+        return dict(zip(self.names, self._evaluate(x)))
+
+    def result(self):
+
+        """
+        Return the values as a dictionary {name: array} (steps x shape of the value).
+        For the given times, the values are returned in the order of times;
+        with last set, every array holds the value of the last state only.
+        """
+
+        import numpy as np
+
+        if self.last_only:
+
+            # the values of the last state
+            if self.seen == 0:
+                return {name: np.array([]) for name in self.names}
+
+            return {name: np.array([value]) for name, value in self.observe(self.last_state()).items()}
+
+        if self.times is None:
+            return {name: np.array(v) for name, v in zip(self.names, self.values)}
+
+        # the row of every observed step (the missing times are taken from the last state)
+        row = {s: k for k, s in enumerate(self.steps)}
+        last = self.observe(self.last_state()) if any(t not in row for t in self.times) else None
+
+        return {name: np.array([v[row[t]] if t in row else last[name] for t in self.times])
+                for name, v in zip(self.names, self.values)}
+
+    def stat(self, x):
+
+        """
+        Return the cluster statistics of the opinions x (see calc_cluster_stat).
+        While the observables of a state are evaluated, the statistics are calculated once for all
+        of them; the cache belongs to that evaluation only (not to the array), so a state updated
+        in place is never given the statistics of the previous one.
+        """
+
+        from functions.calc_cluster_stat import calc_cluster_stat
+
+        if self._key is None:
+            return calc_cluster_stat(x, self.R, self.n)
+
+        if self._stat_key != self._key:
+            self._stat = calc_cluster_stat(x, self.R, self.n)
+            self._stat_key = self._key
+
+        return self._stat
+
+    def _evaluate(self, x):
+
+        # the values of all observables for the opinions x (one evaluation shares the cluster statistics)
+        self._evals += 1
+        self._key = self._evals
+
+        values = [f(x) for f in self.functions]
+        self._key = None
+
+        return values
+
+    def _builtin(self, name):
+
+        # the function of a built-in observable
+        import numpy as np
+        from functions.calc_order_par import calc_order_par
+        from functions.calc_window import calc_window
+
+        if self.R is None or self.n is None:
+            raise ValueError("R and n must be given for the observable '{}'".format(name))
+
+        R, n, bound_cond = self.R, self.n, self.bound_cond
+
+        if name == 'order_par':
+            return lambda x: calc_order_par(x, R, n, bound_cond)
+
+        if name == 'clusters':
+            return lambda x: self.stat(x)[0]
+
+        if name == 'cluster_var':
+            return lambda x: self.stat(x)[2]
+
+        if name == 'nb_hist':
+
+            def nb_hist(x):
+
+                # the number of neighbours of every agent (through the boundary as well)
+                lo, hi, lo_wrap, hi_wrap = calc_window(np.sort(x), R, bound_cond)
+                count = hi - lo + lo_wrap + (len(x) - hi_wrap)
+
+                return np.bincount(count, minlength = n + 1)
+
+            return nb_hist
+
+        raise ValueError("unknown observable '{}'".format(name))
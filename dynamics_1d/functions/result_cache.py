@@ -0,0 +1,224 @@
+class ResultCache:
+
+    """
+    This class memoizes the results of the engines (deterministic simulations), so that
+    the same simulation is not calculated again in a script, in other scripts, or in later sessions.
+
+    A result is stored under the hash of the engine (its name and source code, the source code of
+    the modules in functions it imports, directly or not, and the flag of the compiled kernels),
+    the parameters (defaults included) and the initial profile; the seed of an SDE engine is a parameter (rng).
+    The last results are kept in memory (least recently used are dropped first) and all results
+    are kept on disk, where the least recently used files are deleted if the size limit is exceeded.
+
+    A call is not cached (the engine is just called) if it is not deterministic: an SDE engine
+    without a seed or with a Generator (rng), or a Recorder given as the result.
+    The returned results are shared with the cache and must not be modified.
+
+    Usage: cache(engine, *args, **kwargs) instead of engine(*args, **kwargs).
+
+    @param path         - a directory of the on-disk tier (None: memory only);
+    @param max_items    - a number of results kept in memory;
+    @param max_bytes    - a size limit of the on-disk tier in bytes (None: no limit).
+    """
+
+    def __init__(self, path = None, max_items = 128, max_bytes = 2**30):
+
+        import os
+        from collections import OrderedDict
+
+        self.path = path
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+
+        # the in-memory tier (the most recently used are at the end)
+        self.memory = OrderedDict()
+
+        # the hashes of the engines' source code (with the modules they import)
+        self._sources = {}
+
+        if path is not None:
+            os.makedirs(path, exist_ok = True)
+
+    def __call__(self, engine, *args, **kwargs):
+
+        import os
+        import pickle
+        import inspect
+        import numpy as np
+        from functions.recorder import Recorder
+
+        # the parameters of the call (defaults included)
+        bound = inspect.signature(engine).bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = bound.arguments
+
+        # the calls that are not deterministic are not cached
+        if isinstance(params.get('result'), Recorder):
+            return engine(*args, **kwargs)
+
+        if 'rng' in params and (params['rng'] is None or isinstance(params['rng'], np.random.Generator)):
+            return engine(*args, **kwargs)
+
+        key = self.key(engine, params)
+
+        # the in-memory tier
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+
+        # the on-disk tier
+        file = None if self.path is None else os.path.join(self.path, key + '.pkl')
+
+        if file is not None and os.path.exists(file):
+
+            with open(file, 'rb') as f:
+                res = pickle.load(f)
+
+            # mark the file as recently used
+            os.utime(file)
+
+        else:
+
+            res = engine(*args, **kwargs)
+
+            if file is not None:
+                self._write(file, res)
+                self._evict()
+
+        self._remember(key, res)
+
+        return res
+
+    def key(self, engine, params):
+
+        """
+        Return the hash of an engine call: the engine and the parameters {name: value}.
+        """
+
+        import hashlib
+        from functions import jit_kernels
+
+        name = engine.__module__ + '.' + engine.__qualname__
+
+        if name not in self._sources:
+            self._sources[name] = _source_hash(engine)
+
+        h = hashlib.sha256()
+        h.update(name.encode())
+        h.update(self._sources[name].encode())
+
+        # the compiled kernels sum the opinions in another order than NumPy
+        h.update(repr(('numba', jit_kernels.ENABLED)).encode())
+
+        for p, value in params.items():
+            h.update(p.encode())
+            h.update(_canonical(value))
+
+        return h.hexdigest()
+
+    def _remember(self, key, res):
+
+        # keep the result in memory (drop the least recently used results)
+        self.memory[key] = res
+        self.memory.move_to_end(key)
+
+        while len(self.memory) > self.max_items:
+            self.memory.popitem(last = False)
+
+    def _write(self, file, res):
+
+        # write the result under a temporary name first, then rename it
+        import os
+        import pickle
+
+        tmp = file + '.tmp'
+
+        with open(tmp, 'wb') as f:
+            pickle.dump(res, f)
+
+        os.replace(tmp, file)
+
+    def _evict(self):
+
+        # delete the least recently used files until the on-disk tier fits the size limit
+        import os
+
+        if self.max_bytes is None:
+            return
+
+        files = [os.path.join(self.path, f) for f in os.listdir(self.path) if f.endswith('.pkl')]
+        stats = [(os.stat(f).st_mtime, os.stat(f).st_size, f) for f in files]
+        size = sum(s for _, s, _ in stats)
+
+        for _, s, f in sorted(stats):
+
+            if size <= self.max_bytes:
+                break
+
+            os.remove(f)
+            size -= s
+
+
+def _source_hash (engine):
+
+    # the hash of the source code of an engine and of the modules in functions it imports
+    # (the imports are inside the functions: from functions.X import X), found recursively
+    import re
+    import hashlib
+    import inspect
+    import importlib
+
+    try:
+        source = inspect.getsource(engine)
+    except (OSError, TypeError):
+        return hashlib.sha256(b'').hexdigest()
+
+    # the source code of the imported modules
+    modules = {}
+    todo = re.findall(r'from functions\.(\w+) import', source)
+
+    while todo:
+
+        module = todo.pop()
+
+        if module in modules:
+            continue
+
+        try:
+            modules[module] = inspect.getsource(importlib.import_module('functions.' + module))
+        except (ImportError, OSError, TypeError):
+            modules[module] = ''
+
+        todo.extend(re.findall(r'from functions\.(\w+) import', modules[module]))
+
+    h = hashlib.sha256(source.encode())
+
+    # the modules in a fixed order
+    for module in sorted(modules):
+        h.update(module.encode())
+        h.update(hashlib.sha256(modules[module].encode()).digest())
+
+    return h.hexdigest()
+
+
+def _canonical (value):
+
+    # the bytes representing a parameter value: numbers and (nested) lists of numbers
+    # are arrays (so that x0 given as a list or an array gives the same key)
+    import numpy as np
+
+    if isinstance(value, np.random.SeedSequence):
+        return repr(('seed', value.entropy, value.spawn_key)).encode()
+
+    if isinstance(value, (list, tuple, np.ndarray, int, float, np.number)) and not isinstance(value, bool):
+
+        try:
+            a = np.asarray(value)
+        except ValueError:
+            a = None
+
+        if a is not None and a.dtype.kind in 'biuf':
+            a = np.ascontiguousarray(a)
+            return repr(('array', a.dtype.str, a.shape)).encode() + a.tobytes()
+
+    return repr(value).encode()
@@ -0,0 +1,196 @@
+"""
+Binary storage of the results of simulations: typed n-dimensional arrays with named axes.
+
+A result is a directory with two files: 'data.bin' holds the raw array (C order) and
+'meta.json' holds its type, shape, the names and coordinates of the axes (e.g. sigma, R, N,
+time, sample) and the parameters of the simulation. The array is loaded as a memory map,
+so nothing is parsed or copied, and new rows can be appended along the first axis
+(e.g. Monte Carlo samples) without rewriting the stored ones. Only arrays of numbers
+(and other fixed-size types) can be stored, not arrays of Python objects.
+
+The results saved earlier as CSV files (a row per line, a cell is a number or a printed list)
+are read by load_results too, see load_csv_results.
+"""
+
+
+def save_results (path, data, axes, coords = None, meta = None):
+
+    """
+    This function saves an array of results (an existing result is replaced).
+
+    @param path         - a directory of the result;
+    @param data         - an array of results (a leading axis of length 0 gives an empty result
+                          that is filled by append_results);
+    @param axes         - the names of the axes of data;
+    @param coords       - a dictionary {axis name: values} of the coordinates of the axes;
+    @param meta         - a dictionary of the parameters of the simulation (numbers, strings and lists).
+    """
+
+    import numpy as np
+    import os
+
+    data = np.ascontiguousarray(data)
+
+    # the objects would be written as pointers
+    if data.dtype.hasobject:
+        raise ValueError('an array of objects cannot be saved, convert it to an array of numbers first')
+
+    if len(axes) != data.ndim:
+        raise ValueError('the number of axes does not match the array')
+
+    os.makedirs(path, exist_ok = True)
+
+    info = {'dtype': data.dtype.str,
+            'shape': list(data.shape),
+            'axes': list(axes),
+            'coords': {} if coords is None else {name: np.asarray(v).tolist() for name, v in coords.items()},
+            'meta': {} if meta is None else meta}
+
+    # the data is written first, so the result is never described by an unfinished file
+    tmp = os.path.join(path, 'data.bin.tmp')
+    data.tofile(tmp)
+    os.replace(tmp, os.path.join(path, 'data.bin'))
+
+    _write_info(path, info)
+
+
+def append_results (path, block, coords = None):
+
+    """
+    This function appends rows to a saved array along its first axis.
+
+    @param path         - a directory of the result;
+    @param block        - one row (shaped as the array without the first axis) or rows;
+    @param coords       - the coordinates of the appended rows on the first axis.
+    """
+
+    import numpy as np
+    import os
+
+    info = _read_info(path)
+    shape = info['shape']
+
+    block = np.ascontiguousarray(block, dtype = np.dtype(info['dtype']))
+
+    if block.shape == tuple(shape[1:]):
+        block = block[None]
+
+    if block.shape[1:] != tuple(shape[1:]):
+        raise ValueError('the rows do not match the shape of the stored array')
+
+    # append the rows after the stored ones (only the described rows are ever read)
+    with open(os.path.join(path, 'data.bin'), 'r+b') as f:
+        f.seek(int(np.prod(shape)) * block.dtype.itemsize)
+        f.write(block.tobytes())
+        f.truncate()
+
+    shape[0] += len(block)
+
+    if coords is not None:
+        name = info['axes'][0]
+        info['coords'][name] = info['coords'].get(name, []) + np.asarray(coords).tolist()
+
+    _write_info(path, info)
+
+
+def load_results (path, mmap = True):
+
+    """
+    This function loads a saved array of results.
+
+    @param path         - a directory of the result (if there is none, the CSV file path + '.csv' is read,
+                          see load_csv_results);
+    @param mmap         - a flag indicating if the array is memory-mapped (read-only, no copy)
+                          or read into memory.
+
+    @return             - a tuple (data, info), where info is a dictionary with the keys
+                          'axes' (names), 'coords' ({axis name: array}) and 'meta'.
+    """
+
+    import numpy as np
+    import os
+
+    # a result saved as a CSV file
+    if not os.path.exists(os.path.join(path, 'meta.json')) and os.path.exists(path + '.csv'):
+        return load_csv_results(path + '.csv')
+
+    info = _read_info(path)
+
+    dtype = np.dtype(info['dtype'])
+    shape = tuple(info['shape'])
+    file = os.path.join(path, 'data.bin')
+
+    if int(np.prod(shape)) == 0:
+        data = np.empty(shape, dtype = dtype)
+
+    elif mmap:
+        data = np.memmap(file, dtype = dtype, mode = 'r', shape = shape)
+
+    else:
+        data = np.fromfile(file, dtype = dtype, count = int(np.prod(shape))).reshape(shape)
+
+    info['coords'] = {name: np.asarray(v) for name, v in info['coords'].items()}
+
+    return (data, info)
+
+
+def load_csv_results (file):
+
+    """
+    This function loads the results saved as a CSV file: a row of results per line, where a cell
+    is a number or a printed list or array of numbers (e.g. '[0.1 0.25 0.5]'); all cells have
+    the same number of values. The result can be saved in the binary format by save_results.
+
+    @param file         - a CSV file;
+
+    @return             - a tuple (data, info) as load_results; the axes are 'row', 'column'
+                          and 'value' (if the cells hold lists).
+    """
+
+    import numpy as np
+    import csv
+
+    with open(file, 'r', newline = '') as f:
+        rows = [row for row in csv.reader(f, delimiter = ',', quotechar = '"') if row]
+
+    # the values of every cell (separated by spaces or commas, in brackets for lists)
+    cells = [[cell.replace('[', ' ').replace(']', ' ').replace(',', ' ').split() for cell in row] for row in rows]
+    lists = any(cell.strip().startswith('[') for row in rows for cell in row)
+
+    data = np.array([[[float(v) for v in cell] for cell in row] for row in cells], dtype = float)
+
+    if lists:
+        axes = ['row', 'column', 'value']
+    else:
+        data = data.reshape(data.shape[:2])
+        axes = ['row', 'column']
+
+    return (data, {'axes': axes, 'coords': {}, 'meta': {'file': file}})
+
+
+def _read_info (path):
+
+    # read the description of a result
+    import json
+    import os
+
+    with open(os.path.join(path, 'meta.json'), 'r') as f:
+        return json.load(f)
+
+
+def _write_info (path, info):
+
+    # write the description of a result under a temporary name first, then rename it
+    import json
+    import os
+
+    def default(obj):
+        # numpy numbers and arrays
+        return obj.tolist()
+
+    tmp = os.path.join(path, 'meta.json.tmp')
+
+    with open(tmp, 'w') as f:
+        json.dump(info, f, default = default)
+
+    os.replace(tmp, os.path.join(path, 'meta.json'))
@@ -0,0 +1,153 @@
+def run_sweep (f, grid, processes = None, chunksize = None, blas_threads = 1, seed = None, store = None, meta = None):
+
+    """
+    This function runs a function over a parameter grid (e.g. sigma x R x n x replicate)
+    on multiple processing units and returns the results in the grid order.
+
+    One pool of workers is used for the whole grid. The cells are put in a queue and every
+    worker takes the next chunk of cells when it has finished the previous one, so the workers
+    stay busy even if the run time varies a lot across the grid. The workers use blas_threads
+    BLAS threads each, so they do not compete for the cores: the thread variables (OMP_NUM_THREADS, ...)
+    are capped while the workers are started (the environment of the caller is restored afterwards)
+    and the workers limit their loaded BLAS with threadpoolctl. Without threadpoolctl, the limit
+    cannot be applied to a BLAS loaded before the workers were forked (a warning is given).
+
+    @param f            - a function called with the parameters of one cell as keyword arguments
+                          (use functools.partial for the fixed arguments); it must be picklable;
+    @param grid         - a dictionary {name: values} of the grid axes (in the order of the axes);
+    @param processes    - a number of worker processes (None: the number of CPUs; 1: no pool);
+    @param chunksize    - a number of cells taken by a worker at once (None: chosen from the grid size);
+    @param blas_threads - a number of BLAS threads of every worker (None: not limited);
+    @param seed         - a root seed; if given, every cell gets its own random stream as
+                          the keyword argument rng (see seed_streams), so the results do not
+                          depend on the number of processes;
+    @param store        - a directory (or a CellStore) where every finished cell is saved at once;
+                          the cells found there are not calculated again (the sweep is resumed);
+    @param meta         - a dictionary {name: value} of the fixed parameters of f (e.g. n, h, max_steps);
+                          a store given as a directory is checked against them and the seed
+                          (see cell_store), so the cells of different runs are never mixed.
+
+    @return             - an array of the results (objects) shaped as the grid.
+    """
+
+    import numpy as np
+    import os
+    import warnings
+    import importlib.util
+    import multiprocessing as mp
+    from functions.seed_streams import seed_streams
+    from functions.cell_store import CellStore
+
+    names = list(grid)
+    values = [list(grid[name]) for name in names]
+    shape = tuple(len(v) for v in values)
+
+    streams = None if seed is None else seed_streams(seed, shape)
+
+    if store is not None and not isinstance(store, CellStore):
+        store = CellStore(store, grid, dict(meta or {}, seed = seed))
+
+    results = np.empty(shape, dtype = object)
+
+    # the tasks: the index of the cell and the arguments of f
+    tasks = []
+
+    for idx in np.ndindex(*shape):
+
+        # the finished cells are loaded from the store
+        if store is not None and idx in store:
+            results[idx] = store[idx]
+            continue
+
+        kwargs = {name: v[i] for name, v, i in zip(names, values, idx)}
+
+        if streams is not None:
+            kwargs['rng'] = streams[idx]
+
+        tasks.append((idx, f, kwargs))
+
+    def finish(idx, res):
+
+        # keep the result of a cell (and save it at once)
+        results[idx] = res
+
+        if store is not None:
+            store.save(idx, res)
+
+    if processes is None:
+        processes = mp.cpu_count()
+
+    if processes == 1 or len(tasks) == 0:
+
+        # run the cells one after another
+        for task in tasks:
+            finish(*_run_cell(task))
+
+        return results
+
+    if chunksize is None:
+        # small chunks keep the workers balanced, larger ones reduce the overhead for big grids
+        chunksize = max(1, len(tasks) // (16 * processes))
+
+    # limit the BLAS threads of the workers: the started processes read the environment
+    # (a higher limit of the caller is capped too), the caller's environment is restored afterwards
+    saved = {}
+
+    if blas_threads is not None:
+
+        if importlib.util.find_spec('threadpoolctl') is None:
+            warnings.warn('threadpoolctl is not installed: the BLAS threads of the workers are limited '
+                          'only through the environment, which a BLAS loaded before the fork ignores')
+
+        for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+
+            saved[var] = os.environ.get(var)
+
+            try:
+                limit = min(int(saved[var]), blas_threads)
+            except (TypeError, ValueError):
+                limit = blas_threads
+
+            os.environ[var] = str(limit)
+
+    try:
+        pool = mp.Pool(processes, initializer = _init_worker, initargs = (blas_threads,))
+
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                del os.environ[var]
+            else:
+                os.environ[var] = value
+
+    with pool:
+
+        # the cells are given to the workers as they become free
+        for idx, res in pool.imap_unordered(_run_cell, tasks, chunksize):
+            finish(idx, res)
+
+    return results
+
+
+def _init_worker (blas_threads):
+
+    # limit the BLAS threads of a worker (forked workers have BLAS loaded already)
+    if blas_threads is None:
+        return
+
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+
+    # the limit is kept for the life of the worker
+    global _limits
+    _limits = threadpool_limits(limits = blas_threads, user_api = 'blas')
+
+
+def _run_cell (task):
+
+    # run one cell of the grid
+    idx, f, kwargs = task
+
+    return (idx, f(**kwargs))
@@ -0,0 +1,99 @@
+def step_discrete (x, R, include_self = True, radicals_idx = [], freeze = False):
+
+    """
+    This function makes one step of the discrete HK model in 1D (all agents at once).
+    The opinions are sorted and the neighbours of every agent are found by binary search
+    (see calc_window), so the sums of neighbour opinions are taken from the prefix sums.
+    The engines (HK_discrete, HK_discrete_r, HK_discrete_fast, HK_discrete_ens) and HK_stream
+    make their steps with this function.
+
+    A batch of M profiles (2D matrix: M x n) is stepped at once, every profile with its own bound.
+
+    If freeze is set, the groups of agents that are more than R away from all other agents
+    (see calc_components) and reach their fixed point in this step are flagged as well, so that
+    they can be dropped from the next steps. With self-opinion included, a group spanning at most R
+    reaches its exact fixed point (the mean) in one step; without self-opinion, a group is at its
+    fixed point once all its agents share one opinion. A group with a radical is never frozen.
+
+    @param x              - a current distribution of opinions; a profile (n) or a batch (M x n);
+    @param R              - a bound (confidence level); a number or one bound per profile;
+    @param include_self   - a flag indicating if self opinion plays a part in the stepping process;
+    @param radicals_idx   - a set of radical ids in the distribution array x (may be empty);
+    @param freeze         - a flag indicating if the frozen agents are returned (a single profile only).
+
+    @return               - the next distribution of opinions (shaped as x);
+                            a tuple (y, frozen) with the flags of the frozen agents if freeze is set.
+    """
+
+    import numpy as np
+    from functions.calc_window import calc_window
+    from functions.calc_components import calc_components
+    from functions import jit_kernels
+
+    x = np.asarray(x, dtype = float)
+
+    if freeze and x.ndim != 1:
+        raise ValueError('the groups can be frozen in a single profile only')
+
+    # the profiles as rows (one bound per profile)
+    xr = x.reshape(-1, x.shape[-1])
+    M, n = xr.shape
+    R = np.broadcast_to(np.asarray(R, dtype = float), (M,))
+
+    # the flags of radicals
+    fixed = np.zeros(n, dtype = bool)
+    fixed[radicals_idx] = True
+
+    order = None
+
+    if jit_kernels.ENABLED:
+
+        # use the compiled kernel
+        y = np.array([jit_kernels.discrete_step(row, R[m], include_self, fixed) for m, row in enumerate(xr)])
+
+    else:
+
+        order = np.argsort(xr, axis = -1, kind = 'stable')
+        xs = np.take_along_axis(xr, order, axis = -1)
+
+        # find the neighbours of all agents: sorted ids [lo, hi)
+        lo, hi, _, _ = calc_window(xs, R[:, None])
+
+        # the number and the sum of neighbour opinions
+        cs = np.concatenate((np.zeros((M, 1)), np.cumsum(xs, axis = -1)), axis = -1)
+        count = hi - lo
+        sum = np.take_along_axis(cs, hi, axis = -1) - np.take_along_axis(cs, lo, axis = -1)
+
+        if not include_self:
+            # do not include the agent i himself
+            count = count - 1
+            sum = sum - xs
+
+        # apply the stepping rule (radical opinions stay constant)
+        ys = np.copy(xs)
+        move = (count != 0) & ~fixed[order]
+        ys[move] = sum[move] / count[move]
+
+        y = np.empty_like(xr)
+        np.put_along_axis(y, order, ys, axis = -1)
+
+    y = y.reshape(x.shape)
+
+    if not freeze:
+        return y
+
+    # -------------------------------------------------
+    # the groups that reach their fixed point in this step
+    # (without self-opinion, a group keeps oscillating until its opinions coincide)
+    if order is None:
+        order = np.argsort(x, kind = 'stable')
+    else:
+        order = order[0]
+
+    comp, spread = calc_components(x[order], R[0])
+    has_rad = np.bincount(comp, weights = fixed[order], minlength = len(spread)) > 0
+
+    frozen = np.empty(n, dtype = bool)
+    frozen[order] = ((spread <= (R[0] if include_self else 0)) & ~has_rad)[comp]
+
+    return (y, frozen)
@@ -0,0 +1,39 @@
+def step_euler (x, R, n, h, sigma = 0, W_inc = None, include_self = True, radicals_idx = [], bound_cond = None):
+
+    """
+    This function makes one step of the ODE (Euler's method) or SDE (Euler-Maruyama method)
+    version of HK model in 1D. The engines (HK_ode, HK_ode_r, HK_sde, HK_sde_r) and HK_stream
+    make their steps with this function, so they follow the same dynamics.
+
+    @param x              - a current distribution of opinions;
+    @param R              - a bound (confidence level);
+    @param n              - a number of agents (radicals included);
+    @param h              - a step size;
+    @param sigma          - level of noise (SDE);
+    @param W_inc          - the Wienner increments of the step (None: the ODE step); the increments
+                            of radicals are set to 0 in place;
+    @param include_self   - a flag indicating if self opinion plays a part in the stepping process;
+    @param radicals_idx   - a set of radical ids in the distribution array x (may be empty);
+    @param bound_cond     - boundary conditions of the SDE: 'reflect', 'adsorb', or 'period'
+                            (for 'period', the agents also interact through the boundary; None: the ODE step).
+
+    @return               - the next distribution of opinions.
+    """
+
+    from functions.dxdt import dxdt
+    from functions.apply_bound_cond import apply_bound_cond
+
+    if W_inc is None:
+        # update one step using Euler's method
+        return x + h * dxdt(None, x, R, n, include_self, radicals_idx)
+
+    # radical opinions stay constant
+    W_inc[radicals_idx] = 0
+
+    # update one step using Euler - Maruyama method
+    y = x + h * dxdt(None, x, R, n, include_self, radicals_idx, bound_cond) + sigma * W_inc
+
+    # boundary conditions
+    apply_bound_cond(y, bound_cond)
+
+    return y
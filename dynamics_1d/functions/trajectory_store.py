@@ -0,0 +1,192 @@
+from functions.recorder import Recorder
+
+
+class TrajectoryStore(Recorder):
+
+    """
+    This class keeps a trajectory of opinion dynamics on disk, so that long runs can be archived
+    and slices of them (a time window, a subset of agents) read later without loading the whole run.
+
+    The states are written into memory-mapped chunk files of chunk_size states each, and an index
+    (index.json) describes the chunks and the type and shape of a state.
+    The k'th recorded state is the state at the step k * stride.
+    A time window touches only the chunks it overlaps; a window within one chunk is read without a copy.
+
+    A store can be passed to an engine as its 'result' argument (as a Recorder): the engine writes
+    the states while integrating and returns the store. An existing store is opened for reading
+    (and further states are appended after the stored ones).
+
+    @param path         - a directory of the store (created if it does not exist);
+    @param stride       - every stride'th state is recorded (0, stride, 2 * stride, ...);
+    @param chunk_size   - a number of states in one chunk file.
+    """
+
+    def __init__(self, path, stride = 1, chunk_size = 4096):
+
+        import os
+        import json
+
+        Recorder.__init__(self, stride = stride)
+
+        self.path = path
+        self.chunk_size = chunk_size
+
+        # the type and shape of a state, and the number of states in every chunk
+        self.dtype = None
+        self.shape = None
+        self.chunks = []
+
+        # the open chunk for writing
+        self._chunk = None
+
+        os.makedirs(path, exist_ok = True)
+
+        index = os.path.join(path, 'index.json')
+
+        if os.path.exists(index):
+
+            with open(index, 'r') as f:
+                info = json.load(f)
+
+            self.stride = info['stride']
+            self.chunk_size = info['chunk_size']
+            self.dtype = info['dtype']
+            self.shape = tuple(info['shape'])
+            self.chunks = info['chunks']
+            self.seen = info['seen']
+            self.count = sum(self.chunks)
+
+    def append(self, x, labels = None):
+
+        """
+        Pass the next state of the dynamics (the initial state first).
+        For weighted opinions, the labels give the id in x for every agent (the state is x[labels]).
+        """
+
+        import numpy as np
+
+        step = self.seen
+        self.seen += 1
+        self.last = x
+        self.last_labels = labels
+
+        # check if the state is recorded
+        if step % self.stride != 0:
+            return
+
+        x = self._expand(x, labels)
+
+        if self.dtype is None:
+            self.dtype = np.result_type(x.dtype, float).str
+            self.shape = x.shape
+
+        # start a new chunk if the last one is full
+        if len(self.chunks) == 0 or self.chunks[-1] == self.chunk_size:
+            self.chunks.append(0)
+            self._chunk = None
+
+        if self._chunk is None:
+            self._chunk = self._map(len(self.chunks) - 1, 'r+')
+
+        self._chunk[self.chunks[-1]] = x
+        self.chunks[-1] += 1
+        self.count += 1
+
+        # the index is written with every finished chunk
+        if self.chunks[-1] == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+
+        """
+        Write the open chunk and the index to disk.
+        """
+
+        import os
+        import json
+
+        if self._chunk is not None:
+            self._chunk.flush()
+
+        info = {'stride': self.stride,
+                'chunk_size': self.chunk_size,
+                'dtype': self.dtype,
+                'shape': None if self.shape is None else list(self.shape),
+                'chunks': self.chunks,
+                'seen': self.seen}
+
+        # write the index under a temporary name first, then rename it
+        tmp = os.path.join(self.path, 'index.json.tmp')
+
+        with open(tmp, 'w') as f:
+            json.dump(info, f)
+
+        os.replace(tmp, os.path.join(self.path, 'index.json'))
+
+    def result(self):
+
+        """
+        Finish the recording (the engine returns the store itself).
+        """
+
+        self.flush()
+
+        return self
+
+    def __len__(self):
+
+        return self.count
+
+    def read(self, start = 0, stop = None, agents = None):
+
+        """
+        Read the recorded states [start, stop) (the k'th state is the step k * stride).
+
+        @param start        - the first state;
+        @param stop         - the state after the last one (None: to the end);
+        @param agents       - a slice or an array of agent ids (None: all agents).
+
+        @return             - an array (states x agents x ...); a read-only view of the chunk file
+                              if the states lie in one chunk and the agents are a slice.
+        """
+
+        import numpy as np
+
+        start, stop, _ = slice(start, stop).indices(self.count)
+        stop = max(start, stop)
+
+        if agents is None:
+            agents = slice(None)
+
+        parts = []
+
+        for k in range(start // self.chunk_size, (stop - 1) // self.chunk_size + 1 if stop > start else 0):
+
+            # the rows of the chunk k within [start, stop)
+            first = k * self.chunk_size
+            lo = max(start, first) - first
+            hi = min(stop, first + self.chunks[k]) - first
+
+            parts.append(self._map(k, 'r')[lo:hi, agents])
+
+        if len(parts) == 0:
+            return np.empty((0,) + tuple(self.shape or ()))
+
+        if len(parts) == 1:
+            return parts[0]
+
+        return np.concatenate(parts)
+
+    def _map(self, k, mode):
+
+        # map the chunk file k (a full chunk is allocated on disk when it is created)
+        import numpy as np
+        import os
+
+        file = os.path.join(self.path, 'chunk_{:06d}.bin'.format(k))
+        shape = (self.chunk_size,) + tuple(self.shape)
+
+        if mode == 'r+' and not os.path.exists(file):
+            mode = 'w+'
+
+        return np.memmap(file, dtype = np.dtype(self.dtype), mode = mode, shape = shape)
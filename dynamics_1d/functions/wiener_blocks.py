@@ -0,0 +1,48 @@
+def wiener_blocks (h, shape, steps, block_size = 2**16, rng = None):
+
+    """
+    This function generates the Wienner increments of the SDE engines step by step (a generator).
+    The increments are simulated in large blocks of steps, so the random number generator
+    is called once per block instead of once per step. The numbers are the same as if
+    np.random.randn(*shape) (or rng.standard_normal(shape)) were called every step
+    (the block just draws them ahead).
+
+    The blocks grow from one step (doubled up to block_size), so the numbers drawn ahead are
+    never more than the numbers used so far and the steps left. If an engine stops early, the unused
+    numbers of the last block are lost: with rng = None, the global np.random state is moved further
+    than by per-step draws, so the numbers drawn after the engine differ (give rng to avoid it).
+
+    @param h            - a step size;
+    @param shape        - the shape of the increment of one step (e.g. a number of agents);
+    @param steps        - a maximum number of steps (no more increments are drawn);
+    @param block_size   - a number of random numbers in one block (at least one step is drawn);
+    @param rng          - a random generator or a seed (None: the global np.random state).
+
+    @return             - a generator of arrays of the given shape (sqrt(h) * standard normal numbers).
+    """
+
+    import numpy as np
+
+    # the generator of standard normal numbers
+    if rng is None:
+        normal = np.random.standard_normal
+    else:
+        normal = np.random.default_rng(rng).standard_normal
+
+    shape = tuple(np.atleast_1d(shape))
+    size = int(np.prod(shape))
+
+    # the largest number of steps in one block (the first block is one step)
+    max_rows = max(1, block_size // max(size, 1))
+    rows = 1
+
+    while steps > 0:
+
+        # simulate one block of increments
+        k = int(min(rows, steps))
+        W = np.sqrt(h) * normal((k,) + shape)
+        steps -= k
+        rows = min(2 * rows, max_rows)
+
+        for W_inc in W:
+            yield W_inc
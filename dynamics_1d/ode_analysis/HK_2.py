@@ -12,6 +12,8 @@ from matplotlib.pyplot import figure
 from matplotlib import colors
 from functions.HK_ode import HK_ode
 from functions.calc_clusters import calc_clusters
+from functions.cell_store import CellStore
+from functions.seed_streams import seed_streams
 import warnings
 from matplotlib.ticker import (MultipleLocator, AutoMinorLocator)
 from mpl_toolkits.axes_grid1 import make_axes_locatable
@@ -34,6 +36,17 @@ stop = 10**(-5)
 # the step size
 h = 0.1
 
+# the number of Monte Carlo samples
+samples = 100
+
+# the seed of the random streams of the samples (every sample has its own stream)
+seed = 2021
+
+# the store of finished samples: every sample is saved when it is finished
+# and the simulation is resumed from the store after a restart
+store = CellStore('ode_analysis/HK 2 samples', {'sample': range(samples), 'n': N, 'r': R}, {'stop': stop, 'h': h, 'seed': seed})
+streams = seed_streams(seed, (samples,))
+
 # the array for clusters of all simulations
 clusters_MC = []
 
@@ -43,7 +56,17 @@ steps_MC = []
 #----------------------------------------------
 # SIMULATION
 
-for i in range(100):
+for i in range(samples):
+
+    # the sample was finished before a restart
+    if i in store:
+        clusters, steps = store[i]
+        clusters_MC.append(clusters)
+        steps_MC.append(steps)
+        continue
+
+    # the random stream of the sample
+    rng = np.random.default_rng(streams[i])
 
     # the array of end clusters/steps
     clusters = []
@@ -56,7 +79,7 @@ for i in range(100):
         s = []
 
         # INITIAL CONDITIONS:
-        x0 = np.random.uniform(0, 1, n)
+        x0 = rng.uniform(0, 1, n)
         x0.sort()
 
         for r in R:
@@ -74,6 +97,9 @@ for i in range(100):
         clusters.append(c)
         steps.append(s)
 
+    # save the sample
+    store.save(i, (clusters, steps))
+
     clusters_MC.append(clusters)
     steps_MC.append(steps)
 
@@ -10,9 +10,9 @@ import matplotlib.pyplot as plt
 from matplotlib.pyplot import figure
 from functions.HK_ode import HK_ode
 from functions.calc_clusters import calc_clusters
-from functions.calc_cluster_stat import calc_cluster_stat
-import  csv
-import ast
+from functions.observer import Observer
+from functions.result_cache import ResultCache
+from functions.result_store import save_results, load_results
 
 
 # PARAMETERS
@@ -30,6 +30,9 @@ variances = []
 # the stopping criterion
 stop = 10**(-5)
 
+# the step limit
+max_steps = 1000
+
 # the number of total runs for each pair of parameters
 total_runs = 100
 
@@ -39,6 +42,9 @@ h = 0.1
 # SIMULATION
 #----------------------------------------------
 
+# the cache of deterministic simulations (shared by the scripts and kept between sessions)
+cache = ResultCache('cache')
+
 for r in R:
 
     for n in N:
@@ -46,9 +52,8 @@ for r in R:
         # array of clusters for one pair of parameters R and N
         c = []
 
-        # array of cluster variances for one pair of parameters R and N
-        # first values represent the label (number of clusters from 1 to 8)
-        v = [[i] for i in range(1, 9)]
+        # array of cluster variances for one pair of parameters R and N (one value per run)
+        v = []
 
         # SAMPLED VALUES
         #----------------------------------------------
@@ -58,42 +63,35 @@ for r in R:
             x0 = np.random.uniform(0, 1, n)
             x0.sort()
 
-            # SIMULATION
-            x = HK_ode(r, n, x0, h, stop, 'LAST_STEP', include_self = False)
+            # SIMULATION: the clusters of the last state are observed
+            obs = Observer(['clusters', 'cluster_var'], r, n, last = True)
+            obs = HK_ode(r, n, x0, h, stop, obs, include_self = False, max_steps = max_steps)
 
             # check the number of clusters in the last step
-            clust_no = calc_cluster_stat(x, r, n )[0]
-            c.append(clust_no)
+            c.append(obs['clusters'][0])
 
-            # get the statistics (0th row of v is for simulations with one end cluster; 1st - for 2 clusters; etc.)
-            v[clust_no - 1].append(calc_cluster_stat(x, r, n)[2])
+            # get the statistics
+            v.append(obs['cluster_var'][0])
 
         clusters.append(c)
         variances.append(v)
 
-# save the results
-np.savetxt('ode_analysis/HK 3 results.txt', clusters, fmt='%d')
+# save the results (R x N x runs)
+shape = (len(R), len(N), total_runs)
+coords = {'R': R, 'N': N}
 
-# write variance CSV file
-with open("ode_analysis/HK 3 results (var).csv","w") as f:
-    wr = csv.writer(f, lineterminator = '\n')
-    wr.writerows(variances)
+save_results('ode_analysis/HK 3 results', np.reshape(clusters, shape), axes = ('R', 'N', 'run'), coords = coords)
+save_results('ode_analysis/HK 3 results (var)', np.reshape(variances, shape), axes = ('R', 'N', 'run'), coords = coords)
 
 # ------------------------------------------------------------------------------
 # ------------------------------------------------------------------------------
 
-# read cluster CSV file
-with open("ode_analysis/HK 3 results (var).csv", "r") as f:
-    reader = csv.reader(f, delimiter=",", quotechar='"')
-    var = [row for row in reader]
-
-# covert string lists to lists
-for i in range(len(var)):
-    for j in range(len(var[0])):
-        var[i][j] = ast.literal_eval(var[i][j])
+# load the results (one row for every pair of parameters R and N)
+var, _ = load_results('ode_analysis/HK 3 results (var)')
+var = var.reshape(-1, var.shape[-1])
 
-# load the results
-clusters = np.loadtxt('ode_analysis/HK 3 results.txt', dtype=int)
+clusters, _ = load_results('ode_analysis/HK 3 results')
+clusters = clusters.reshape(-1, clusters.shape[-1])
 
 # PLOT
 #----------------------------------------------
@@ -116,7 +114,7 @@ for r in R:
         rx0 = [i/(n+1) for i in range(1, n+1)]
 
         # SIMULATION
-        rx = HK_ode(r, n, rx0, h, stop, 'LAST_STEP', include_self = False)
+        rx = cache(HK_ode, r, n, rx0, h, stop, 'LAST_STEP', include_self = False)
 
         # check the number of clusters in the last step
         rc = calc_clusters(rx, r, n)
@@ -139,7 +137,7 @@ for r in R:
             if values[0][t] != 0:
 
                 # calculate the final variance for one bar:
-                final_var = np.mean(v[t-1][1:])
+                final_var = np.mean(v[c == t])
 
                 # print the final variance value for the cluster
                 plt.annotate(round(final_var, 3), xy = (t, values[0][t]), ha = 'center', fontsize = 19)
@@ -11,8 +11,7 @@ from matplotlib.pyplot import figure
 from functions.HK_ode_r import HK_ode_r
 from functions.calc_clusters import calc_clusters
 from functions.calc_cluster_stat import calc_cluster_stat
-import  csv
-import ast
+from functions.result_store import save_results, load_results
 
 
 # PARAMETERS
@@ -50,9 +49,8 @@ for r in R:
         # array of clusters for one pair of parameters R and N
         c = []
 
-        # array of cluster variances for one pair of parameters R and N
-        # first values represent the label (number of clusters from 1 to 8)
-        v = [[i] for i in range(1, 9)]
+        # array of cluster variances for one pair of parameters R and N (one value per run)
+        v = []
 
         # SAMPLED VALUES
         #----------------------------------------------
@@ -69,35 +67,28 @@ for r in R:
             clust_no = calc_cluster_stat(x, r, n + n_rad)[0]
             c.append(clust_no)
 
-            # get the statistics (0th row of v is for simulations with one end cluster; 1st - for 2 clusters; etc.)
-            v[clust_no - 1].append(calc_cluster_stat(x, r, n)[2])
+            # get the statistics
+            v.append(calc_cluster_stat(x, r, n)[2])
 
         clusters.append(c)
         variances.append(v)
 
-# save the results
-np.savetxt('ode_analysis/HK 3 results_radicals.txt', clusters, fmt='%d')
+# save the results (R x N x runs)
+shape = (len(R), len(N), total_runs)
+coords = {'R': R, 'N': N}
 
-# write variance CSV file
-with open("ode_analysis/HK 3 results_radicals (var).csv","w") as f:
-    wr = csv.writer(f, lineterminator = '\n')
-    wr.writerows(variances)
+save_results('ode_analysis/HK 3 results_radicals', np.reshape(clusters, shape), axes = ('R', 'N', 'run'), coords = coords)
+save_results('ode_analysis/HK 3 results_radicals (var)', np.reshape(variances, shape), axes = ('R', 'N', 'run'), coords = coords)
 
 # ------------------------------------------------------------------------------
 # ------------------------------------------------------------------------------
 
-# read cluster CSV file
-with open("ode_analysis/HK 3 results_radicals (var).csv", "r") as f:
-    reader = csv.reader(f, delimiter=",", quotechar='"')
-    var = [row for row in reader]
+# load the results (one row for every pair of parameters R and N)
+var, _ = load_results('ode_analysis/HK 3 results_radicals (var)')
+var = var.reshape(-1, var.shape[-1])
 
-# covert string lists to lists
-for i in range(len(var)):
-    for j in range(len(var[0])):
-        var[i][j] = ast.literal_eval(var[i][j])
-
-# load the results
-clusters = np.loadtxt('ode_analysis/HK 3 results_radicals.txt', dtype=int)
+clusters, _ = load_results('ode_analysis/HK 3 results_radicals')
+clusters = clusters.reshape(-1, clusters.shape[-1])
 
 
 # PLOT
@@ -143,7 +134,7 @@ for r in R:
             if values[0][t] != 0:
 
                 # calculate the final variance for one bar:
-                final_var = np.mean(v[t-1][1:])
+                final_var = np.mean(v[c == t])
 
                 # print the final variance value for the cluster
                 plt.annotate(round(final_var, 3), xy = (t, values[0][t]), ha = 'center', fontsize = 19)
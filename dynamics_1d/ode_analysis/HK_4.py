@@ -11,6 +11,7 @@ from matplotlib.pyplot import figure
 from matplotlib import colors
 from functions.HK_ode import HK_ode
 from functions.calc_clusters import calc_clusters
+from functions.result_cache import ResultCache
 import warnings
 from matplotlib.ticker import (MultipleLocator, AutoMinorLocator)
 from mpl_toolkits.axes_grid1 import make_axes_locatable
@@ -41,11 +42,14 @@ x0 = [i/(n+1) for i in range(1, n+1)]
 #----------------------------------------------
 # SIMULATION
 
+# the cache of deterministic simulations (shared by the scripts and kept between sessions)
+cache = ResultCache('cache')
+
 for r in R:
 
     # SIMULATION
-    x_1 = HK_ode(r, n, x0, h, stop, 'LAST_STEP', include_self = False)
-    x_2 = HK_ode(r, n, x0, h, stop, 'LAST_STEP', include_self = True)
+    x_1 = cache(HK_ode, r, n, x0, h, stop, 'LAST_STEP', include_self = False)
+    x_2 = cache(HK_ode, r, n, x0, h, stop, 'LAST_STEP', include_self = True)
 
     # check the number of clusters in the last step
     clusters_1.append(calc_clusters(x_1, r, n))
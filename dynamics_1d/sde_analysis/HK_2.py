@@ -3,20 +3,20 @@ Analysis of the order parameter for varying parameters R and sigma.
 This script simulates the opinion dynamics generated by using a stochastic HK model.
 The opinions are simulated only once for each parameter combination using
 an equispaced start profile. The order parameter for each pair of parameters
-is given on a 2D raster. The results are saved in a csv file.
+is given on a 2D raster. The results are saved in a binary result store (see result_store).
 """
 
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.pyplot import figure
 from matplotlib import colors
-from functions.HK_sde import HK_sde
-from functions.calc_order_par import calc_order_par
+from functions.run_sweep import run_sweep
+from functions.result_store import save_results, load_results
 import warnings
 from matplotlib.ticker import (MultipleLocator, AutoMinorLocator)
 from mpl_toolkits.axes_grid1 import make_axes_locatable
-import csv
-import ast
+from functools import partial
+from parallel_f import f
 
 #----------------------------------------------
 # PARAMETERS
@@ -33,9 +33,6 @@ n = 100
 # the step limit allowing to reach a stable position
 max_steps = 10
 
-# the array of order parameters
-order_p = []
-
 # the stopping criterion
 stop = 10**(-5)
 
@@ -45,6 +42,9 @@ h = 0.05
 # the boundary condition
 bound_cond = 'period'
 
+# the seed of the random streams (every pair of parameters has its own stream)
+seed = 2021
+
 #----------------------------------------------
 # INITIAL CONDITIONS: use expected value distribution
 x0 = [i/(n+1) for i in range(1, n+1)]
@@ -52,46 +52,28 @@ x0 = [i/(n+1) for i in range(1, n+1)]
 #----------------------------------------------
 # SIMULATION
 
-for s in sigma:
-
-    # array of order parameters for one sigma
-    o_p = []
-
-    for r in R:
-
-        # SIMULATION
-        x = HK_sde(r, n, x0, h = h, sigma = s, stop = stop, result = 'LAST_STEP', include_self = True, max_steps = max_steps, bound_cond = bound_cond)
+# the pairs of parameters are calculated one after another by the function of the parallel script
+# (see parallel_f and parallel_HK_2); both scripts keep the finished pairs in the same store,
+# so either of them resumes the sweep of the other (the store checks the parameters and the seed)
+func = partial(f, n = n, x0 = x0, h = h, stop = stop, bound_cond = bound_cond, max_steps = max_steps)
+cells = run_sweep(func, {'sigma': sigma, 'r': R}, processes = 1, seed = seed, store = 'sde_analysis/HK 2 cells',
+                  meta = {'n': n, 'max_steps': max_steps, 'stop': stop, 'h': h, 'bound_cond': bound_cond})
 
-        # check the order parameter in the last step
-        o_p.append(calc_order_par(x, r, n, bound_cond))
-
-    # append an array of clusters/steps for a specific n
-    order_p.append(o_p)
-
-order_p = np.array(order_p)
+# the order parameter in the last step (the last value of every pair)
+order_p = np.array([[cell[-1] for cell in row] for row in cells])
 
 #----------------------------------------------
 # SAVE
 
-# save results to a CSV file
-with open("sde analysis/HK 2 results.csv","w") as f:
-    wr = csv.writer(f, lineterminator = '\n')
-    wr.writerows(order_p)
+# save results (sigma x R)
+save_results("sde_analysis/HK 2 results", order_p, axes = ('sigma', 'R'), coords = {'sigma': sigma, 'R': R},
+             meta = {'n': n, 'max_steps': max_steps, 'stop': stop, 'h': h, 'bound_cond': bound_cond, 'seed': seed})
 
 #----------------------------------------------
 # READ
 
-# read the file
-with open("sde analysis/HK 2 results.csv", "r") as f:
-    reader = csv.reader(f, delimiter=",", quotechar='"')
-    order_p = [row for row in reader]
-
-# convert string lists to lists
-for i in range(len(order_p)):
-    for j in range(len(order_p[0])):
-        order_p[i][j] = ast.literal_eval(order_p[i][j])
-
-order_p = np.array(order_p)
+# read the results (memory-mapped)
+order_p, _ = load_results("sde_analysis/HK 2 results")
 
 #----------------------------------------------
 # PLOT
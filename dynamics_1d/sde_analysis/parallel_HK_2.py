@@ -1,20 +1,17 @@
 """
-Copy of HK_2.py for SDE model, but divided through 7 processing units
-using multiprocessing package.
+Copy of HK_2.py for SDE model, but divided through all processing units
+using multiprocessing package (see run_sweep).
 """
 
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.pyplot import figure
 from matplotlib import colors
-from functions.HK_sde import HK_sde
-from functions.calc_order_par import calc_order_par
+from functions.run_sweep import run_sweep
+from functions.result_store import save_results, load_results
 import warnings
 from matplotlib.ticker import (MultipleLocator, AutoMinorLocator)
 from mpl_toolkits.axes_grid1 import make_axes_locatable
-import csv
-import ast
-import multiprocessing as mp
 from functools import partial
 from parallel_f import f
 
@@ -33,9 +30,6 @@ n = 100
 # the step limit allowing to reach a stable position
 max_steps = 10000
 
-# the array of order parameters
-order_p = []
-
 # the stopping criterion
 stop = 10**(-5)
 
@@ -45,6 +39,9 @@ h = 0.05
 # the boundary condition
 bound_cond = 'adsorb'
 
+# the root seed of the random streams
+seed = 2021
+
 #----------------------------------------------
 # INITIAL CONDITIONS: use expected value distribution
 x0 = [i/(n+1) for i in range(1, n+1)]
@@ -52,46 +49,32 @@ x0 = [i/(n+1) for i in range(1, n+1)]
 #----------------------------------------------
 # SIMULATION
 
-for s in sigma:
+if __name__ == '__main__':
 
-    if __name__ == '__main__':
-        pool = mp.Pool(mp.cpu_count())
-        func = partial(f, s, n, x0, h, stop, bound_cond, max_steps)
-        result1 = pool.map(func, R[0:7])
-        result2 = pool.map(func, R[7:14])
-        result3 = pool.map(func, R[14:21])
+    # the grid of (sigma, R) is shared by all workers dynamically; an independent random stream
+    # is used for every pair (sigma, R), so the results do not depend on the number of workers;
+    # every finished pair is saved in the store and the sweep is resumed from it after a restart
+    # (the store is shared with HK_2, which calculates the pairs one after another)
+    func = partial(f, n = n, x0 = x0, h = h, stop = stop, bound_cond = bound_cond, max_steps = max_steps)
+    order_p = run_sweep(func, {'sigma': sigma, 'r': R}, seed = seed, store = 'sde_analysis/HK 2 cells',
+                        meta = {'n': n, 'max_steps': max_steps, 'stop': stop, 'h': h, 'bound_cond': bound_cond})
 
-    result1.extend(result2)
-    result1.extend(result3)
+    # the array of order parameters (sigma x R x times)
+    order_p = np.array(order_p.tolist())
 
-    # append an array of order parameter for a specific sigma
-    order_p.append(result1)
+    #----------------------------------------------
+    # SAVE
 
-order_p = np.array(order_p)
-
-#----------------------------------------------
-# SAVE
-
-# save results to a CSV file
-with open("sde_analysis/HK 2 results_local.csv","w") as f:
-    wr = csv.writer(f, lineterminator = '\n')
-    wr.writerows(order_p)
+    # save results (sigma x R x time; the last time is the end of the simulation)
+    save_results("sde_analysis/HK 2 results_local", order_p, axes = ('sigma', 'R', 'time'),
+                 coords = {'sigma': sigma, 'R': R, 'time': [1000, 2000, 5000, 10000, 50000, 100000, -1]},
+                 meta = {'n': n, 'max_steps': max_steps, 'stop': stop, 'h': h, 'bound_cond': bound_cond, 'seed': seed})
 
 #----------------------------------------------
 # READ
 
-# read the file
-with open("sde_analysis/HK 2 results_server_period_7_times.csv", "r") as f:
-    reader = csv.reader(f, delimiter=",", quotechar='"')
-    order_p = [row for row in reader]
-
-# convert string lists to lists
-for i in range(len(order_p)):
-    for j in range(len(order_p[0])):
-        order_p[i][j] = re.sub("\s+", ", ", order_p[i][j].strip())
-        order_p[i][j] = ast.literal_eval(order_p[i][j])
-
-order_p = np.array(order_p)
+# read the results (memory-mapped; the results of the server are a CSV file, read the same way)
+order_p, _ = load_results("sde_analysis/HK 2 results_server_period_7_times")
 
 #----------------------------------------------
 # PLOT
@@ -102,7 +85,7 @@ times = [int(t * h) for t in times]
 for pic in range(9):
 
     # prepare the first elements of sublists
-    temp_order_p = np.array([item[pic] for list in order_p for item in list])
+    temp_order_p = np.array(order_p[:, :, pic]).ravel()
     # 0: 1000, t = 50
     # 1: 2000, t = 100
     # 2: 5000, t = 250
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from functions.calc_window import calc_window
+
+
+def pairwise(x, R, bound_cond):
+
+    # the neighbours of every agent by the comparisons of the pairwise loops
+    d = x[:, None] - x[None, :]
+    near = np.abs(d) <= R
+
+    if bound_cond == 'period':
+        near = np.where(np.abs(d) <= 1 - np.abs(d), near, 1 - np.abs(d) <= R)
+
+    return near
+
+
+def window(lo, hi, lo_wrap, hi_wrap, n, bound_cond):
+
+    j = np.arange(n)
+    near = (j >= lo[:, None]) & (j < hi[:, None])
+
+    if bound_cond == 'period':
+        near |= (j < lo_wrap[:, None]) | (j >= hi_wrap[:, None])
+
+    return near
+
+
+@pytest.mark.parametrize('bound_cond', ['reflect', 'period'])
+def test_pairwise(bound_cond):
+
+    rng = np.random.default_rng(0)
+
+    for _ in range(200):
+
+        # rounded opinions give ties and distances equal to R
+        n = int(rng.integers(1, 50))
+        x = np.sort(np.round(rng.uniform(0, 1, n), int(rng.integers(1, 4))))
+        R = float(rng.choice([0.05, 0.1, 0.2, 0.3, 0.5, 0.7]))
+
+        assert np.array_equal(window(*calc_window(x, R, bound_cond), n, bound_cond), pairwise(x, R, bound_cond))
+
+
+@pytest.mark.parametrize('bound_cond', ['reflect', 'period'])
+def test_batch(bound_cond):
+
+    # a batch of profiles with one bound per profile is the same as the profiles one by one
+    rng = np.random.default_rng(1)
+    X = np.sort(np.round(rng.uniform(0, 1, (5, 30)), 2), axis = 1)
+    R = np.array([0.05, 0.1, 0.2, 0.3, 0.6])
+
+    batch = calc_window(X, R[:, None], bound_cond)
+
+    for m in range(5):
+        for a, b in zip(batch, calc_window(X[m], R[m], bound_cond)):
+            assert np.array_equal(a[m], b)
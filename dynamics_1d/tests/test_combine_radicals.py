@@ -0,0 +1,23 @@
+import numpy as np
+
+from functions.combine_radicals import combine_radicals
+
+
+def test_shared_opinions():
+
+    # a radical sharing an opinion with a normal agent (and with another radical) takes the first free id
+    n_all, x0_all, is_rad = combine_radicals([0.5, 0.2, 0.9], 3, [0.5, 0.5, 0.1])
+
+    assert n_all == 6
+    assert np.array_equal(x0_all, [0.1, 0.2, 0.5, 0.5, 0.5, 0.9])
+    assert np.array_equal(np.flatnonzero(is_rad), [0, 2, 3])
+
+
+def test_no_radicals():
+
+    # the profile is kept as it is
+    n_all, x0_all, is_rad = combine_radicals([0.5, 0.2, 0.9])
+
+    assert n_all == 3
+    assert np.array_equal(x0_all, [0.5, 0.2, 0.9])
+    assert not np.any(is_rad)
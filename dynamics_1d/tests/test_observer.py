@@ -0,0 +1,58 @@
+import numpy as np
+
+from functions.observer import Observer
+from functions.calc_cluster_stat import calc_cluster_stat
+from functions.HK_discrete import HK_discrete
+from functions.HK_ode import HK_ode
+
+
+R = 0.15
+n = 40
+x0 = np.sort(np.random.default_rng(0).uniform(0, 1, n))
+
+
+def test_last_state():
+
+    # a time after the last step gives the observables of the last state
+    for run in (lambda result: HK_discrete(R, n, x0, result = result, max_steps = 100),
+                lambda result: HK_ode(R, n, x0, 0.1, result = result, max_steps = 1000)):
+
+        obs = run(Observer(['clusters', 'cluster_var'], R, n, times = [1001]))
+        count, _, var = calc_cluster_stat(run('LAST_STEP'), R, n)
+
+        assert obs['clusters'][0] == count
+        assert obs['cluster_var'][0] == var
+
+
+def test_trajectory():
+
+    # the observables of every step are the same as evaluated on the recorded trajectory
+    obs = HK_discrete(R, n, x0, result = Observer(['clusters', 'cluster_var'], R, n, stride = 2))
+    xs = HK_discrete(R, n, x0)[::2]
+
+    assert list(obs['clusters']) == [calc_cluster_stat(x, R, n)[0] for x in xs]
+    assert list(obs['cluster_var']) == [calc_cluster_stat(x, R, n)[2] for x in xs]
+
+
+def test_last_only():
+
+    # with self-opinion included, max_steps is not used, so a time after max_steps may not be the last state
+    obs = HK_discrete(R, n, x0, result = Observer(['clusters', 'cluster_var'], R, n, last = True), max_steps = 1)
+    count, _, var = calc_cluster_stat(HK_discrete(R, n, x0, result = 'LAST_STEP', max_steps = 1), R, n)
+
+    assert list(obs['clusters']) == [count]
+    assert list(obs['cluster_var']) == [var]
+
+
+def test_state_updated_in_place():
+
+    # the cluster statistics are not taken from the previous state held in the same array
+    obs = Observer(['clusters', 'cluster_var'], R, n)
+    x = np.linspace(0, 1, n)
+    obs.append(x)
+
+    # one cluster, then two
+    x[:] = np.arange(n) >= n // 2
+    obs.append(x)
+
+    assert list(obs.result()['clusters']) == [1, 2]
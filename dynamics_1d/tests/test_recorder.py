@@ -0,0 +1,67 @@
+import numpy as np
+
+from functions.recorder import Recorder
+from functions.observer import Observer
+from functions.HK_discrete_fast import HK_discrete_fast
+from functions.HK_discrete_w import HK_discrete_w
+from functions.HK_ode_w import HK_ode_w
+
+
+def test_first_block_fits_the_byte_budget():
+
+    # a state of 10^6 agents: the first block must not hold 1024 states (7.6 GiB)
+    rec = Recorder()
+    x = np.zeros(10**6)
+
+    for _ in range(3):
+        rec.append(x)
+
+    assert rec.buf.nbytes <= Recorder.initial_bytes
+    assert rec.result().shape == (3, 10**6)
+
+
+def test_full_result_for_large_n_and_few_steps():
+
+    # R = 1 joins all agents in one step
+    n = 10**6
+    x0 = np.random.default_rng(0).uniform(0, 1, n)
+
+    res = HK_discrete_fast(1, n, x0, result = 'FULL')
+
+    assert res.shape[1] == n
+    assert len(res) <= 3
+    assert np.allclose(res[-1], np.mean(x0))
+
+
+def test_small_states_keep_the_capacity():
+
+    rec = Recorder(capacity = 16)
+
+    for k in range(40):
+        rec.append(np.full(5, k, dtype = float))
+
+    res = rec.result()
+
+    assert res.shape == (40, 5)
+    assert np.array_equal(res[:, 0], np.arange(40))
+
+
+def test_weighted_engines():
+
+    x0 = np.round(np.random.default_rng(1).uniform(0, 1, 200), 2)
+
+    for run in [lambda result: HK_discrete_w(0.15, 200, x0, result = result, n_rad = 2, x0_rad = [0.2, 0.5]),
+                lambda result: HK_ode_w(0.15, 200, x0, 0.1, result = result)]:
+
+        full = run('FULL')
+
+        # the weighted opinions are expanded to the agents for the recorded steps only
+        assert np.array_equal(run(Recorder(stride = 3)), full[::3])
+        assert np.array_equal(run(Recorder(times = [0, 2, 10**6])), full[[0, 2, -1]])
+
+        rec = Recorder(max_bytes = 1000)
+        assert np.array_equal(run(rec), full)
+        assert rec._on_disk
+
+        obs = Observer(['clusters'], R = 0.15, n = full.shape[1], stride = 2)
+        assert len(run(obs)['clusters']) == len(full[::2])
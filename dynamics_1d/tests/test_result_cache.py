@@ -0,0 +1,45 @@
+import inspect
+import numpy as np
+
+from functions import jit_kernels
+from functions.result_cache import ResultCache
+from functions.HK_ode import HK_ode
+
+
+x0 = np.linspace(0, 1, 20)
+params = {'R': 0.2, 'n': 20, 'x0': x0, 'h': 0.5}
+
+
+def test_cached():
+
+    cache = ResultCache()
+    res = cache(HK_ode, 0.2, 20, x0, 0.5)
+
+    assert np.array_equal(res, HK_ode(0.2, 20, x0, 0.5))
+    assert cache(HK_ode, 0.2, 20, list(x0), 0.5) is res
+
+
+def test_key_dependencies(monkeypatch):
+
+    # a change in a module imported by the engine (dxdt through step_euler) changes the key
+    key = ResultCache().key(HK_ode, params)
+    getsource = inspect.getsource
+
+    def changed(obj):
+        source = getsource(obj)
+        return source + '\n# changed\n' if getattr(obj, '__name__', '') == 'functions.dxdt' else source
+
+    monkeypatch.setattr(inspect, 'getsource', changed)
+
+    assert ResultCache().key(HK_ode, params) != key
+
+
+def test_key_jit(monkeypatch):
+
+    # the results of the compiled kernels are kept apart
+    cache = ResultCache()
+    key = cache.key(HK_ode, params)
+
+    monkeypatch.setattr(jit_kernels, 'ENABLED', not jit_kernels.ENABLED)
+
+    assert cache.key(HK_ode, params) != key
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from functions.result_store import save_results, load_results
+
+
+def test_roundtrip(tmp_path):
+
+    data = np.arange(24, dtype = float).reshape(2, 3, 4)
+    save_results(str(tmp_path / 'res'), data, axes = ('sigma', 'R', 'time'), coords = {'R': [0.1, 0.2, 0.3]})
+
+    loaded, info = load_results(str(tmp_path / 'res'))
+
+    assert np.array_equal(loaded, data)
+    assert info['axes'] == ['sigma', 'R', 'time']
+
+
+def test_objects(tmp_path):
+
+    # an array of objects (e.g. the results of run_sweep) must be converted first
+    data = np.empty((2, 2), dtype = object)
+    data[...] = 0.5
+
+    with pytest.raises(ValueError):
+        save_results(str(tmp_path / 'res'), data, axes = ('sigma', 'R'))
+
+
+def test_csv(tmp_path):
+
+    # the results saved as a CSV file: the cells are printed arrays (a row of sigma, a column of R)
+    data = np.random.default_rng(0).uniform(0, 1, (3, 4, 7))
+
+    with open(str(tmp_path / 'res.csv'), 'w') as f:
+        for row in data:
+            f.write(','.join('"' + str(cell) + '"' for cell in row) + '\n')
+
+    loaded, info = load_results(str(tmp_path / 'res'))
+
+    assert np.allclose(loaded, data, rtol = 10**(-7))
+    assert info['axes'] == ['row', 'column', 'value']
+
+    # the cells of numbers
+    with open(str(tmp_path / 'num.csv'), 'w') as f:
+        f.write('0.5,1.0\n0.25,2\n')
+
+    assert np.array_equal(load_results(str(tmp_path / 'num'))[0], [[0.5, 1.0], [0.25, 2]])
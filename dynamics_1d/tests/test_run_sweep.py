@@ -0,0 +1,45 @@
+import os
+import warnings
+import pytest
+
+from functions.run_sweep import run_sweep
+
+
+def threads(a):
+    import os
+    return os.environ.get('OMP_NUM_THREADS')
+
+
+def test_environment(monkeypatch):
+
+    # the workers get the capped limit, the environment of the caller is kept
+    monkeypatch.setenv('OMP_NUM_THREADS', '8')
+    monkeypatch.delenv('MKL_NUM_THREADS', raising = False)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        res = run_sweep(threads, {'a': [1, 2, 3, 4]}, processes = 2, blas_threads = 1)
+
+    assert list(res) == ['1'] * 4
+    assert os.environ['OMP_NUM_THREADS'] == '8'
+    assert 'MKL_NUM_THREADS' not in os.environ
+
+
+def draw(a, rng = None):
+    import numpy as np
+    return np.random.default_rng(rng).uniform()
+
+
+def test_store_seed(tmp_path):
+
+    # a store given as a directory is resumed only with the same seed and parameters
+    grid = {'a': [1, 2, 3]}
+    res = run_sweep(draw, grid, processes = 1, seed = 1, store = str(tmp_path), meta = {'n': 10})
+
+    assert list(run_sweep(draw, grid, processes = 1, seed = 1, store = str(tmp_path), meta = {'n': 10})) == list(res)
+
+    with pytest.raises(ValueError):
+        run_sweep(draw, grid, processes = 1, seed = 2, store = str(tmp_path), meta = {'n': 10})
+
+    with pytest.raises(ValueError):
+        run_sweep(draw, grid, processes = 1, seed = 1, store = str(tmp_path), meta = {'n': 20})
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from functions.step_discrete import step_discrete
+from functions.HK_discrete_fast import HK_discrete_fast
+from functions.HK_discrete_ens import HK_discrete_ens
+
+
+def test_batch():
+
+    # a batch of profiles is stepped as the profiles one by one (every profile with its own bound)
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 1, (5, 40))
+    R = [0.05, 0.1, 0.15, 0.2, 0.3]
+
+    for include_self in [True, False]:
+
+        y = step_discrete(x, R, include_self)
+
+        for m in range(len(R)):
+            assert np.array_equal(y[m], step_discrete(x[m], R[m], include_self))
+
+
+@pytest.mark.parametrize('include_self', [True, False])
+def test_freeze(include_self):
+
+    rng = np.random.default_rng(1)
+    x = np.round(rng.uniform(0, 1, 60), 2)
+
+    y, frozen = step_discrete(x, 0.1, include_self, freeze = True)
+    assert np.array_equal(y, step_discrete(x, 0.1, include_self))
+
+    # the frozen agents do not move in the next step
+    assert np.array_equal(step_discrete(y, 0.1, include_self)[frozen], y[frozen])
+
+    # a group with a radical is never frozen
+    _, frozen_r = step_discrete(x, 0.1, include_self, radicals_idx = [int(np.argmin(x))], freeze = True)
+    assert not frozen_r[np.argmin(x)]
+
+
+@pytest.mark.parametrize('include_self', [True, False])
+def test_engines(include_self):
+
+    rng = np.random.default_rng(2)
+    x0 = rng.uniform(0, 1, (3, 300))
+    R = [0.05, 0.1, 0.2]
+
+    ens, steps = HK_discrete_ens(R, 300, x0, include_self = include_self, max_steps = 40)
+
+    for m in range(len(R)):
+
+        # freezing the converged groups does not change the results
+        fast = HK_discrete_fast(R[m], 300, x0[m], include_self = include_self, max_steps = 40, freeze = False)
+        frozen = HK_discrete_fast(R[m], 300, x0[m], include_self = include_self, max_steps = 40)
+        assert np.allclose(fast[-1], frozen[-1])
+
+        # the ensemble gives the runs one by one (the finished members keep their last opinions)
+        assert steps[m] == len(fast)
+        assert np.array_equal(ens[:steps[m], m], fast)
+        assert np.array_equal(ens[-1, m], fast[-1])
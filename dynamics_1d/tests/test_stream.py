@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from functions.HK_stream import HK_stream
+from functions.HK_discrete import HK_discrete
+from functions.HK_discrete_r import HK_discrete_r
+from functions.HK_ode import HK_ode
+from functions.HK_ode_r import HK_ode_r
+from functions.HK_sde import HK_sde
+from functions.HK_sde_r import HK_sde_r
+
+
+R = 0.15
+n = 40
+x0 = np.random.default_rng(0).uniform(0, 1, n)
+x0_rad = np.array([0.05, 0.5, 0.95])
+
+
+def stream(model, **kwargs):
+    return np.array([x for _, x in HK_stream(model, R, n, x0, **kwargs)])
+
+
+@pytest.mark.parametrize('include_self', [True, False])
+def test_discrete(include_self):
+
+    assert np.array_equal(stream('discrete', include_self = include_self, max_steps = 100),
+                          HK_discrete(R, n, x0, include_self = include_self))
+
+    assert np.array_equal(stream('discrete', include_self = include_self, max_steps = 100, n_rad = 3, x0_rad = x0_rad),
+                          HK_discrete_r(R, n, x0, 3, x0_rad, include_self = include_self))
+
+
+@pytest.mark.parametrize('include_self', [True, False])
+def test_ode(include_self):
+
+    kwargs = dict(include_self = include_self, max_steps = 200)
+
+    assert np.array_equal(stream('ode', h = 0.5, **kwargs), HK_ode(R, n, x0, 0.5, **kwargs))
+    assert np.array_equal(stream('ode', h = 0.5, n_rad = 3, x0_rad = x0_rad, **kwargs),
+                          HK_ode_r(R, n, x0, 3, x0_rad, 0.5, **kwargs))
+
+
+@pytest.mark.parametrize('bound_cond', ['reflect', 'adsorb', 'period'])
+@pytest.mark.parametrize('include_self', [True, False])
+def test_sde(bound_cond, include_self):
+
+    kwargs = dict(include_self = include_self, max_steps = 200, bound_cond = bound_cond, rng = 5)
+
+    assert np.array_equal(stream('sde', h = 0.1, sigma = 0.3, **kwargs), HK_sde(R, n, x0, 0.1, 0.3, **kwargs))
+    assert np.array_equal(stream('sde', h = 0.1, sigma = 0.3, n_rad = 3, x0_rad = x0_rad, **kwargs),
+                          HK_sde_r(R, n, x0, 3, x0_rad, 0.1, 0.3, **kwargs))
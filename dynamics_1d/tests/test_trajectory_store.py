@@ -0,0 +1,32 @@
+import numpy as np
+
+from functions.trajectory_store import TrajectoryStore
+from functions.HK_ode import HK_ode
+from functions.HK_discrete_w import HK_discrete_w
+
+
+R = 0.15
+n = 50
+x0 = np.sort(np.random.default_rng(0).uniform(0, 1, n))
+
+
+def test_write_and_read(tmp_path):
+
+    full = HK_ode(R, n, x0, 0.1, max_steps = 100)
+
+    store = HK_ode(R, n, x0, 0.1, max_steps = 100, result = TrajectoryStore(str(tmp_path / 'run'), stride = 2, chunk_size = 8))
+
+    assert len(store) == len(full[::2])
+    assert np.array_equal(store.read(), full[::2])
+
+    # a window across the chunks and a subset of agents, from the reopened store
+    store = TrajectoryStore(str(tmp_path / 'run'))
+    assert np.array_equal(store.read(5, 20, agents = slice(10, 20)), full[::2][5:20, 10:20])
+
+
+def test_weighted_engine(tmp_path):
+
+    full = HK_discrete_w(R, n, x0)
+    store = HK_discrete_w(R, n, x0, result = TrajectoryStore(str(tmp_path / 'run'), chunk_size = 4))
+
+    assert np.array_equal(store.read(), full)
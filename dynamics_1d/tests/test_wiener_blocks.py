@@ -0,0 +1,29 @@
+import numpy as np
+
+from functions.wiener_blocks import wiener_blocks
+
+
+def test_same_numbers():
+
+    # the increments are the same as drawn step by step
+    rng = np.random.default_rng(5)
+    W = np.array(list(wiener_blocks(0.1, 7, 300, block_size = 64, rng = 5)))
+
+    assert np.array_equal(W, np.array([np.sqrt(0.1) * rng.standard_normal(7) for _ in range(300)]))
+
+
+def test_global_state():
+
+    # an early stop draws at most as many numbers ahead as were used
+    np.random.seed(0)
+    blocks = wiener_blocks(0.1, 10, 10**6)
+
+    for _ in range(5):
+        next(blocks)
+
+    drawn = np.random.standard_normal()
+
+    np.random.seed(0)
+    ahead = list(np.random.standard_normal(10**3))
+
+    assert 50 <= ahead.index(drawn) <= 2 * 50
@@ -4,7 +4,7 @@ This script simulates the opinion dynamics generated by using a discrete HK mode
 for varying parameters R and N. The number of clusters/steps for each pair of parameters
 is given on a 2D raster. The analysis is performed using the Monte Carlo approach:
 1000 samples are taken and the cluster/convergence time results are averaged.
-The results are saved in a csv file.
+The results are saved in a binary result store (see result_store).
 """
 
 import numpy as np
@@ -12,15 +12,14 @@ import matplotlib.pyplot as plt
 from matplotlib.pyplot import figure
 from matplotlib import colors
 from analysis_2D.functions.HK_discrete_2d import HK_discrete_2d
-from analysis_2D.functions.calc_clusters import calc_clusters
+from analysis_2D.functions.calc_cluster_labels import calc_cluster_labels
+from analysis_2D.functions.cell_store import CellStore
+from analysis_2D.functions.seed_streams import seed_streams
+from analysis_2D.functions.result_store import save_results
 import warnings
 from matplotlib.ticker import (MultipleLocator, AutoMinorLocator)
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 import statistics as stat
-import csv
-
-# set the seed
-np.random.seed(27)
 
 #----------------------------------------------
 # PARAMETERS
@@ -42,6 +41,23 @@ dist_norm = 2
 # the type of region: square/circle
 region = 'circle'
 
+# the neighbour search: the k-d tree keeps the dense clusters of the circle region fast
+neighbours = 'kdtree' if region == 'circle' else 'cells'
+
+# the number of Monte Carlo samples
+samples = 1000
+
+# the seed of the random streams of the samples (every sample has its own stream)
+seed = 27
+
+# the fixed parameters of the results
+meta = {'stop': stop, 'dist_norm': dist_norm, 'region': region, 'seed': seed}
+
+# the store of finished samples: every sample is saved when it is finished
+# and the simulation is resumed from the store after a restart (next to the results, see SAVE)
+store = CellStore('analysis_2D/discrete_analysis/samples_MC_1000_L' + str(dist_norm) + '_' + region, {'sample': range(samples), 'n': N, 'r': R}, meta)
+streams = seed_streams(seed, (samples,))
+
 # the array for clusters of all simulations
 clusters_MC = []
 
@@ -51,7 +67,17 @@ steps_MC = []
 #----------------------------------------------
 # SIMULATION
 
-for i in range(1000):
+for i in range(samples):
+
+    # the sample was finished before a restart
+    if i in store:
+        clusters, steps = store[i]
+        clusters_MC.append(clusters)
+        steps_MC.append(steps)
+        continue
+
+    # the random stream of the sample
+    rng = np.random.default_rng(streams[i])
 
     # the array of end clusters/steps
     clusters = []
@@ -68,16 +94,16 @@ for i in range(1000):
         if region == 'square':
 
             # OPTION 1a SQUARE: sample the initial opinions from a uniform distribution
-            x0_x = np.random.uniform(0, 1, n)
-            x0_y = np.random.uniform(0, 1, n)
+            x0_x = rng.uniform(0, 1, n)
+            x0_y = rng.uniform(0, 1, n)
 
             x0 = [[x0_x[i], x0_y[i]] for i in range(n)]
 
         elif region == 'circle':
 
             # OPTION 1b CIRCLE: sample the initial opinions from a uniform distribution
-            length = 0.5 * np.sqrt(np.random.uniform(0, 1, n))
-            angle = 2 * np.pi * np.random.uniform(0, 1, n)
+            length = 0.5 * np.sqrt(rng.uniform(0, 1, n))
+            angle = 2 * np.pi * rng.uniform(0, 1, n)
 
             x0 = []
 
@@ -87,21 +113,29 @@ for i in range(1000):
             x0 = [[x0_x[i], x0_y[i]] for i in range(n)]
 
 
+        last = []
+
         for r in R:
 
             # SIMULATION
-            x = HK_discrete_2d(r, n, x0, stop, result = 'FULL', max_steps = 50, dist_norm = dist_norm)
+            x = HK_discrete_2d(r, n, x0, stop, result = 'FULL', max_steps = 50, dist_norm = dist_norm, neighbours = neighbours)
 
-            # check the number of clusters in the last step
-            c.append(calc_clusters(x[-1], r, n, dist_norm = dist_norm))
+            # keep the last step (the clusters of all R are counted at once)
+            last.append(x[-1])
 
             # check the number of steps
             s.append(len(x))
 
+        # check the number of clusters in the last steps (one bound per profile)
+        c = list(calc_cluster_labels(np.array(last), R, dist_norm)[0])
+
         # append an array of clusters/steps for a specific n
         clusters.append(c)
         steps.append(s)
 
+    # save the sample
+    store.save(i, (clusters, steps))
+
     clusters_MC.append(clusters)
     steps_MC.append(steps)
 
@@ -140,14 +174,11 @@ steps = np.array(steps)
 #----------------------------------------------
 # SAVE
 
-# save results to a CSV file
-with open('analysis_2D/discrete_analysis/clusters_MC_1000_L' + str(dist_norm) + '_' + region + '.csv',"w") as f:
-    wr = csv.writer(f, lineterminator = '\n')
-    wr.writerows(clusters)
+# save the Monte Carlo results (sample x N x R)
+coords = {'N': N, 'R': R}
 
-with open('analysis_2D/discrete_analysis/steps_MC_1000_L' + str(dist_norm) + '_' + region + '.csv',"w") as f:
-    wr = csv.writer(f, lineterminator = '\n')
-    wr.writerows(steps)
+save_results('analysis_2D/discrete_analysis/clusters_MC_1000_L' + str(dist_norm) + '_' + region, clusters_MC, axes = ('sample', 'N', 'R'), coords = coords, meta = meta)
+save_results('analysis_2D/discrete_analysis/steps_MC_1000_L' + str(dist_norm) + '_' + region, steps_MC, axes = ('sample', 'N', 'R'), coords = coords, meta = meta)
 
 
 #----------------------------------------------
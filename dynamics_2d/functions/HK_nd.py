@@ -0,0 +1,156 @@
+def HK_nd (model, R, n, x0, h = None, sigma = None, n_rad = 0, x0_rad = None, stop = 10**(-5), result = 'FULL', include_self = True, max_steps = 100, dist_norm = 2, bound_cond = 'adsorb', rng = None, neighbours = None, skin = None):
+
+    """
+    This function generates the opinion dynamics in d dimensions (any d), where opinions are
+    distributed within a region [0,1]^d. The discrete, ODE (Euler's method) and SDE
+    (Euler-Maruyama method) versions of HK model are available, radicals can be included.
+
+    All agents are updated at once: the neighbour graph of a step is a sparse matrix
+    (see calc_neighbour_graph), so the sums over the neighbours are products with the graph
+    and there is one accumulator for all coordinates (see step_discrete and step_euler).
+    The neighbour search is chosen by d if it is not given: cell lists in 2D, a k-d tree
+    up to 10 dimensions and all pairs above. The 2D engines (HK_discrete_2d, HK_ode_2d, HK_sde_2d)
+    run their dynamics with this function.
+
+    @param model        - a version of HK model: 'discrete', 'ode', or 'sde';
+    @param R            - a bound (confidence level);
+    @param n            - a number of agents;
+    @param x0           - an initial distribution of opinions (2D matrix: n x d; a vector for d = 1);
+    @param h            - a step size ('ode' and 'sde');
+    @param sigma        - level of noise ('sde');
+    @param n_rad        - a number of radicals;
+    @param x0_rad       - a distribution of radicals (2D matrix: n_rad x d); radical opinions stay constant;
+    @param stop         - a stopping criterion;
+    @param result       - a flag indicating if the whole array is returned ('FULL')
+                          or only the last step values (!= 'FULL');
+                          a Recorder can be given to record selected steps (see recorder);
+    @param include_self - a flag indicating if self opinion plays a part in the stepping process;
+    @param max_steps    - a maximum number of steps to take;
+    @param dist_norm    - a norm for measuring the distance (L1, L2, L-infinity): 1, 2, np.inf;
+    @param bound_cond   - boundary conditions: 'reflect', 'adsorb', or 'period' ('sde'; for 'period',
+                          the agents also interact through the boundary);
+    @param rng          - a random generator or a seed of the noise ('sde'; None: the global np.random state);
+    @param neighbours   - a neighbour search: 'cells', 'kdtree', or 'brute' (None: chosen by d);
+    @param skin         - a skin width of the Verlet list of neighbours (see verlet_list), the neighbours
+                          are searched again only if an agent moved by more than skin/2 (None: searched in every step).
+
+    @return             - the opinions of all agents (the normal agents first, then the radicals):
+                          steps x (n + n_rad) x d for 'FULL', (n + n_rad) x d for the last step.
+    """
+
+    import numpy as np
+    from functions.recorder import make_recorder
+    from functions.calc_neighbour_graph import calc_neighbour_graph
+    from functions.verlet_list import VerletList
+    from functions.step_discrete import step_discrete
+    from functions.step_euler import step_euler
+
+    if model not in ('discrete', 'ode', 'sde'):
+        raise ValueError("model must be 'discrete', 'ode', or 'sde'")
+
+    # the opinions as a matrix: agents x dimensions
+    x0 = np.asarray(x0, dtype = float)
+
+    if x0.ndim == 1:
+        x0 = x0[:, None]
+
+    d = x0.shape[1]
+
+    # combine the normal agents and the radicals (the radicals are the last n_rad agents)
+    if n_rad > 0:
+        x0 = np.concatenate((x0, np.reshape(np.asarray(x0_rad, dtype = float), (n_rad, d))))
+
+    n_all = n + n_rad
+
+    # the neighbour search suited to the dimension
+    if neighbours is None:
+        if d == 2:
+            neighbours = 'cells'
+        elif d <= 10:
+            neighbours = 'kdtree'
+        else:
+            neighbours = 'brute'
+
+    # the periodic interaction of the SDE version
+    period = model == 'sde' and bound_cond == 'period'
+
+    # the generator of standard normal numbers
+    if rng is None:
+        normal = np.random.standard_normal
+    else:
+        normal = np.random.default_rng(rng).standard_normal
+
+    # the recorder of results (None if only the last step is returned)
+    rec = make_recorder(result)
+
+    if rec is not None:
+        rec.append(x0)
+
+    x = np.array(x0)
+
+    # the Verlet list of neighbours (None: the neighbours are searched in every step)
+    verlet = None if skin is None else VerletList(R, skin, dist_norm, period, method = neighbours)
+
+    # the flag indicating if the calculation should proceed
+    calculate = True
+
+    # number of time steps taken
+    steps = 0
+
+    while calculate:
+
+        steps += 1
+
+        # -------------------------------------------------
+        # update one step
+        # the graph of agents influencing each other (see calc_neighbour_graph and verlet_list)
+        if verlet is None:
+            G = calc_neighbour_graph(x, R, dist_norm, period, method = neighbours)
+        else:
+            G = verlet.graph(x)
+
+        # the graph is shared with the observer of the state (see observer)
+        if rec is not None:
+            rec.share_graph(x, G, R, dist_norm, period)
+
+        if model == 'discrete':
+            # the mean opinion of the neighbours (see step_discrete)
+            y = step_discrete(x, G, include_self)
+
+        elif model == 'ode':
+            # update all coordinates with Euler's scheme (see step_euler)
+            y = step_euler(x, G, h, include_self = include_self)
+
+        else:
+            # simulate the Wienner increments of all agents (one block)
+            W_inc = np.sqrt(h) * normal((n_all, d))
+
+            # update all coordinates with Euler - Maruyama method, fold the boundaries (see step_euler)
+            y = step_euler(x, G, h, sigma, W_inc, include_self, bound_cond)
+
+        # radical opinions stay constant
+        y[n:] = x0[n:]
+
+        # -------------------------------------------------
+        # check if the calculation should terminate
+        if np.linalg.norm(x - y, ord = dist_norm) <= stop or steps > max_steps:
+            # terminate the calculation
+            calculate = False
+        else:
+            # update the opinions x only when all agents are considered
+            x = y
+
+            # append the opinions to the major array
+            if rec is not None:
+                rec.append(x)
+
+        # -------------------------------------------------
+
+    # prepare the results
+    if rec is not None:
+        # return the recorded steps (the full array for 'FULL')
+        return rec.result()
+
+    else:
+        # return the last step only
+        return x
@@ -0,0 +1,105 @@
+def HK_stream (model, R, n, x0, h = None, sigma = None, stop = 10**(-5), max_steps = 100, dist_norm = 2, bound_cond = 'adsorb', every = 1, rng = None, neighbours = 'cells', skin = None):
+
+    """
+    This function generates the opinion dynamics in 2D step by step (a generator),
+    where opinions are distributed within a region [0,1]x[0,1].
+    The discrete, ODE (Euler's method) and SDE (Euler-Maruyama method) versions of HK model
+    are available. This function does not take radicals into account.
+
+    The states are yielded as they are calculated, so a caller can stop early, reduce
+    the states on the fly or write them out, and the trajectory is never stored.
+    The steps are made by the same functions as in HK_discrete_2d, HK_ode_2d and HK_sde_2d
+    (see step_discrete and step_euler): the k'th state is the k'th element of the 'FULL' result.
+
+    @param model        - a version of HK model: 'discrete', 'ode', or 'sde';
+    @param R            - a bound (confidence level);
+    @param n            - a number of agents;
+    @param x0           - an initial distribution of opinions (2D matrix: n x 2);
+    @param h            - a step size ('ode' and 'sde');
+    @param sigma        - level of noise ('sde');
+    @param stop         - a stopping criterion;
+    @param max_steps    - a maximum number of steps to take;
+    @param dist_norm    - a norm for measuring the distance (L1, L2, L-infinity): 1, 2, np.inf;
+    @param bound_cond   - boundary conditions: 'reflect', 'adsorb', or 'period' ('sde'; for 'period',
+                          the agents also interact through the boundary);
+    @param every        - every every'th state is yielded (the last state is always yielded);
+    @param rng          - a random generator or a seed of the noise ('sde'; None: the global np.random state);
+    @param neighbours   - a neighbour search: 'cells' or 'kdtree' (see calc_neighbour_graph);
+    @param skin         - a skin width of the Verlet list of neighbours (see verlet_list), the neighbours
+                          are searched again only if an agent moved by more than skin/2 (None: searched in every step).
+
+    @return             - a generator of tuples (step, x); x must not be modified by the caller.
+    """
+
+    import numpy as np
+    from functions.calc_neighbour_graph import calc_neighbour_graph
+    from functions.verlet_list import VerletList
+    from functions.step_discrete import step_discrete
+    from functions.step_euler import step_euler
+
+    if model not in ('discrete', 'ode', 'sde'):
+        raise ValueError("model must be 'discrete', 'ode', or 'sde'")
+
+    # the generator of standard normal numbers
+    if rng is None:
+        normal = np.random.standard_normal
+    else:
+        normal = np.random.default_rng(rng).standard_normal
+
+    x = np.array(x0, dtype = float)
+
+    # the periodic interaction of the SDE version
+    period = model == 'sde' and bound_cond == 'period'
+
+    # the Verlet list of neighbours (None: the neighbours are searched in every step)
+    verlet = None if skin is None else VerletList(R, skin, dist_norm, period, method = neighbours)
+
+    # -------------------------------------------------
+    yield (0, x)
+
+    # number of time steps taken
+    steps = 0
+
+    while True:
+
+        # -------------------------------------------------
+        # increase the step
+        steps += 1
+
+        # the graph of agents influencing each other (see calc_neighbour_graph and verlet_list)
+        if verlet is None:
+            G = calc_neighbour_graph(x, R, dist_norm, period, method = neighbours)
+        else:
+            G = verlet.graph(x)
+
+        if model == 'discrete':
+            # the mean opinion of the neighbours (see step_discrete)
+            y = step_discrete(x, G)
+
+        elif model == 'ode':
+            # update both coordinates with Euler's scheme (see step_euler)
+            y = step_euler(x, G, h)
+
+        else:
+            # simulate the Wienner increments of all agents
+            W_inc = np.sqrt(h) * normal((n, 2))
+
+            # update both coordinates with Euler - Maruyama method, fold the boundaries (see step_euler)
+            y = step_euler(x, G, h, sigma, W_inc, bound_cond = bound_cond)
+
+        # check if the calculation should terminate
+        if np.linalg.norm(x - y, ord = dist_norm) <= stop or steps > max_steps:
+
+            # yield the last state if it was skipped
+            if (steps - 1) % every != 0:
+                yield (steps - 1, x)
+
+            return
+
+        # update the opinions x
+        x = y
+
+        if steps % every == 0:
+            yield (steps, x)
+
+        # -------------------------------------------------
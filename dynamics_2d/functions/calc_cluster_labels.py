@@ -0,0 +1,111 @@
+def calc_cluster_labels (data, R, dist_norm = 2, period = False, neighbours = 'kdtree', graph = None):
+
+    """
+    This function finds the clusters existing in the 2D data: the clusters are the connected
+    components of the neighbour graph (agents at a distance <= R are connected, see calc_neighbour_graph),
+    so two agents are in the same cluster if a chain of agents links them.
+    The components are labelled with a union-find: every edge hooks the larger root onto the smaller one
+    and the paths are compressed, all edges at once; a few rounds are needed, so the cost is near-linear
+    in the number of neighbour pairs.
+
+    A batch of M profiles (3D array: M x n x 2) is treated at once (one graph of all profiles);
+    then the arrays of clusters have one row per profile, padded to the largest number of clusters
+    (size 0, centroid and covariance nan).
+
+    @param data         - data (the last step of opinion dynamics); a profile (n x 2) or a batch (M x n x 2);
+    @param R            - a bound (confidence level); a number or one bound per profile;
+    @param dist_norm    - a norm for measuring the distance (L1, L2, L-infinity): 1, 2, np.inf;
+    @param period       - a flag indicating the periodic boundary conditions on [0,1]x[0,1]
+                          (the centroids and covariances are then taken without unwrapping);
+    @param neighbours   - a neighbour search: 'cells' or 'kdtree' (see calc_neighbour_graph);
+    @param graph        - the neighbour graph of a profile if it is already built (e.g. by an engine step).
+
+    @return             - a tuple (count, labels, sizes, centroids, covariances), where labels give
+                          the cluster of every agent (clusters are numbered by their first agent, 0, 1, ...)
+                          and sizes, centroids (k x 2) and covariances (k x 2 x 2) describe the agents of every cluster.
+    """
+
+    import numpy as np
+    from functions.calc_neighbour_graph import calc_neighbour_graph
+
+    x = np.asarray(data, dtype = float)
+    batch = x.ndim == 3
+
+    if not batch:
+        x = x[None]
+
+    M, n = x.shape[:2]
+
+    # the bound of every profile
+    R = np.broadcast_to(np.asarray(R, dtype = float), (M,))
+
+    # the edges of all profiles (the agent k of the profile m is m * n + k)
+    I = []
+    J = []
+
+    for m in range(M):
+        G = calc_neighbour_graph(x[m], R[m], dist_norm, period, method = neighbours) if graph is None else graph
+        I.append(m * n + np.repeat(np.arange(n), np.diff(G.indptr)))
+        J.append(m * n + G.indices)
+
+    I = np.concatenate(I)
+    J = np.concatenate(J)
+
+    # union-find: hook the roots of every edge (the larger root onto the smaller one) and compress the paths
+    parent = np.arange(M * n)
+
+    while True:
+
+        a = parent[I]
+        b = parent[J]
+        link = a != b
+
+        if not np.any(link):
+            break
+
+        np.minimum.at(parent, np.maximum(a[link], b[link]), np.minimum(a[link], b[link]))
+
+        # point every agent to its root
+        while True:
+            root = parent[parent]
+
+            if np.array_equal(root, parent):
+                break
+
+            parent = root
+
+    # the roots are the smallest agents of the components; number them within every profile
+    root = (parent == np.arange(M * n)).reshape(M, n)
+    number = np.cumsum(root, axis = -1) - 1
+
+    count = root.sum(axis = -1)
+    k = int(count.max()) if M > 0 and n > 0 else 0
+
+    labels = number.ravel()[parent].reshape(M, n)
+
+    # the statistics of clusters (the clusters of all profiles are numbered together)
+    ids = (np.arange(M)[:, None] * n + labels).ravel()
+    xs = x.reshape(M * n, 2)
+
+    sizes = np.bincount(ids, minlength = M * n)
+
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+
+        centroids = np.column_stack([np.bincount(ids, weights = xs[:, a], minlength = M * n) for a in range(2)]) / sizes[:, None]
+        d = xs - centroids[ids]
+
+        covariances = np.empty((M * n, 2, 2))
+
+        for a in range(2):
+            for b in range(a, 2):
+                covariances[:, a, b] = np.bincount(ids, weights = d[:, a] * d[:, b], minlength = M * n) / sizes
+                covariances[:, b, a] = covariances[:, a, b]
+
+    sizes = sizes.reshape(M, n)[:, :k]
+    centroids = centroids.reshape(M, n, 2)[:, :k]
+    covariances = covariances.reshape(M, n, 2, 2)[:, :k]
+
+    if not batch:
+        return (int(count[0]), labels[0], sizes[0], centroids[0], covariances[0])
+
+    return (count, labels, sizes, centroids, covariances)
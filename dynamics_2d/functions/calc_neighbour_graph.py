@@ -0,0 +1,87 @@
+def calc_neighbour_graph (x, R, dist_norm = 2, period = False, method = 'cells'):
+
+    """
+    This function builds the graph of agents influencing each other as a sparse matrix (CSR):
+    the row i holds the neighbours j of the agent i (every agent is its own neighbour), all weights are 1.
+    With the graph G, the sums over the neighbours are products, e.g. G @ x are the sums of neighbour opinions
+    and np.diff(G.indptr) are the numbers of neighbours (G.nnz is the number of pairs).
+
+    Three searches are available:
+        'cells'   - cell lists (see calc_neighbours): fast for uniform densities of agents in low dimensions
+                    (3^d adjacent cells are checked);
+        'kdtree'  - a k-d tree (scipy.spatial.cKDTree): the work grows with the number of pairs
+                    also if the agents form dense clusters (any dimension, best up to about 10);
+        'brute'   - all pairs, a block of agents at a time (for high dimensions, where no index helps).
+
+    @param x            - a distribution of opinions (2D matrix: n x d);
+    @param R            - a bound (confidence level);
+    @param dist_norm    - a norm for measuring the distance (L1, L2, L-infinity): 1, 2, np.inf;
+    @param period       - a flag indicating the periodic boundary conditions on [0,1]^d;
+    @param method       - a neighbour search: 'cells', 'kdtree', or 'brute'.
+
+    @return             - a sparse matrix (n x n, CSR) with sorted column indices.
+    """
+
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from functions.calc_neighbours import calc_neighbours
+
+    x = np.asarray(x, dtype = float)
+    n = len(x)
+
+    if method == 'cells':
+
+        # the pairs are ordered by i and j, so they are the rows of the graph as they are
+        I, J = calc_neighbours(x, R, dist_norm, period)
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(I, minlength = n))))
+
+        return csr_matrix((np.ones(len(J)), J, indptr), shape = (n, n))
+
+    if method == 'brute':
+
+        # the distances of a block of agents to all agents (about 2^22 numbers at a time)
+        block = max(1, 2**22 // max(1, n * x.shape[1]))
+        I = []
+        J = []
+
+        for start in range(0, n, block):
+
+            d = np.abs(x[start:start + block, None, :] - x[None, :, :])
+
+            if period:
+                d = np.minimum(d, 1 - d)
+
+            i, j = np.nonzero(np.linalg.norm(d, ord = dist_norm, axis = -1) <= R)
+            I.append(start + i)
+            J.append(j)
+
+        I = np.concatenate(I) if n > 0 else np.zeros(0, dtype = np.int64)
+        J = np.concatenate(J) if n > 0 else np.zeros(0, dtype = np.int64)
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(I, minlength = n))))
+
+        return csr_matrix((np.ones(len(J)), J, indptr), shape = (n, n))
+
+    if method != 'kdtree':
+        raise ValueError("method must be 'cells', 'kdtree', or 'brute'")
+
+    from scipy.spatial import cKDTree
+
+    # the tree of opinions (the periodic tree needs the opinions in [0,1); np.mod gives 1.0
+    # for a tiny negative opinion, e.g. -1e-17, which is the same point as 0)
+    if period:
+        y = np.mod(x, 1)
+        tree = cKDTree(np.where(y >= 1, 0, y), boxsize = 1)
+    else:
+        tree = cKDTree(x)
+
+    # the pairs i < j within the distance R, both directions and the agents themselves
+    pairs = tree.query_pairs(R, p = dist_norm, output_type = 'ndarray')
+    ids = np.arange(n)
+
+    I = np.concatenate((pairs[:, 0], pairs[:, 1], ids))
+    J = np.concatenate((pairs[:, 1], pairs[:, 0], ids))
+
+    G = csr_matrix((np.ones(len(I)), (I, J)), shape = (n, n))
+    G.sort_indices()
+
+    return G
@@ -0,0 +1,117 @@
+def calc_neighbours (x, R, dist_norm = 2, period = False):
+
+    """
+    This function finds all pairs of agents influencing each other (cell lists).
+
+    The agents are binned into a uniform grid of cells at least R wide, so the neighbours
+    of an agent can only be in its own cell or in the adjacent cells (8 in 2D, 3^d - 1 in d dimensions);
+    only these agents are checked. For a bounded density of agents, the search costs O(n) instead of O(n^2).
+    The distance is the same as np.linalg.norm(x[i] - x[j], ord = dist_norm) and the pairs
+    are ordered by i and j (as in the pairwise loops), so the sums over neighbours are the same.
+
+    @param x            - a distribution of opinions (2D matrix: n x d, usually n x 2);
+    @param R            - a bound (confidence level);
+    @param dist_norm    - a norm for measuring the distance (L1, L2, L-infinity): 1, 2, np.inf;
+    @param period       - a flag indicating the periodic boundary conditions on [0,1]^d
+                          (the distance in every coordinate is min(|d|, 1 - |d|)).
+
+    @return             - a tuple (i, j) of agent ids: agent j influences agent i
+                          (every agent is its own neighbour).
+    """
+
+    import numpy as np
+    import itertools
+
+    x = np.asarray(x, dtype = float)
+    n, d = x.shape
+
+    # the largest number of cells in an axis (at most 4n cells in all)
+    cap = max(1, int((4 * n) ** (1 / d) + 10**(-9)))
+
+    # the grid: the cells are at least R wide (a single cell if R is large or not positive)
+    if period:
+        lo = np.zeros(d)
+        m = np.full(d, min(cap, max(1, int(np.floor(1 / R)))) if R > 0 else 1)
+        width = 1 / m
+
+    else:
+        lo = x.min(axis = 0) if n > 0 else np.zeros(d)
+        extent = (x.max(axis = 0) - lo) if n > 0 else np.zeros(d)
+        m = np.maximum(1, np.floor(extent / R).astype(np.int64)) if R > 0 else np.ones(d, dtype = np.int64)
+        m = np.minimum(m, cap)
+        width = np.where(extent > 0, extent / m, 1)
+
+    m = m.astype(np.int64)
+
+    # the cell of every agent and its number
+    c = np.clip(np.floor((x - lo) / width).astype(np.int64), 0, m - 1)
+    cell = np.ravel_multi_index(tuple(c.T), tuple(m))
+
+    # the agents sorted by cells: the agents of cell k are order[start[k]:start[k + 1]]
+    order = np.argsort(cell, kind = 'stable')
+    start = np.searchsorted(cell[order], np.arange(np.prod(m) + 1))
+
+    # the adjacent cells (each taken once, also if the grid has less than 3 cells in an axis)
+    offsets = set()
+
+    for off in itertools.product((-1, 0, 1), repeat = d):
+
+        if period:
+            offsets.add(tuple(np.mod(off, m)))
+
+        elif all(m[a] > 1 or off[a] == 0 for a in range(d)):
+            offsets.add(off)
+
+    I = []
+    J = []
+
+    for off in sorted(offsets):
+
+        # the adjacent cell of every agent
+        a = c + np.array(off, dtype = np.int64)
+
+        if period:
+            a = np.mod(a, m)
+            valid = np.ones(n, dtype = bool)
+
+        else:
+            valid = np.all((a >= 0) & (a < m), axis = 1)
+
+        i = np.flatnonzero(valid)
+        k = np.ravel_multi_index(tuple(a[i].T), tuple(m))
+
+        # all agents of the adjacent cells (the candidates)
+        counts = start[k + 1] - start[k]
+        i = np.repeat(i, counts)
+        pos = np.arange(len(i)) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(start[k], counts)
+        j = order[pos]
+
+        I.append(i)
+        J.append(j)
+
+    i = np.concatenate(I)
+    j = np.concatenate(J)
+
+    # the distances of the candidates
+    diff = np.abs(x[i] - x[j])
+
+    if period:
+        diff = np.minimum(diff, 1 - diff)
+
+    if dist_norm == 1:
+        dist = np.sum(diff, axis = 1)
+
+    elif dist_norm == 2:
+        dist = np.sqrt(np.sum(diff * diff, axis = 1))
+
+    else:
+        dist = np.max(diff, axis = 1)
+
+    near = dist <= R
+    i = i[near]
+    j = j[near]
+
+    # order the pairs by i and j
+    idx = np.argsort(i * n + j, kind = 'stable')
+
+    return (i[idx], j[idx])
@@ -1,31 +1,25 @@
-def calc_order_par(x, R, n, bound_cond = 'adsorb', dist_norm = 2):
+def calc_order_par(x, R, n, bound_cond = 'adsorb', dist_norm = 2, graph = None):
     """
     This function calculates the order parameter of a given opinion profile in 2D.
+    The pairs of agents influencing each other are the entries of the neighbour graph (see calc_neighbour_graph).
 
     @param x              - a distribution of opinions;
     @param R              - a bound (confidence level);
     @param n              - a number of agents;
     @param bound_cond     - boundary conditions: 'reflect', 'adsorb', or 'period';
-    @param dist           - a norm for measuring the distance (L1, L2): 1, 2.
+    @param dist           - a norm for measuring the distance (L1, L2, L-infinity): 1, 2, np.inf;
+    @param graph          - the neighbour graph of x if it is already built (e.g. by an engine step).
     """
 
     import numpy as np
+    from functions.calc_neighbour_graph import calc_neighbour_graph
 
-    count = 0
+    # count the pairs of agents influencing each other using L1, L2 or L-infinity norm
+    # (for periodic boundary condition, the agents can also communicate through the boundary)
+    if graph is None:
+        graph = calc_neighbour_graph(np.asarray(x, dtype = float)[:n], R, dist_norm, bound_cond == 'period')
 
-    # loop through all pairwise combinations
-    for i in range(n):
-
-        for j in range(n):
-
-            if bound_cond != 'period':
-
-                # check if agent j influences agent i using L1 or L2 norm
-                if np.linalg.norm(x[i] - x[j], ord = dist_norm) <= R:
-
-                    count = count + 1
-
-            # periodic case needs to be added!
+    count = graph.nnz
 
     # calculate the order parameters
     order_par = count / n**2
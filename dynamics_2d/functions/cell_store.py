@@ -0,0 +1,96 @@
+class CellStore:
+
+    """
+    This class keeps the results of the cells of a parameter sweep (or of Monte Carlo batches)
+    in a local directory, so that a sweep can be stopped at any time and resumed.
+
+    Every result is written to its own file as soon as it is saved; the file is written under
+    a temporary name and then renamed, so an interrupted write never leaves a broken result.
+    On a restart, the finished cells are found in the directory and do not have to be calculated.
+    The grid (and the fixed parameters, e.g. the seed) is saved with the results and a store of
+    a different grid or different parameters cannot be opened.
+
+    Usage: 'idx in store', 'store[idx]', and 'store.save(idx, result)', where idx is
+    the index of the cell in the grid (an integer or a tuple of integers).
+
+    @param path         - a directory of the store (created if it does not exist);
+    @param grid         - a dictionary {name: values} of the grid axes (None: not checked);
+    @param meta         - a dictionary {name: value} of the fixed parameters of the results
+                          (e.g. the seed), checked with the grid.
+    """
+
+    def __init__(self, path, grid = None, meta = None):
+
+        import numpy as np
+        import os
+        import pickle
+
+        self.path = path
+        os.makedirs(path, exist_ok = True)
+
+        if grid is not None or meta is not None:
+
+            grid = {name: list(values) for name, values in (grid or {}).items()}
+
+            # the fixed parameters are single-valued axes
+            grid.update({name: [value] for name, value in (meta or {}).items()})
+            grid_file = os.path.join(path, 'grid.pkl')
+
+            if os.path.exists(grid_file):
+
+                # the grid of the stored results
+                with open(grid_file, 'rb') as f:
+                    stored = pickle.load(f)
+
+                same = list(stored) == list(grid) and all(np.array_equal(stored[name], grid[name]) for name in grid)
+
+                if not same:
+                    raise ValueError("the store '{}' holds the results of a different grid or parameters".format(path))
+
+            else:
+                self._write(grid_file, grid)
+
+    def __contains__(self, idx):
+
+        import os
+
+        return os.path.exists(self._file(idx))
+
+    def __getitem__(self, idx):
+
+        import pickle
+
+        with open(self._file(idx), 'rb') as f:
+            return pickle.load(f)
+
+    def save(self, idx, result):
+
+        """
+        Save the result of the cell idx.
+        """
+
+        self._write(self._file(idx), result)
+
+    def _file(self, idx):
+
+        # the file of the cell idx
+        import os
+
+        idx = (idx,) if not isinstance(idx, tuple) else idx
+
+        return os.path.join(self.path, 'cell_' + '_'.join(str(int(i)) for i in idx) + '.pkl')
+
+    def _write(self, file, obj):
+
+        # write the object under a temporary name first, then rename it
+        import os
+        import pickle
+
+        tmp = file + '.tmp'
+
+        with open(tmp, 'wb') as f:
+            pickle.dump(obj, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp, file)
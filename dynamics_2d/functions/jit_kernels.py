@@ -0,0 +1,123 @@
+"""
+Compiled (Numba) kernels of HK opinion dynamics in 2D (and in d dimensions).
+
+The kernels are used by the steps of the engines (step_discrete and step_euler)
+if Numba is installed and the environment variable HK_NUMBA=1 is set
+(or ENABLED is set to True at runtime). Otherwise, the engines use NumPy.
+The compiled kernels are cached on disk, so worker processes do not compile them again.
+
+The kernels work on the neighbour graph of a step (the CSR arrays indptr and indices,
+see calc_neighbour_graph), so the neighbour search stays the same and a step costs
+O(number of pairs). The sums over the neighbours are taken in the order of the graph
+(as G @ x), and the whole update is done in one pass without temporary arrays.
+"""
+
+import os
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# the flag indicating if the compiled kernels are used
+ENABLED = numba is not None and os.environ.get('HK_NUMBA', '0') == '1'
+
+
+def jit(f):
+
+    # compile the function if Numba is available (the plain Python function is kept otherwise)
+    if numba is None:
+        return f
+
+    return numba.njit(cache = True)(f)
+
+
+@jit
+def discrete_step(x, indptr, indices, include_self):
+
+    """
+    One step of the discrete HK model: the mean opinion of the neighbours.
+
+    @param x            - a current distribution of opinions (2D matrix: n x d);
+    @param indptr       - the row pointers of the neighbour graph (CSR);
+    @param indices      - the neighbours of all agents (CSR), every agent is its own neighbour;
+    @param include_self - a flag indicating if self opinion plays a part in the stepping process.
+
+    @return             - the next opinions (an agent without neighbours keeps the opinion).
+    """
+
+    n, d = x.shape
+    y = np.empty_like(x)
+    total = np.empty(d)
+
+    for i in range(n):
+
+        # the number and the sum of neighbour opinions
+        count = indptr[i + 1] - indptr[i]
+        total[:] = 0.0
+
+        for p in range(indptr[i], indptr[i + 1]):
+
+            j = indices[p]
+
+            for k in range(d):
+                total[k] += x[j, k]
+
+        # the agent himself is removed if not included
+        if not include_self:
+            count -= 1
+
+            for k in range(d):
+                total[k] = total[k] - x[i, k]
+
+        # apply the stepping rule
+        for k in range(d):
+
+            if count > 0:
+                y[i, k] = total[k] / count
+            else:
+                y[i, k] = x[i, k]
+
+    return y
+
+
+@jit
+def diff_sums(x, indptr, indices, period):
+
+    """
+    The sums of opinion differences of the ODE and SDE versions: sum_j (x_i - x_j) over the neighbours j of i.
+
+    @param x            - a current distribution of opinions (2D matrix: n x d);
+    @param indptr       - the row pointers of the neighbour graph (CSR);
+    @param indices      - the neighbours of all agents (CSR);
+    @param period       - a flag indicating the periodic boundary conditions on [0,1]^d
+                          (the shorter difference is going through the boundary: x_i - x_j - round(x_i - x_j)).
+    """
+
+    n, d = x.shape
+    diff = np.empty_like(x)
+    total = np.empty(d)
+    wrap = np.empty(d)
+
+    for i in range(n):
+
+        count = indptr[i + 1] - indptr[i]
+        total[:] = 0.0
+        wrap[:] = 0.0
+
+        for p in range(indptr[i], indptr[i + 1]):
+
+            j = indices[p]
+
+            for k in range(d):
+
+                total[k] += x[j, k]
+
+                if period:
+                    wrap[k] += np.rint(x[i, k] - x[j, k])
+
+        for k in range(d):
+            diff[i, k] = (count * x[i, k] - total[k]) - wrap[k]
+
+    return diff
@@ -0,0 +1,300 @@
+from functions.recorder import Recorder
+
+
+class Observer(Recorder):
+
+    """
+    This class evaluates observables of opinion dynamics in 2D while the engine integrates,
+    so the trajectory does not have to be stored to calculate a few numbers.
+
+    An observer is passed to an engine as its 'result' argument (as a Recorder); the observables
+    are evaluated at every stride'th step or at the given times, and the engine returns
+    a dictionary of arrays (one value per recorded step for every observable).
+
+    Built-in observables (the profile is x, R, n, bound_cond and dist_norm are given to the observer):
+        'order_par'   - the order parameter (see calc_order_par);
+        'clusters'    - the number of clusters (see calc_cluster_labels);
+        'cluster_var' - the covariance of the cluster centroids (2 x 2, as the variance of clusters in 1D),
+                        from the centroids of calc_cluster_labels;
+        'nb_hist'     - the histogram of the numbers of neighbours (self included): array of n + 1 counts.
+    The neighbour graph of a state is built once and shared by all observables (the clusters
+    use it unless the boundary is periodic); the engines pass the graph of their step (see share_graph),
+    so the observables of a state are evaluated when its graph comes, and the graph is not built again.
+    With last set, only the last state of the run is evaluated (whenever the run stops).
+
+    @param observables  - a list of the built-in names and (name, function) pairs;
+                          a function is called with the opinions x and returns a number or an array;
+    @param R            - a bound (confidence level);
+    @param n            - a number of agents;
+    @param bound_cond   - boundary conditions: 'reflect', 'adsorb', or 'period';
+    @param dist_norm    - a norm for measuring the distance (L1, L2, L-infinity): 1, 2, np.inf;
+    @param neighbours   - a neighbour search: 'cells' or 'kdtree' (see calc_neighbour_graph);
+    @param stride       - the observables are evaluated at every stride'th step (0, stride, 2 * stride, ...);
+    @param times        - a list of step numbers to evaluate at (used instead of the stride);
+                          a time after the last step gives the values of the last state;
+    @param last         - a flag indicating if only the last state is evaluated (one value for every observable).
+    """
+
+    def __init__(self, observables, R = None, n = None, bound_cond = 'adsorb', dist_norm = 2, neighbours = 'cells', stride = 1, times = None, last = False):
+
+        Recorder.__init__(self, stride = stride, times = times)
+
+        self.R = R
+        self.n = n
+        self.bound_cond = bound_cond
+        self.dist_norm = dist_norm
+        self.neighbours = neighbours
+        self.last_only = last
+
+        # the number of evaluations, the evaluation in progress (None: no evaluation)
+        # and the neighbour graph and the clusters of its state
+        self._evals = 0
+        self._key = None
+        self._graph_key = None
+        self._graph = None
+        self._labels_key = None
+        self._labels = None
+
+        # the observed state waiting for the graph of the engine: (step, x)
+        self._pending = None
+
+        # the graph of the last state shared by the engine (last only): (number of states seen, graph)
+        self._last_graph = None
+
+        # the names and functions of all observables
+        self.names = []
+        self.functions = []
+
+        for obs in observables:
+
+            if isinstance(obs, str):
+                self.names.append(obs)
+                self.functions.append(self._builtin(obs))
+
+            else:
+                self.names.append(obs[0])
+                self.functions.append(obs[1])
+
+        # the values of every observable
+        self.values = [[] for _ in self.names]
+
+    def append(self, x):
+
+        """
+        Pass the next state of the dynamics (the initial state first).
+        """
+
+        import numpy as np
+
+        # evaluate the previous state if the engine did not pass its graph
+        self._flush()
+
+        step = self.seen
+        self.seen += 1
+        self.last = x
+
+        # check if the state is observed
+        if self.last_only:
+            return
+
+        if self._times_set is not None:
+            if step not in self._times_set:
+                return
+
+        elif step % self.stride != 0:
+            return
+
+        # a copy is kept, so a state updated in place before its evaluation is not lost
+        self._pending = (step, np.array(x, dtype = float))
+
+    def share_graph(self, x, graph, R, dist_norm = 2, period = False):
+
+        """
+        Pass the neighbour graph of the last state x built by the engine (see calc_neighbour_graph);
+        it is used if it is the graph of the observer (the same R, norm and boundary, no radicals).
+        """
+
+        import numpy as np
+
+        if self.last_only:
+            state = self.last
+        elif self._pending is not None:
+            state = self._pending[1]
+        else:
+            return
+
+        same = (R == self.R and dist_norm == self.dist_norm and period == (self.bound_cond == 'period')
+                and graph.shape[0] == self.n and (x is state or np.array_equal(x, state)))
+
+        if self.last_only:
+            # keep the graph for the last state (the states are not evaluated during the run)
+            self._last_graph = (self.seen, graph) if same else None
+            return
+
+        if same:
+            # the graph of the next evaluation (the waiting state)
+            self._graph = graph
+            self._graph_key = self._evals + 1
+
+        self._flush()
+
+    def _flush(self):
+
+        # evaluate the observables of the waiting state
+        if self._pending is None:
+            return
+
+        step, x = self._pending
+        self._pending = None
+
+        for k, value in enumerate(self._evaluate(x)):
+            self.values[k].append(value)
+
+        self.count += 1
+        self.steps.append(step)
+
+    def observe(self, x):
+
+        """
+        Evaluate all observables for the opinions x (e.g. the last state).
+
+        @return             - a dictionary {name: value}.
+        """
+
+        return dict(zip(self.names, self._evaluate(x)))
+
+    def result(self):
+
+        """
+        Return the values as a dictionary {name: array} (steps x shape of the value).
+        For the given times, the values are returned in the order of times;
+        with last set, every array holds the value of the last state only.
+        """
+
+        import numpy as np
+
+        self._flush()
+
+        if self.last_only:
+
+            # the values of the last state (with the graph of the engine if it was shared)
+            if self.seen == 0:
+                return {name: np.array([]) for name in self.names}
+
+            if self._last_graph is not None and self._last_graph[0] == self.seen:
+                self._graph = self._last_graph[1]
+                self._graph_key = self._evals + 1
+
+            return {name: np.array([value]) for name, value in self.observe(self.last).items()}
+
+        if self.times is None:
+            return {name: np.array(v) for name, v in zip(self.names, self.values)}
+
+        # the row of every observed step (the missing times are taken from the last state)
+        row = {s: k for k, s in enumerate(self.steps)}
+        last = self.observe(self.last) if any(t not in row for t in self.times) else None
+
+        return {name: np.array([v[row[t]] if t in row else last[name] for t in self.times])
+                for name, v in zip(self.names, self.values)}
+
+    def graph(self, x):
+
+        """
+        Return the neighbour graph of the opinions x (see calc_neighbour_graph).
+        While the observables of a state are evaluated, the graph is built once for all of them
+        (or taken from the engine); the cache belongs to that evaluation only (not to the array),
+        so a state updated in place is never given the graph of the previous one.
+        """
+
+        import numpy as np
+        from functions.calc_neighbour_graph import calc_neighbour_graph
+
+        if self._key is not None and self._graph_key == self._key:
+            return self._graph
+
+        graph = calc_neighbour_graph(np.asarray(x, dtype = float)[:self.n], self.R, self.dist_norm,
+                                     self.bound_cond == 'period', method = self.neighbours)
+
+        if self._key is not None:
+            self._graph = graph
+            self._graph_key = self._key
+
+        return graph
+
+    def labels(self, x):
+
+        """
+        Return the clusters of the opinions x (see calc_cluster_labels);
+        as the graph, they are found once for all observables of an evaluation.
+        """
+
+        import numpy as np
+        from functions.calc_cluster_labels import calc_cluster_labels
+
+        if self._key is not None and self._labels_key == self._key:
+            return self._labels
+
+        # the clusters are taken without the periodic boundary (the graph is shared otherwise)
+        graph = None if self.bound_cond == 'period' else self.graph(x)
+
+        labels = calc_cluster_labels(np.asarray(x, dtype = float)[:self.n], self.R, self.dist_norm,
+                                     neighbours = self.neighbours, graph = graph)
+
+        if self._key is not None:
+            self._labels = labels
+            self._labels_key = self._key
+
+        return labels
+
+    def _evaluate(self, x):
+
+        # the values of all observables for the opinions x (one evaluation shares the graph and the clusters)
+        self._evals += 1
+        self._key = self._evals
+
+        values = [f(x) for f in self.functions]
+        self._key = None
+
+        return values
+
+    def _builtin(self, name):
+
+        # the function of a built-in observable
+        import numpy as np
+        from functions.calc_order_par import calc_order_par
+
+        if self.R is None or self.n is None:
+            raise ValueError("R and n must be given for the observable '{}'".format(name))
+
+        R, n, bound_cond, dist_norm = self.R, self.n, self.bound_cond, self.dist_norm
+
+        if name == 'order_par':
+            return lambda x: calc_order_par(x, R, n, bound_cond, dist_norm, graph = self.graph(x))
+
+        if name == 'clusters':
+            return lambda x: self.labels(x)[0]
+
+        if name == 'cluster_var':
+
+            def cluster_var(x):
+
+                # the covariance of the centroids of clusters
+                centroids = self.labels(x)[3]
+                d = centroids - np.mean(centroids, axis = 0)
+
+                return d.T @ d / len(centroids)
+
+            return cluster_var
+
+        if name == 'nb_hist':
+
+            def nb_hist(x):
+
+                # the number of neighbours of every agent (see calc_neighbour_graph)
+                count = np.diff(self.graph(x).indptr)
+
+                return np.bincount(count, minlength = n + 1)
+
+            return nb_hist
+
+        raise ValueError("unknown observable '{}'".format(name))
@@ -0,0 +1,181 @@
+class Recorder:
+
+    """
+    This class records the steps of opinion dynamics (the 'FULL' results of the engines).
+
+    The states are written into a preallocated buffer that grows by doubling, so no copy is made
+    for every step and there is no list to convert at the end. Either every stride'th state
+    or only the states at the given times (step numbers) are recorded. If the buffer would
+    exceed the memory budget, it is moved into a memory-mapped file on disk.
+
+    A recorder can be passed to an engine as its 'result' argument; the engine then returns
+    recorder.result(). With result = 'FULL', the engines record every step.
+
+    @param stride       - every stride'th state is recorded (0, stride, 2 * stride, ...);
+    @param times        - a list of step numbers to record (used instead of the stride);
+                          a time after the last step gives the last state (as x[min(t, len(x) - 1)]);
+    @param max_bytes    - a memory budget of the buffer in bytes (None: no limit);
+    @param path         - a file for the memory-mapped buffer (None: a temporary file);
+    @param capacity     - the largest initial number of states the buffer can hold; the first block
+                          also fits into initial_bytes (and max_bytes), so a large state starts with a few rows.
+    """
+
+    # the size of the first block of the buffer in bytes (at least one state)
+    initial_bytes = 2**26
+
+    def __init__(self, stride = 1, times = None, max_bytes = None, path = None, capacity = 1024):
+
+        self.stride = stride
+        self.times = None if times is None else [int(t) for t in times]
+        self.max_bytes = max_bytes
+        self.path = path
+
+        # the initial number of rows of the buffer
+        self.capacity = capacity
+
+        # the buffer, the number of recorded states and their step numbers
+        self.buf = None
+        self.count = 0
+        self.steps = []
+
+        # the number of states seen and the last state
+        self.seen = 0
+        self.last = None
+
+        self._times_set = None if times is None else set(self.times)
+        self._on_disk = False
+
+    def append(self, x):
+
+        """
+        Pass the next state of the dynamics (the initial state first).
+        """
+
+        import numpy as np
+
+        step = self.seen
+        self.seen += 1
+        self.last = x
+
+        # check if the state is recorded
+        if self._times_set is not None:
+            if step not in self._times_set:
+                return
+
+        elif step % self.stride != 0:
+            return
+
+        x = np.asarray(x)
+
+        if self.buf is None:
+
+            # the first block: at most capacity states within the byte budget
+            budget = self.initial_bytes if self.max_bytes is None else min(self.initial_bytes, self.max_bytes)
+            row_nbytes = max(1, x.size * np.dtype(np.result_type(x.dtype, float)).itemsize)
+
+            self._allocate(x, min(self.capacity, max(1, budget // row_nbytes)))
+
+        elif self.count == len(self.buf):
+            self._allocate(x, 2 * len(self.buf))
+
+        self.buf[self.count] = x
+        self.count += 1
+        self.steps.append(step)
+
+    def result(self):
+
+        """
+        Return the recorded states as an array (steps x shape of the state).
+        For the given times, the states are returned in the order of times.
+        """
+
+        import numpy as np
+
+        if self.buf is None:
+            return np.zeros((0,))
+
+        if self.times is not None:
+
+            # the row of every recorded step
+            row = {s: k for k, s in enumerate(self.steps)}
+            last = np.asarray(self.last)
+
+            return np.array([self.buf[row[t]] if t in row else last for t in self.times])
+
+        if self._on_disk:
+            self.buf.flush()
+            return self.buf[:self.count]
+
+        # release the unused part of the buffer
+        if self.count < len(self.buf):
+            self.buf.resize((self.count,) + self.buf.shape[1:], refcheck = False)
+
+        return self.buf
+
+    def share_graph(self, x, graph, R, dist_norm = 2, period = False):
+
+        """
+        Pass the neighbour graph of the last state x built by the engine (see calc_neighbour_graph);
+        the engines call it in every step. A Recorder does not need it (see Observer).
+        """
+
+        pass
+
+    def _allocate(self, x, rows):
+
+        # (re)allocate the buffer with the given number of rows, keeping the recorded states
+        import numpy as np
+        import os
+        import tempfile
+
+        shape = (rows,) + x.shape
+        dtype = np.result_type(x.dtype, float)
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+
+        if self.max_bytes is not None and nbytes > self.max_bytes and not self._on_disk:
+
+            # move the buffer to a memory-mapped file
+            if self.path is None:
+                f, self.path = tempfile.mkstemp(suffix = '.dat')
+                os.close(f)
+
+            old = self.buf
+            self.buf = np.memmap(self.path, dtype = dtype, mode = 'w+', shape = shape)
+
+            if old is not None:
+                self.buf[:self.count] = old[:self.count]
+
+            self._on_disk = True
+
+        elif self._on_disk:
+
+            # grow the file (the recorded states stay in place)
+            self.buf.flush()
+            self.buf = np.memmap(self.path, dtype = dtype, mode = 'r+', shape = shape)
+
+        else:
+
+            old = self.buf
+            self.buf = np.empty(shape, dtype = dtype)
+
+            if old is not None:
+                self.buf[:self.count] = old[:self.count]
+
+
+def make_recorder (result):
+
+    """
+    This function gives the recorder for the 'result' argument of an engine:
+    the recorder itself, a new recorder of every step for 'FULL', or None (only the last step).
+
+    @param result       - a flag indicating if the whole array is returned ('FULL'),
+                          a Recorder, or only the last step values (other).
+    """
+
+    if isinstance(result, Recorder):
+        return result
+
+    if isinstance(result, str) and result == 'FULL':
+        return Recorder()
+
+    return None
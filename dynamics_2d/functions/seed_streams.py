@@ -0,0 +1,28 @@
+def seed_streams (seed, shape):
+
+    """
+    This function allocates independent random streams to the tasks of a parameter grid
+    (e.g. sigma x R x replicate), so that the SDE engines can be run in parallel reproducibly.
+
+    Every task gets its own SeedSequence, whose spawn key is the index of the task in the grid.
+    The stream of a task therefore depends only on the seed and the index (not on the number
+    of workers, the order of the tasks, or the size of the grid), and the streams of different
+    tasks are independent. A stream is passed to an engine as its rng argument.
+
+    @param seed         - a root seed (an integer; None gives fresh entropy, which is not reproducible);
+    @param shape        - the shape of the grid of tasks (e.g. (len(sigma), len(R), replicates)).
+
+    @return             - an array of SeedSequence objects of the given shape.
+    """
+
+    import numpy as np
+
+    # the root entropy (drawn from the OS if no seed is given)
+    entropy = np.random.SeedSequence(seed).entropy
+
+    streams = np.empty(shape, dtype = object)
+
+    for idx in np.ndindex(*streams.shape):
+        streams[idx] = np.random.SeedSequence(entropy, spawn_key = idx)
+
+    return streams
@@ -0,0 +1,32 @@
+def step_discrete (x, G, include_self = True):
+
+    """
+    This function makes one step of the discrete HK model in d dimensions (all agents at once):
+    every agent takes the mean opinion of its neighbours in the neighbour graph of the step.
+    The engines (HK_nd and the 2D engines over it) and HK_stream make their steps with this function.
+
+    @param x              - a current distribution of opinions (2D matrix: n x d);
+    @param G              - the neighbour graph of x (a sparse matrix, see calc_neighbour_graph and verlet_list);
+    @param include_self   - a flag indicating if self opinion plays a part in the stepping process.
+
+    @return               - the next distribution of opinions (an agent without neighbours keeps the opinion).
+    """
+
+    import numpy as np
+    from functions import jit_kernels
+
+    if jit_kernels.ENABLED:
+        # the compiled step over the graph (see jit_kernels)
+        return jit_kernels.discrete_step(x, G.indptr, G.indices, include_self)
+
+    # the number and the sum of neighbour opinions (the agent himself is removed if not included)
+    count = np.diff(G.indptr)
+    total = G @ x
+
+    if not include_self:
+        count = count - 1
+        total = total - x
+
+    # apply the stepping rule, update all coordinates
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        return np.where(count[:, None] > 0, total / count[:, None], x)
@@ -0,0 +1,58 @@
+def step_euler (x, G, h, sigma = 0, W_inc = None, include_self = True, bound_cond = None):
+
+    """
+    This function makes one step of the ODE (Euler's method) or SDE (Euler-Maruyama method)
+    version of HK model in d dimensions (all agents at once). The engines (HK_nd and the 2D engines
+    over it) and HK_stream make their steps with this function, so they follow the same dynamics.
+
+    @param x              - a current distribution of opinions (2D matrix: n x d);
+    @param G              - the neighbour graph of x (a sparse matrix, see calc_neighbour_graph and verlet_list);
+    @param h              - a step size;
+    @param sigma          - level of noise (SDE);
+    @param W_inc          - the Wienner increments of the step (None: the ODE step);
+    @param include_self   - a flag indicating if self opinion plays a part in the stepping process;
+    @param bound_cond     - boundary conditions of the SDE: 'reflect', 'adsorb', or 'period'
+                            (for 'period', the agents also interact through the boundary; None: the ODE step).
+
+    @return               - the next distribution of opinions.
+    """
+
+    import numpy as np
+    from functions.apply_bound_cond import apply_bound_cond
+    from functions import jit_kernels
+
+    n, d = x.shape
+    period = bound_cond == 'period'
+
+    # the sums of opinion differences: sum_j (x_i - x_j) over the neighbours j of i
+    if jit_kernels.ENABLED:
+        # the compiled sums over the graph (see jit_kernels)
+        diff = jit_kernels.diff_sums(x, G.indptr, G.indices, period)
+
+    else:
+        count = np.diff(G.indptr)
+        diff = count[:, None] * x - G @ x
+
+        if period:
+
+            # the shorter difference is going through the boundary: x_i - x_j - round(x_i - x_j)
+            I = np.repeat(np.arange(n), count)
+            wrap = np.rint(x[I] - x[G.indices])
+            diff = diff - np.column_stack([np.bincount(I, weights = wrap[:, a], minlength = n) for a in range(d)])
+
+    # update all coordinates with Euler's scheme
+    if include_self:
+        y = x + h * (-1/n) * diff
+    else:
+        y = x + h * (-1/(n - 1)) * diff
+
+    if W_inc is None:
+        return y
+
+    # add the noise (Euler - Maruyama method)
+    y = y + sigma * W_inc
+
+    # boundary conditions (every axis)
+    apply_bound_cond(y, bound_cond)
+
+    return y
@@ -0,0 +1,104 @@
+class VerletList:
+
+    """
+    This class keeps the neighbours of the agents between the steps of an ODE or SDE run (a Verlet list).
+
+    The candidate pairs are the agents within R + skin (see calc_neighbour_graph); they are searched
+    again only when an agent has moved by more than skin/2 since the last search, as only then a pair
+    out of the candidates can come within R. In every step, the candidates are filtered by the distance,
+    which costs O(number of pairs) without any search. The agents move by O(h) in a step, so for
+    a small h the list is rebuilt rarely.
+
+    Usage: verlet.graph(x) gives the neighbour graph of the opinions x (as calc_neighbour_graph);
+    the opinions must keep their agents (a list is rebuilt if the number of agents changes).
+
+    @param R            - a bound (confidence level);
+    @param skin         - a width added to R for the candidate pairs (> 0);
+    @param dist_norm    - a norm for measuring the distance (L1, L2, L-infinity): 1, 2, np.inf;
+    @param period       - a flag indicating the periodic boundary conditions on [0,1]^d;
+    @param method       - a neighbour search of the candidates: 'cells', 'kdtree', or 'brute'.
+    """
+
+    def __init__(self, R, skin, dist_norm = 2, period = False, method = 'cells'):
+
+        self.R = R
+        self.skin = skin
+        self.dist_norm = dist_norm
+        self.period = period
+        self.method = method
+
+        # the candidate pairs and the opinions at the last search
+        self.I = None
+        self.J = None
+        self.x_ref = None
+
+        # the number of searches
+        self.builds = 0
+
+    def graph(self, x):
+
+        """
+        Return the neighbour graph of the opinions x: a sparse matrix (n x n, CSR), see calc_neighbour_graph.
+        """
+
+        import numpy as np
+        from scipy.sparse import csr_matrix
+
+        x = np.asarray(x, dtype = float)
+        n = len(x)
+
+        if self.x_ref is None or x.shape != self.x_ref.shape or self.moved(x) > self.skin / 2:
+            self.build(x)
+
+        # the distances of the candidates (as in calc_neighbours)
+        d = np.abs(x[self.I] - x[self.J])
+
+        if self.period:
+            d = np.minimum(d, 1 - d)
+
+        if d.shape[1] == 2 and self.dist_norm == 2:
+            dist = np.sqrt(d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1])
+
+        else:
+            dist = np.linalg.norm(d, ord = self.dist_norm, axis = -1)
+
+        # the candidates are ordered by i and j, so are the neighbours
+        near = dist <= self.R
+        I = self.I[near]
+        J = self.J[near]
+
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(I, minlength = n))))
+
+        return csr_matrix((np.ones(len(J)), J, indptr), shape = (n, n))
+
+    def moved(self, x):
+
+        """
+        Return the largest displacement of an agent since the last search.
+        """
+
+        import numpy as np
+
+        disp = x - self.x_ref
+
+        # the shorter displacement is going through the boundary
+        if self.period:
+            disp = disp - np.rint(disp)
+
+        return np.max(np.linalg.norm(disp, ord = self.dist_norm, axis = -1), initial = 0)
+
+    def build(self, x):
+
+        """
+        Search the candidate pairs: the agents within R + skin.
+        """
+
+        import numpy as np
+        from functions.calc_neighbour_graph import calc_neighbour_graph
+
+        G = calc_neighbour_graph(x, self.R + self.skin, self.dist_norm, self.period, method = self.method)
+
+        self.I = np.repeat(np.arange(len(x)), np.diff(G.indptr))
+        self.J = G.indices
+        self.x_ref = np.copy(x)
+        self.builds += 1
@@ -4,7 +4,7 @@ This script simulates the opinion dynamics generated by using an ODE HK model in
 for varying parameters R and N. The number of clusters/steps for each pair of parameters
 is given on a 2D raster. The analysis is performed using the Monte Carlo approach:
 100 samples are taken and the cluster/convergence time results are averaged.
-The results are saved in a csv file.
+The results are saved in a binary result store (see result_store).
 """
 
 import numpy as np
@@ -12,15 +12,14 @@ import matplotlib.pyplot as plt
 from matplotlib.pyplot import figure
 from matplotlib import colors
 from analysis_2D.functions.HK_ode_2d import HK_ode_2d
-from analysis_2D.functions.calc_clusters import calc_clusters
+from analysis_2D.functions.calc_cluster_labels import calc_cluster_labels
+from analysis_2D.functions.cell_store import CellStore
+from analysis_2D.functions.seed_streams import seed_streams
+from analysis_2D.functions.result_store import save_results
 import warnings
 from matplotlib.ticker import (MultipleLocator, AutoMinorLocator)
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 import statistics as stat
-import csv
-
-# set the seed
-np.random.seed(27)
 
 #----------------------------------------------
 # PARAMETERS
@@ -45,6 +44,23 @@ dist_norm = 2
 # the type of region: square/circle
 region = 'circle'
 
+# the neighbour search: the k-d tree keeps the dense clusters of the circle region fast
+neighbours = 'kdtree' if region == 'circle' else 'cells'
+
+# the number of Monte Carlo samples
+samples = 100
+
+# the seed of the random streams of the samples (every sample has its own stream)
+seed = 27
+
+# the fixed parameters of the results
+meta = {'stop': stop, 'h': h, 'dist_norm': dist_norm, 'region': region, 'seed': seed}
+
+# the store of finished samples: every sample is saved when it is finished
+# and the simulation is resumed from the store after a restart (next to the results, see SAVE)
+store = CellStore('analysis_2D/ode_analysis/samples_MC_100_L' + str(dist_norm) + '_' + region, {'sample': range(samples), 'n': N, 'r': R}, meta)
+streams = seed_streams(seed, (samples,))
+
 # the array for clusters of all simulations
 clusters_MC = []
 
@@ -54,7 +70,17 @@ steps_MC = []
 #----------------------------------------------
 # SIMULATION
 
-for i in range(100):
+for i in range(samples):
+
+    # the sample was finished before a restart
+    if i in store:
+        clusters, steps = store[i]
+        clusters_MC.append(clusters)
+        steps_MC.append(steps)
+        continue
+
+    # the random stream of the sample
+    rng = np.random.default_rng(streams[i])
 
     # the array of end clusters/steps
     clusters = []
@@ -71,16 +97,16 @@ for i in range(100):
         if region == 'square':
 
             # OPTION 1a SQUARE: sample the initial opinions from a uniform distribution
-            x0_x = np.random.uniform(0, 1, n)
-            x0_y = np.random.uniform(0, 1, n)
+            x0_x = rng.uniform(0, 1, n)
+            x0_y = rng.uniform(0, 1, n)
 
             x0 = [[x0_x[i], x0_y[i]] for i in range(n)]
 
         elif region == 'circle':
 
             # OPTION 1b CIRCLE: sample the initial opinions from a uniform distribution
-            length = 0.5 * np.sqrt(np.random.uniform(0, 1, n))
-            angle = 2 * np.pi * np.random.uniform(0, 1, n)
+            length = 0.5 * np.sqrt(rng.uniform(0, 1, n))
+            angle = 2 * np.pi * rng.uniform(0, 1, n)
 
             x0 = []
 
@@ -90,21 +116,29 @@ for i in range(100):
             x0 = [[x0_x[i], x0_y[i]] for i in range(n)]
 
 
+        last = []
+
         for r in R:
 
             # SIMULATION
-            x = HK_ode_2d (r, n, x0, h, stop, result = 'FULL', max_steps = 2000, dist_norm = dist_norm)
+            x = HK_ode_2d (r, n, x0, h, stop, result = 'FULL', max_steps = 2000, dist_norm = dist_norm, neighbours = neighbours)
 
-            # check the number of clusters in the last step
-            c.append(calc_clusters(x[-1], r, n, dist_norm = dist_norm))
+            # keep the last step (the clusters of all R are counted at once)
+            last.append(x[-1])
 
             # check the number of steps
             s.append(len(x) * h)
 
+        # check the number of clusters in the last steps (one bound per profile)
+        c = list(calc_cluster_labels(np.array(last), R, dist_norm)[0])
+
         # append an array of clusters/steps for a specific n
         clusters.append(c)
         steps.append(s)
 
+    # save the sample
+    store.save(i, (clusters, steps))
+
     clusters_MC.append(clusters)
     steps_MC.append(steps)
 
@@ -143,14 +177,12 @@ steps = np.array(steps)
 #----------------------------------------------
 # SAVE
 
-# save results to a CSV file
-with open('analysis_2D/ode_analysis/clusters_MC_100_L' + str(dist_norm) + '_' + region + '.csv',"w") as f:
-    wr = csv.writer(f, lineterminator = '\n')
-    wr.writerows(clusters)
+# save the Monte Carlo results (sample x N x R)
+coords = {'N': N, 'R': R}
+
+save_results('analysis_2D/ode_analysis/clusters_MC_100_L' + str(dist_norm) + '_' + region, clusters_MC, axes = ('sample', 'N', 'R'), coords = coords, meta = meta)
+save_results('analysis_2D/ode_analysis/steps_MC_100_L' + str(dist_norm) + '_' + region, steps_MC, axes = ('sample', 'N', 'R'), coords = coords, meta = meta)
 
-with open('analysis_2D/ode_analysis/steps_MC_100_L' + str(dist_norm) + '_' + region + '.csv',"w") as f:
-    wr = csv.writer(f, lineterminator = '\n')
-    wr.writerows(steps)
 
 #----------------------------------------------
 # PLOT
@@ -31,6 +31,9 @@ h = 0.05
 # the noise level
 sigma = 0.01
 
+# the boundary conditions: reflect/adsorb/period
+bound_cond = 'adsorb'
+
 
 #----------------------------------------
 
@@ -58,7 +61,7 @@ x = [[x0[i], y0[i]] for i in range(n)]
 
 # SIMULATION
 #----------------------------------------
-res = HK_sde_2d (R, n, x, h,sigma, stop, result = 'FULL', max_steps = 2000, dist_norm = 1)
+res = HK_sde_2d (R, n, x, h,sigma, stop, result = 'FULL', max_steps = 2000, dist_norm = 1, bound_cond = bound_cond)
 
 # calculate the no of steps taken
 steps = len(res)
@@ -84,7 +87,7 @@ for i in range(n):
 for i in range(n):
     # add last state
     plt.plot(res[steps-1,i,0], res[steps-1,i,1], linestyle = "", marker = "o", markersize = 7, color = 'black')
-Q = calc_order_par(res[-1], R, n, 'adsorb')
+Q = calc_order_par(res[-1], R, n, bound_cond)
 plt.xlabel("x1")
 plt.ylabel("x2")
 plt.xlim(0, 1)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the tests import the functions as the scripts do (from functions.X import X)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
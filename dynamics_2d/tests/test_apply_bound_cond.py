@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from functions.apply_bound_cond import apply_bound_cond
+
+
+def reflect(v):
+
+    # reflect an opinion on the boundaries until it is in [0,1]
+    while v < 0 or v > 1:
+        v = -v if v < 0 else 2 - v
+
+    return v
+
+
+@pytest.mark.parametrize('bound_cond', ['reflect', 'adsorb', 'period'])
+def test_fold(bound_cond):
+
+    y = np.random.default_rng(0).uniform(-3, 4, (100, 2))
+    y[:4] = [-1, 0, 1, 2] if y.ndim == 1 else np.array([-1, 0, 1, 2])[:, None]
+
+    expected = {'reflect': np.vectorize(reflect)(y),
+                'adsorb': np.clip(y, 0, 1),
+                'period': y - np.floor(y)}[bound_cond]
+
+    # the opinions are folded in place
+    z = np.copy(y)
+    assert apply_bound_cond(z, bound_cond) is z
+    assert np.allclose(z, expected, rtol = 0, atol = 10**(-12))
+    assert np.all((z >= 0) & (z <= 1))
+
+
+def test_unknown_condition():
+
+    # the opinions are left as they are
+    y = np.array([-0.5, 0.5, 1.5])
+
+    assert np.array_equal(apply_bound_cond(np.copy(y), None), y)
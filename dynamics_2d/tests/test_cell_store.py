@@ -0,0 +1,29 @@
+import pytest
+
+from functions.cell_store import CellStore
+
+
+def test_resume(tmp_path):
+
+    grid = {'sample': range(3), 'r': [0.1, 0.2]}
+    store = CellStore(str(tmp_path), grid, {'seed': 27})
+    store.save(1, ('clusters', 'steps'))
+
+    # the same grid and seed are resumed
+    store = CellStore(str(tmp_path), grid, {'seed': 27})
+
+    assert 1 in store and 0 not in store
+    assert store[1] == ('clusters', 'steps')
+
+
+def test_different(tmp_path):
+
+    grid = {'sample': range(3), 'r': [0.1, 0.2]}
+    CellStore(str(tmp_path), grid, {'seed': 27})
+
+    # the results of another seed or grid are not mixed
+    with pytest.raises(ValueError):
+        CellStore(str(tmp_path), grid, {'seed': 28})
+
+    with pytest.raises(ValueError):
+        CellStore(str(tmp_path), {'sample': range(3), 'r': [0.1, 0.3]}, {'seed': 27})
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from functions import jit_kernels
+from functions.HK_discrete_2d import HK_discrete_2d
+from functions.HK_ode_2d import HK_ode_2d
+from functions.HK_sde_2d import HK_sde_2d
+from functions.HK_nd import HK_nd
+
+
+R = 0.2
+n = 40
+x0 = np.random.default_rng(0).uniform(0, 1, (n, 2))
+x0_rad = np.array([[0.1, 0.1], [0.9, 0.5]])
+
+runs = [
+    lambda: HK_discrete_2d(R, n, x0, max_steps = 20),
+    lambda: HK_ode_2d(R, n, x0, 0.5, max_steps = 20),
+    lambda: HK_sde_2d(R, n, x0, 0.1, 0.02, max_steps = 20, bound_cond = 'period', rng = 1),
+    lambda: HK_sde_2d(R, n, x0, 0.1, 0.02, max_steps = 20, bound_cond = 'reflect', rng = 1, dist_norm = 1),
+    lambda: HK_nd('discrete', R, n, x0, n_rad = 2, x0_rad = x0_rad, include_self = False, max_steps = 20),
+    lambda: HK_nd('sde', R, n, x0, 0.1, 0.02, max_steps = 20, bound_cond = 'period', rng = 1),
+]
+
+
+@pytest.mark.parametrize('run', runs)
+def test_same_steps(run, monkeypatch):
+
+    # the kernels (compiled, or plain Python without Numba) give the steps of NumPy
+    monkeypatch.setattr(jit_kernels, 'ENABLED', False)
+    expected = run()
+
+    monkeypatch.setattr(jit_kernels, 'ENABLED', True)
+
+    assert np.allclose(run(), expected, rtol = 0, atol = 10**(-12))
+
+
+def test_compiled(monkeypatch):
+
+    # with Numba installed, the engines run the compiled kernels (not the plain Python functions)
+    pytest.importorskip('numba')
+    monkeypatch.setattr(jit_kernels, 'ENABLED', True)
+
+    HK_discrete_2d(R, n, x0, max_steps = 5)
+    HK_sde_2d(R, n, x0, 0.1, 0.02, max_steps = 5, bound_cond = 'period', rng = 1)
+
+    assert len(jit_kernels.discrete_step.signatures) > 0
+    assert len(jit_kernels.diff_sums.signatures) > 0
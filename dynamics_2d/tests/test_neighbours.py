@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from functions.calc_neighbours import calc_neighbours
+from functions.calc_neighbour_graph import calc_neighbour_graph
+
+
+def brute_pairs(x, R, dist_norm, period):
+
+    d = np.abs(x[:, None, :] - x[None, :, :])
+
+    if period:
+        d = np.minimum(d, 1 - d)
+
+    return np.nonzero(np.linalg.norm(d, ord = dist_norm, axis = -1) <= R)
+
+
+@pytest.mark.parametrize('d', [1, 2, 3, 4])
+@pytest.mark.parametrize('dist_norm', [1, 2, np.inf])
+@pytest.mark.parametrize('period', [False, True])
+def test_cells_find_all_pairs(d, dist_norm, period):
+
+    rng = np.random.default_rng(d)
+
+    for R in (0.05, 0.2, 0.45, 1.5):
+
+        x = rng.uniform(0, 1, (60, d))
+        i, j = calc_neighbours(x, R, dist_norm, period)
+        ii, jj = brute_pairs(x, R, dist_norm, period)
+
+        assert np.array_equal(i, ii) and np.array_equal(j, jj)
+
+
+@pytest.mark.parametrize('d', [2, 3])
+@pytest.mark.parametrize('dist_norm', [1, 2, np.inf])
+@pytest.mark.parametrize('period', [False, True])
+def test_searches_agree(d, dist_norm, period):
+
+    x = np.random.default_rng(7).uniform(0, 1, (300, d))
+    graphs = [calc_neighbour_graph(x, 0.2, dist_norm, period, method = m) for m in ('cells', 'kdtree', 'brute')]
+
+    for G in graphs[1:]:
+        assert (G != graphs[0]).nnz == 0
+
+
+@pytest.mark.parametrize('method', ['cells', 'kdtree', 'brute'])
+def test_tiny_negative_opinion(method):
+
+    # np.mod(-1e-17, 1) is 1.0, which is outside the periodic box [0,1) of the tree
+    x = np.array([[-1e-17, 0.5], [0.95, 0.5], [0.3, 0.3]])
+    G = calc_neighbour_graph(x, 0.1, 2, True, method = method)
+
+    assert sorted(G[0].indices) == [0, 1]
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+import functions.calc_neighbour_graph
+from functions.observer import Observer
+from functions.calc_cluster_labels import calc_cluster_labels
+from functions.calc_order_par import calc_order_par
+from functions.HK_discrete_2d import HK_discrete_2d
+from functions.HK_ode_2d import HK_ode_2d
+from functions.HK_sde_2d import HK_sde_2d
+
+
+R = 0.2
+n = 60
+x0 = np.random.default_rng(0).uniform(0, 1, (n, 2))
+
+runs = {
+    'discrete': lambda result: HK_discrete_2d(R, n, x0, result = result),
+    'ode': lambda result: HK_ode_2d(R, n, x0, 0.5, result = result, skin = 0.05),
+    'sde': lambda result: HK_sde_2d(R, n, x0, 0.1, 0.01, result = result, max_steps = 20, bound_cond = 'period', rng = 1),
+}
+
+
+@pytest.mark.parametrize('model', list(runs))
+def test_trajectory(model):
+
+    # the observables are the same as evaluated on the recorded trajectory
+    bound_cond = 'period' if model == 'sde' else 'adsorb'
+    obs = runs[model](Observer(['order_par', 'clusters', 'cluster_var', 'nb_hist'], R, n, bound_cond))
+    xs = runs[model]('FULL')
+
+    assert len(obs['order_par']) == len(xs)
+
+    for k, x in enumerate(xs):
+
+        count, _, _, centroids, _ = calc_cluster_labels(x, R)
+
+        assert obs['order_par'][k] == calc_order_par(x, R, n, bound_cond)
+        assert obs['clusters'][k] == count
+        assert np.allclose(obs['cluster_var'][k], np.cov(centroids.T, bias = True))
+
+
+@pytest.mark.parametrize('model', list(runs))
+def test_shared_graph(model, monkeypatch):
+
+    # the observer uses the graphs of the engine, so no graph is built for the observables
+    calls = []
+    build = functions.calc_neighbour_graph.calc_neighbour_graph
+
+    def counted(*args, **kwargs):
+        calls.append(1)
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(functions.calc_neighbour_graph, 'calc_neighbour_graph', counted)
+
+    bound_cond = 'period' if model == 'sde' else 'adsorb'
+    runs[model](Observer(['order_par', 'nb_hist'], R, n, bound_cond))
+    engine = len(calls)
+
+    calls.clear()
+    runs[model]('LAST_STEP')
+
+    assert engine == len(calls)
+
+
+@pytest.mark.parametrize('model', list(runs))
+def test_last_only(model, monkeypatch):
+
+    # only the last state is evaluated, with the graph of the engine
+    calls = []
+    build = functions.calc_neighbour_graph.calc_neighbour_graph
+
+    def counted(*args, **kwargs):
+        calls.append(1)
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(functions.calc_neighbour_graph, 'calc_neighbour_graph', counted)
+
+    bound_cond = 'period' if model == 'sde' else 'adsorb'
+    obs = runs[model](Observer(['order_par', 'nb_hist'], R, n, bound_cond, last = True))
+    engine = len(calls)
+
+    calls.clear()
+    x = runs[model]('LAST_STEP')
+
+    assert engine == len(calls)
+    assert list(obs['order_par']) == [calc_order_par(x, R, n, bound_cond)]
+
+
+def test_state_updated_in_place():
+
+    # the graph and the clusters are not taken from the previous state held in the same array
+    obs = Observer(['clusters', 'nb_hist'], R, n)
+    x = np.copy(x0) / 10
+    obs.append(x)
+
+    # one cluster, then two
+    x[:] = (np.arange(n) >= n // 2)[:, None]
+    obs.append(x)
+
+    res = obs.result()
+
+    assert list(res['clusters']) == [1, 2]
+    assert res['nb_hist'][0][n] == n and res['nb_hist'][1][n // 2] == n
@@ -0,0 +1,16 @@
+import numpy as np
+
+from functions.recorder import Recorder
+
+
+def test_first_block_fits_the_byte_budget():
+
+    # a state of 5 * 10^5 agents in 2D: the first block must not hold 1024 states
+    rec = Recorder()
+    x = np.zeros((5 * 10**5, 2))
+
+    for _ in range(3):
+        rec.append(x)
+
+    assert rec.buf.nbytes <= Recorder.initial_bytes
+    assert rec.result().shape == (3, 5 * 10**5, 2)
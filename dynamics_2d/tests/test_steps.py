@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from functions.step_discrete import step_discrete
+from functions.step_euler import step_euler
+from functions.calc_neighbour_graph import calc_neighbour_graph
+from functions.HK_nd import HK_nd
+from functions.HK_sde_2d import HK_sde_2d
+
+
+def brute_steps(x, R, h, include_self, period):
+
+    # the steps by the loops over all pairs of agents
+    n = len(x)
+    d = x[:, None, :] - x[None, :, :]
+
+    if period:
+        # the shorter difference is going through the boundary
+        d = d - np.rint(d)
+
+    near = np.linalg.norm(d, axis = -1) <= R
+
+    if not include_self:
+        np.fill_diagonal(near, False)
+
+    count = near.sum(axis = 1)
+    mean = np.array([x[near[i]].mean(axis = 0) if count[i] > 0 else x[i] for i in range(n)])
+    diff = np.einsum('ij,ijk->ik', near, d)
+
+    return (mean, x + h * (-1/(n if include_self else n - 1)) * diff)
+
+
+@pytest.mark.parametrize('include_self', [True, False])
+@pytest.mark.parametrize('period', [False, True])
+def test_brute_steps(include_self, period):
+
+    rng = np.random.default_rng(3)
+
+    for d in (2, 3):
+
+        x = rng.uniform(0, 1, (80, d))
+        G = calc_neighbour_graph(x, 0.15, 2, period)
+        mean, euler = brute_steps(x, 0.15, 0.1, include_self, period)
+
+        assert np.allclose(step_discrete(x, G, include_self), mean, rtol = 0, atol = 10**(-12))
+        assert np.allclose(step_euler(x, G, 0.1, include_self = include_self, bound_cond = 'period' if period else None),
+                           euler, rtol = 0, atol = 10**(-12))
+
+
+def test_2d_engines_run_hk_nd():
+
+    x0 = np.random.default_rng(4).uniform(0, 1, (100, 2))
+
+    expected = HK_nd('sde', 0.2, 100, x0, 0.1, 0.02, max_steps = 20, bound_cond = 'period', rng = 5, skin = 0.05)
+
+    assert np.array_equal(HK_sde_2d(0.2, 100, x0, 0.1, 0.02, max_steps = 20, bound_cond = 'period', rng = 5, skin = 0.05),
+                          expected)
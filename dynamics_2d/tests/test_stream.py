@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from functions import jit_kernels
+from functions.HK_stream import HK_stream
+from functions.HK_discrete_2d import HK_discrete_2d
+from functions.HK_ode_2d import HK_ode_2d
+from functions.HK_sde_2d import HK_sde_2d
+
+
+R = 0.2
+n = 80
+x0 = np.random.default_rng(0).uniform(0, 1, (n, 2))
+
+
+def stream(model, **kwargs):
+    return np.array([x for _, x in HK_stream(model, R, n, x0, **kwargs)])
+
+
+@pytest.mark.parametrize('enabled', [False, True])
+@pytest.mark.parametrize('skin', [None, 0.05])
+def test_same_states(enabled, skin, monkeypatch):
+
+    # the stream gives the 'FULL' results of the engines (with the compiled kernels as well)
+    monkeypatch.setattr(jit_kernels, 'ENABLED', enabled)
+
+    assert np.array_equal(stream('discrete', max_steps = 30), HK_discrete_2d(R, n, x0, max_steps = 30))
+    assert np.array_equal(stream('ode', h = 0.5, max_steps = 30, skin = skin), HK_ode_2d(R, n, x0, 0.5, max_steps = 30, skin = skin))
+
+    for bound_cond in ['reflect', 'period']:
+
+        kwargs = dict(max_steps = 30, bound_cond = bound_cond, rng = 1, skin = skin)
+
+        assert np.array_equal(stream('sde', h = 0.1, sigma = 0.02, **kwargs), HK_sde_2d(R, n, x0, 0.1, 0.02, **kwargs))
+
+
+def test_every():
+
+    full = stream('ode', h = 0.5, max_steps = 30)
+    steps = [k for k, _ in HK_stream('ode', R, n, x0, h = 0.5, max_steps = 30, every = 4)]
+
+    # every 4th state and the last one
+    assert steps == list(range(0, len(full), 4)) + ([len(full) - 1] if (len(full) - 1) % 4 else [])
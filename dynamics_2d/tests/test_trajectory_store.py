@@ -0,0 +1,26 @@
+import numpy as np
+
+from functions.trajectory_store import TrajectoryStore
+from functions.HK_ode_2d import HK_ode_2d
+
+
+R = 0.2
+n = 50
+x0 = np.random.default_rng(0).uniform(0, 1, (n, 2))
+
+
+def test_write_and_read(tmp_path):
+
+    full = HK_ode_2d(R, n, x0, 0.5, max_steps = 60)
+
+    store = HK_ode_2d(R, n, x0, 0.5, max_steps = 60, result = TrajectoryStore(str(tmp_path / 'run'), stride = 2, chunk_size = 8))
+
+    assert len(store) == len(full[::2])
+    assert np.array_equal(store.read(), full[::2])
+
+    # a window across the chunks and a subset of agents, from the reopened store
+    store = TrajectoryStore(str(tmp_path / 'run'))
+    assert np.array_equal(store.read(5, 20, agents = slice(10, 20)), full[::2][5:20, 10:20])
+
+    # a window within one chunk is a view of the chunk file
+    assert isinstance(store.read(0, 4), np.memmap)